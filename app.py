@@ -1,18 +1,28 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from tkcalendar import Calendar
 import tkinter.font as tkFont
 from datetime import date, datetime
-from collections import Counter
+from bisect import bisect_left, insort
 
 # Import custom configuration and models
 from config import (
     BG_COLOR, FG_COLOR, ACCENT_COLOR, HOVER_COLOR,
     ENTRY_BG, HEADER_BG, HEADER_FG, SEL_BG, SEL_FG,
-    ROW_HOVER_COLOR, CATEGORIES
+    ROW_HOVER_COLOR, DUPLICATE_BG, CATEGORIES, AUTOSAVE_INTERVAL_MS, SEARCH_DELAY_MS
 )
-from storage import save_data, load_data
-from models import Expense, InitialChange
+from storage import write_snapshot
+from models import format_cents
+from ledger import Ledger
+import importer
+from search_index import parse_query
+from sort_index import SortedView
+from overlays import ActionOverlayPool
+from redraw import RedrawScheduler
+from autosave import Autosaver
+
+# Modifier bits of a click that extend the selection instead of replacing it
+_EXTEND_SELECTION = 0x0001 | 0x0004 | 0x0008  # Shift, Control, Command (macOS)
 
 
 class ExpenseTrackerApp:
@@ -29,7 +39,8 @@ class ExpenseTrackerApp:
         self._load_saved_data()     # Load previously saved expenses
 
         self.update_button_width()  # Adjust button sizes
-        self.root.after(200, self.redraw_action_buttons)  # Redraw buttons after delay
+        self.root.after(200, self.redraws.request)  # Redraw buttons after delay
+        self.autosaver.start()      # Periodic background snapshots
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)  # Handle window close
 
     def _configure_styles(self):
@@ -142,19 +153,46 @@ class ExpenseTrackerApp:
 
     def _init_state(self):
         """Initialize internal state variables for tracking expenses and UI behavior."""
-        self.expenses        = {}              # Maps Treeview row ID to Expense object
-        self.place_counter   = Counter()       # Tracks frequency of places used
-        self.action_frames   = {}              # Maps row ID to action button frames
+        self.ledger          = Ledger()        # Expenses, balance and persistence
+        self.view_ids        = []              # Expense IDs in display order
+        self.view_offset     = 0               # Index in view_ids of the first visible row
+        self.pool_rows       = []              # Treeview row IDs reused for the visible window
+        self.selected_ids    = set()           # Expense IDs of selected rows (visible or not)
+        self.duplicate_ids   = set()           # Expenses flagged as likely duplicates (live)
         self.selected_date   = date.today()    # Default selected date is today
-        self.initial_changes = []              # List of InitialChange objects
-        self.initial_amount  = 0.00            # Starting budget amount
 
         # UI-related state
         self.button_font      = tkFont.nametofont("TkDefaultFont")  # Default font for buttons
         self.initial_text_var = tk.StringVar()  # Text for initial amount button
         self.current_text_var = tk.StringVar()  # Text for current amount button
         self._hovered_row     = None            # Tracks hovered row in Treeview
+        self._selected_rows   = set()           # Pool rows currently selected in the Treeview
+        self.row_styles       = {}              # Maps pool row ID to its zebra or duplicate tag
         self._hover_inside_actions = False      # Tracks if mouse is inside action buttons
+        self.summary_popup    = None            # Open summary window, if any
+        self.search_var       = tk.StringVar()  # Search bar text
+        self.search_text_var  = tk.StringVar()  # Number of matches (and top categories)
+        self.search_query     = None            # Active search (Query), None shows everything
+        self._search_job      = None            # Pending delayed search
+        self.sort_column      = None            # Column the table is sorted by, None for stored order
+        self.sort_descending  = False           # Sort direction
+        self._summary_refresh = None            # Refreshes the open summary window
+
+        # Table redraws are coalesced to at most one per frame
+        self.redraws        = RedrawScheduler(self.root, self._on_redraw)
+        self._render_needed = False             # Next redraw must rebind rows, not just move overlays
+
+        # Snapshots are written off the UI thread; the SQLite backend
+        # commits every change directly and needs none
+        self.autosaver = Autosaver(
+            self.root,
+            self.ledger.capture_snapshot,
+            write_snapshot,
+            AUTOSAVE_INTERVAL_MS if self.ledger.uses_journal() else 0
+        )
+
+        # The view follows the ledger's change notifications
+        self.ledger.subscribe(self._on_ledger_change)
 
     def _build_ui(self):
         """Build and layout the main UI components."""
@@ -186,6 +224,27 @@ class ExpenseTrackerApp:
         )
         self.current_amount_button.pack(ipadx=20, ipady=10, pady=(10, 0))
 
+        # Spending summary (per month, category and place)
+        ttk.Button(
+            left,
+            text="Summary",
+            command=self.open_summary_popup
+        ).pack(pady=(10, 0))
+
+        # Likely double entries
+        ttk.Button(
+            left,
+            text="Find Duplicates",
+            command=self.find_duplicates
+        ).pack(pady=(10, 0))
+
+        # Bulk import of bank statements / CSV exports
+        ttk.Button(
+            left,
+            text="Import...",
+            command=self.import_statement
+        ).pack(pady=(10, 0))
+
         # Date picker label + button
         ttk.Label(inp, text="Date:").grid(row=0, column=0, sticky="w", pady=4)
         date_button_border = tk.Frame(inp, bg="#cccccc", bd=1)
@@ -228,6 +287,7 @@ class ExpenseTrackerApp:
             width=28
         )
         self.place_dropdown.grid(row=3, column=1, pady=4)
+        self._bind_place_suggestions(self.place_dropdown, self.place_var)
 
         # Add Expense button
         ttk.Button(
@@ -238,6 +298,21 @@ class ExpenseTrackerApp:
         ).grid(row=4, column=1, pady=(10, 0))
         self.root.bind("<Return>", lambda e: self.add_expense())  # Enter key adds expense
 
+        # Delete Selected button (also bound to the Delete key)
+        ttk.Button(
+            inp,
+            text="Delete Selected",
+            width=25,
+            command=self.delete_selected
+        ).grid(row=5, column=1, pady=(5, 0))
+        self.root.bind("<Delete>", self._on_delete_key)
+
+        # Undo / redo of adds, edits, deletes and initial amount changes
+        for key in ("<Control-z>", "<Control-Z>"):
+            self.root.bind(key, lambda e: self.undo())
+        for key in ("<Control-y>", "<Control-Y>"):
+            self.root.bind(key, lambda e: self.redo())
+
         # Calendar popup for date selection
         self.calendar_popup = tk.Toplevel(self.root, bg=BG_COLOR)
         self.calendar_popup.withdraw()           # Hide initially
@@ -274,27 +349,69 @@ class ExpenseTrackerApp:
             command=self.select_date
         ).pack(pady=(0, 10))
 
-        # Expense table (Treeview)
+        # Search bar: filters the table by place words, category, date and
+        # amount (syntax in search_index.py), e.g. "lidl cat:food 03.2024 >50"
+        bar = ttk.Frame(self.root)
+        bar.pack(fill="x", padx=20, pady=(10, 0))
+        ttk.Label(bar, text="Search:").pack(side="left")
+        search_entry = ttk.Entry(bar, textvariable=self.search_var, width=40)
+        search_entry.pack(side="left", padx=(5, 0))
+        ttk.Button(
+            bar,
+            text="✕",
+            width=3,
+            command=lambda: self.search_var.set("")
+        ).pack(side="left", padx=(5, 0))
+        ttk.Label(bar, textvariable=self.search_text_var).pack(side="left", padx=(10, 0))
+
+        # Filter while typing (after a short pause); Enter searches at once
+        # instead of adding an expense
+        self.search_var.trace_add("write", lambda *_: self._schedule_search())
+        search_entry.bind("<Return>", self._on_search_return)
+
+        # Expense table (Treeview) with its own scrollbar.
+        # The table is virtualized: it only holds as many rows as fit on
+        # screen, and scrolling rebinds those rows to a new data window.
+        table = ttk.Frame(self.root)
+        table.pack(fill="both", expand=True, pady=10, padx=20)
+
         cols = ("Date", "Amount", "Category", "Place", "Actions")
         self.tree = ttk.Treeview(
-            self.root,
+            table,
             columns=cols,
             show="headings",
             height=18,
             takefocus=0
         )
-        for c in cols[:-1]:  # All except "Actions"
-            self.tree.heading(c, text=c)
+        for c in cols[:-1]:  # All except "Actions"; click a heading to sort
+            self.tree.heading(c, text=c, command=lambda c=c: self.sort_by(c))
             self.tree.column(c, width=150, anchor="center")
 
         self.tree.heading("Actions", text="Edit/Delete")
         self.tree.column("Actions", width=140, anchor="center")
-        self.tree.pack(fill="both", expand=True, pady=10, padx=20)
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.tree_scroll = ttk.Scrollbar(
+            table,
+            orient="vertical",
+            command=self._on_scrollbar
+        )
+        self.tree_scroll.pack(side="right", fill="y")
+
+        # Floating Edit/Delete buttons, one recycled overlay per visible row
+        self.action_overlays = ActionOverlayPool(
+            self.root, self.tree, "#5",
+            on_edit=self.open_edit_popup,
+            on_delete=self.delete_expense,
+            on_enter=self._on_action_hover_enter,
+            on_leave=self._on_action_hover_leave
+        )
 
         # Row styling: zebra stripes + hover effect
         self.tree.tag_configure("odd", background="#ffffff")
         self.tree.tag_configure("even", background="#f2f2f2")
         self.tree.tag_configure("hover", background=ROW_HOVER_COLOR)
+        self.tree.tag_configure("duplicate", background=DUPLICATE_BG)
 
         # Treeview event bindings
         self.tree.bind("<Motion>", self._on_tree_motion)     # Hover effect
@@ -302,83 +419,508 @@ class ExpenseTrackerApp:
         self.tree.bind("<Button-1>", self._on_tree_click)    # Click actions
         self.tree.bind("<<TreeviewSelect>>", self._on_row_select)  # Row selection
 
-        # Redraw action buttons on layout changes
-        for evt in ("<Configure>", "<Expose>", "<MouseWheel>"):
-            self.tree.bind(evt, lambda e: self.redraw_action_buttons())
+        # Resize the row pool when the table is resized; both go through
+        # the redraw scheduler so bursts of events cost a single redraw
+        self.tree.bind("<Configure>", lambda e: self.request_render())
+        self.tree.bind("<Expose>", lambda e: self.redraws.request())
+
+        # Scroll the data window (Windows/macOS wheel, then X11 buttons)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", self._on_mousewheel)
+        self.tree.bind("<Button-5>", self._on_mousewheel)
 
         # Deselect rows when clicking outside Treeview
         self.root.bind("<Button-1>", self._on_click_outside)
 
     def _load_saved_data(self):
         """Load saved expenses and initial amount from storage, then populate the UI."""
-        # Retrieve saved data from storage
-        initial_changes, last_init, loaded_expenses = load_data()
-        self.initial_changes = initial_changes
-        self.initial_amount  = last_init
-
-        # Count frequency of each place for dropdown suggestions
-        for exp in loaded_expenses:
-            self.place_counter[exp.place] += 1
-
-        # Update place dropdown with most common places
-        self.place_dropdown['values'] = [
-            p for p, _ in self.place_counter.most_common()
-        ]
+        # Loading announces "reset", which fills the data window
+        self.ledger.load()
 
-        # Populate Treeview with loaded expenses
-        for exp in loaded_expenses:
-            idx = len(self.tree.get_children())  # Current number of rows
-            tag = "even" if idx % 2 == 0 else "odd"  # Zebra striping
-            rid = self.tree.insert(
-                "", "end",
-                values=(
-                    exp.date.strftime("%d.%m.%Y"),  # Format date
-                    f"{exp.amount:.2f}",            # Format amount
-                    exp.category,
-                    exp.place,
-                    ""                              # Placeholder for action buttons
-                ),
-                tags=(tag,)
-            )
-            self.expenses[rid] = exp  # Map row ID to Expense object
-            self.add_action_buttons(rid)  # Add Edit/Delete buttons
+        # Flag likely duplicates in the table: one pass over the loaded
+        # expenses, then kept current by every change and lazy load
+        self.duplicate_ids = self.ledger.flagged_duplicates()
+
+        # With partitioned storage only recent months are loaded; load
+        # older ones until the table is full
+        while len(self.view_ids) < self._viewport_rows() and self.ledger.has_unloaded():
+            self.ledger.load_older()
+        self._render_rows()
 
         # Update initial amount display
-        self.initial_text_var.set(f"Initial Amount: €{self.initial_amount:.2f}")
+        self.initial_text_var.set(f"Initial Amount: €{self.ledger.initial_amount:.2f}")
         self.refresh_current()  # Recalculate and display current balance
 
-    def _restyle_rows(self):
-        """Reapply zebra striping to Treeview rows after any change."""
-        for i, rid in enumerate(self.tree.get_children()):
-            tag = "even" if i % 2 == 0 else "odd"
-            self.tree.item(rid, tags=(tag,))
+    def _on_ledger_change(self, event, eids):
+        """
+        Update the view after the ledger changed.
+
+        Args:
+            event (str): What changed (see ledger.py).
+            eids (list[int]): IDs of the affected expenses.
+        """
+        if event == "reset":
+            # Show loaded expenses in stored order; only the visible window
+            # is materialized as Treeview rows
+            self.view_ids    = eids
+            self.view_offset = 0
+            self.selected_ids.clear()
+            return
+
+        if event == "load":
+            self._show_loaded(self._in_search(eids))
+            return
+
+        # Every other change is journaled and awaits the next snapshot
+        self.autosaver.mark_dirty()
+
+        if event == "delete":
+            self.selected_ids.difference_update(eids)
+
+        if event == "initial":
+            self.initial_text_var.set(f"Initial Amount: €{self.ledger.initial_amount:.2f}")
+        elif isinstance(self.view_ids, SortedView):
+            pass  # The maintained sort order already includes the change
+        elif event == "add":
+            if self.sort_column is None:
+                self.view_ids.extend(self._in_search(eids))
+            else:
+                for eid in self._in_search(eids):
+                    self._insert_in_view(eid)
+        elif event == "restore":
+            if self.sort_column is None:
+                self._restore_in_view(self._in_search(eids))
+            else:
+                for eid in self._in_search(eids):
+                    self._insert_in_view(eid)
+        elif event == "edit" and self.search_query is not None:
+            # An edit can move an expense into, out of or within the results
+            for eid in eids:
+                shown = eid in self.view_ids
+                if shown and (self.sort_column is not None or not self._in_search([eid])):
+                    self.view_ids.remove(eid)
+                    shown = False
+                if not shown and self._in_search([eid]):
+                    self._insert_in_view(eid)
+        elif event == "delete":
+            # Drop deleted rows from the data window; the pool rows are
+            # rebound in place and restriped from their positions
+            if len(eids) == 1:
+                if eids[0] in self.view_ids:  # Hidden by the search otherwise
+                    self.view_ids.remove(eids[0])
+            else:
+                gone = set(eids)
+                self.view_ids = [eid for eid in self.view_ids if eid not in gone]
+
+        if self.search_query is not None:
+            self._update_search_text()
+        self.request_render()
+        self.refresh_current()
+
+    # === Search ===
+    def _schedule_search(self):
+        """Search once typing pauses, instead of on every keystroke."""
+        if self._search_job is not None:
+            self.root.after_cancel(self._search_job)
+        self._search_job = self.root.after(SEARCH_DELAY_MS, self.apply_search)
+
+    def apply_search(self):
+        """Show only the expenses matching the search bar (all if it is empty)."""
+        if self._search_job is not None:
+            self.root.after_cancel(self._search_job)
+            self._search_job = None
+
+        try:
+            query = parse_query(self.search_var.get())
+        except ValueError as err:
+            self.search_text_var.set(str(err))
+            return
+
+        self.search_query = query or None
+        self._refresh_view()
+        self._update_search_text()
+
+    # === Sorting ===
+    def sort_by(self, column):
+        """
+        Sort the table by a column heading; clicking the same heading again
+        reverses the order.
+
+        Args:
+            column (str): Heading text ("Date", "Amount", "Category", "Place").
+        """
+        column = column.lower()
+        if self.sort_column == column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column, self.sort_descending = column, False
+
+        # Show the direction on the sorted heading
+        arrow = " ▼" if self.sort_descending else " ▲"
+        for c in ("Date", "Amount", "Category", "Place"):
+            self.tree.heading(c, text=c + (arrow if c.lower() == column else ""))
+
+        self._refresh_view()
+
+    def _refresh_view(self):
+        """
+        Rebuild the data window from the active search and sort order.
+
+        Without a search, a sorted table is a live view of the ledger's
+        maintained sort order: switching columns or directions only reads
+        the rows on screen, and changes need no re-sort. Search results
+        are sorted once (O(m log m)) and then kept in order on changes.
+        """
+        # The first search or sort by a column builds its index
+        self.root.config(cursor="watch")
+        self.root.update_idletasks()
+        try:
+            if self.search_query is not None:
+                eids = self.ledger.search(self.search_query)
+                if self.sort_column is not None:
+                    eids = self.ledger.sort_ids(eids, self.sort_column, self.sort_descending)
+                self.view_ids = eids
+            elif self.sort_column is not None:
+                self.view_ids = self.ledger.sorted_view(self.sort_column, self.sort_descending)
+            else:
+                self.view_ids = list(self.ledger.expenses)
+        finally:
+            self.root.config(cursor="")
+
+        self.view_offset = 0
+        self.request_render()
+
+    def _insert_in_view(self, eid):
+        """
+        Insert an expense into the search results at its position (stored
+        order, or the sort order when a column is sorted).
+
+        Args:
+            eid (int): The expense ID.
+        """
+        ids = self.view_ids
+        if self.sort_column is None:
+            insort(ids, eid, key=self.ledger.expenses.position)
+            return
+
+        key = self.ledger.sort_key(self.sort_column)
+        if not self.sort_descending:
+            insort(ids, eid, key=key)
+            return
+
+        # Binary search on the descending list
+        target = key(eid)
+        lo, hi = 0, len(ids)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if key(ids[mid]) > target:
+                lo = mid + 1
+            else:
+                hi = mid
+        ids.insert(lo, eid)
+
+    def _restore_in_view(self, eids):
+        """
+        Put expenses restored by undo/redo back into the unsorted view, each
+        right after the shown expense stored before it (O(n log n)).
+
+        Lazily loaded months are shown above the ones loaded first, so the
+        view is not always in stored order; placing each expense after its
+        stored predecessor still puts it back where it was deleted from.
+
+        Args:
+            eids (list[int]): IDs of the restored expenses.
+        """
+        if not eids:
+            return
+        position = self.ledger.expenses.position
+        ids = self.view_ids
+
+        by_position = sorted(range(len(ids)), key=lambda i: position(ids[i]))
+        positions = [position(ids[i]) for i in by_position]
+        after = {}  # View index -> restored IDs that follow it (-1 = top)
+        for eid in sorted(eids, key=position):
+            k = bisect_left(positions, position(eid))
+            after.setdefault(by_position[k - 1] if k else -1, []).append(eid)
+
+        view = after.get(-1, [])
+        for i, eid in enumerate(ids):
+            view.append(eid)
+            view.extend(after.get(i, ()))
+        self.view_ids = view
+
+    def _on_search_return(self, event):
+        """Search immediately; keeps Enter from also adding an expense."""
+        self.apply_search()
+        return "break"
+
+    def _in_search(self, eids):
+        """
+        Return the IDs among `eids` that match the active search.
+
+        Args:
+            eids (list[int]): Expense IDs, e.g. just added or loaded.
+        """
+        if self.search_query is None:
+            return eids
+        row, matches = self.ledger.expenses.row, self.search_query.matches
+        return [eid for eid in eids if matches(row(eid))]
+
+    def _update_search_text(self):
+        """Show the number of matches and their most common categories."""
+        if self.search_query is None:
+            self.search_text_var.set("")
+            return
+        facets = self.ledger.search_facets(self.view_ids)
+        top = ", ".join(f"{cat} {n}" for cat, n in facets.most_common(3))
+        self.search_text_var.set(
+            f"{len(self.view_ids)} matches" + (f" ({top})" if top else "")
+        )
+
+    # === Virtualized Table ===
+    def _row_values(self, eid):
+        """
+        Build the Treeview values for an expense.
+
+        Args:
+            eid (int): The expense ID.
+        """
+        exp = self.ledger.expenses[eid]
+        return (
+            exp.date.strftime("%d.%m.%Y"),  # Format date
+            f"{exp.amount:.2f}",            # Format amount
+            exp.category,
+            exp.place,
+            ""                              # Placeholder for action buttons
+        )
+
+    def _viewport_rows(self):
+        """Return how many rows fit in the visible area of the Treeview."""
+        height = self.tree.winfo_height()
+        if height <= 1:
+            # Not mapped yet: fall back to the configured height
+            return int(self.tree.cget("height"))
+
+        row_height = int(ttk.Style(self.root).lookup("Treeview", "rowheight") or 36)
+
+        # The first row's bbox tells us where the heading ends
+        header = row_height
+        if self.pool_rows:
+            bbox = self.tree.bbox(self.pool_rows[0])
+            if bbox:
+                header = bbox[1]
+
+        return max(1, (height - header) // row_height)
+
+    def _row_color(self, row_id):
+        """
+        Return the background color for a pool row's action overlay,
+        from the cached zebra tag and the hover/selection state (O(1)).
+        """
+        if row_id in self._selected_rows:
+            return "#d3d3d3"
+        if row_id == self._hovered_row:
+            return ROW_HOVER_COLOR
+        tag = self.row_styles.get(row_id)
+        if tag == "duplicate":
+            return DUPLICATE_BG
+        return "#f2f2f2" if tag == "even" else "#ffffff"
+
+    def request_render(self):
+        """Schedule a coalesced re-render of the visible rows."""
+        self._render_needed = True
+        self.redraws.request()
+
+    def _on_redraw(self):
+        """Scheduled redraw: re-render rows if needed, else just move overlays."""
+        if self._render_needed:
+            self._render_rows()
+        else:
+            self.redraw_action_buttons()
+
+    def _render_rows(self):
+        """
+        Bind the Treeview row pool to the current data window.
+
+        Grows or shrinks the pool to the viewport size, then rewrites each
+        pool row with the expense at its position. Cost depends only on the
+        number of visible rows, not on the size of the ledger.
+        """
+        self._render_needed = False
+
+        capacity = self._viewport_rows()
+        total    = len(self.view_ids)
+
+        # Clamp the window to the data
+        self.view_offset = max(0, min(self.view_offset, total - capacity))
+        count = min(capacity, total)
+
+        # Grow the row pool in one batch; overlays for the new rows are
+        # attached after a single layout pass below
+        new_rows = []
+        while len(self.pool_rows) < count:
+            rid = self.tree.insert("", "end", values=("", "", "", "", ""))
+            self.pool_rows.append(rid)
+            new_rows.append(rid)
+
+        # Shrink the row pool (overlays are recycled, not destroyed)
+        while len(self.pool_rows) > count:
+            rid = self.pool_rows.pop()
+            self.action_overlays.detach(rid)
+            if rid == self._hovered_row:
+                self._hovered_row = None
+            self.row_styles.pop(rid, None)
+            self.tree.delete(rid)
+
+        # Rebind each pool row to the expense at its position, caching
+        # its zebra (or duplicate) tag so hover handling never has to look it up
+        self.ledger.expenses.unbind_all_rows()
+        selected_rows = set()
+        for i, rid in enumerate(self.pool_rows):
+            pos = self.view_offset + i
+            eid = self.view_ids[pos]
+            if eid in self.duplicate_ids:
+                tag = "duplicate"
+            else:
+                tag = "even" if pos % 2 == 0 else "odd"
+            self.row_styles[rid] = tag
+
+            self.tree.item(
+                rid,
+                values=self._row_values(eid),
+                tags=("hover",) if rid == self._hovered_row else (tag,)
+            )
+            self.ledger.expenses.bind_row(eid, rid)
+
+            if eid in self.selected_ids:
+                selected_rows.add(rid)
+
+        # Keep the Treeview selection in sync with the selected expenses.
+        # Recording it first makes the resulting <<TreeviewSelect>> a no-op.
+        self._selected_rows = selected_rows
+        self.tree.selection_set(list(selected_rows))
+
+        # Recolor overlays (unchanged colors cost no Tk call)
+        for rid in self.pool_rows:
+            self._set_action_frame_color(rid, self._row_color(rid))
+
+        # One layout pass for the whole batch, then attach its overlays
+        if new_rows:
+            self.tree.update_idletasks()
+            for rid in new_rows:
+                self.action_overlays.attach(rid, self._row_color(rid))
+
+        self._update_scrollbar()
+        self.redraw_action_buttons()
+
+    def _update_scrollbar(self):
+        """Update the scrollbar slider to reflect the current data window."""
+        total = len(self.view_ids)
+        if not total:
+            self.tree_scroll.set(0, 1)
+            return
+        first = self.view_offset / total
+        last  = (self.view_offset + len(self.pool_rows)) / total
+        self.tree_scroll.set(first, last)
+
+    def _scroll_to(self, offset):
+        """
+        Move the data window so that `offset` is the first visible row.
+
+        Args:
+            offset (int): Index into view_ids.
+        """
+        # Scrolling to the top loads the next older period, if any
+        if offset <= 0 and self.ledger.has_unloaded():
+            before = self.view_offset
+            self.ledger.load_older()
+            offset += self.view_offset - before
+
+        if offset != self.view_offset:
+            self.view_offset = offset
+            self.request_render()
+
+    def _on_scrollbar(self, action, *args):
+        """Handle scrollbar drags ("moveto") and arrow/page clicks ("scroll")."""
+        if action == "moveto":
+            self._scroll_to(int(float(args[0]) * len(self.view_ids)))
+        elif action == "scroll":
+            step = len(self.pool_rows) if args[1] == "pages" else 1
+            self._scroll_to(self.view_offset + int(args[0]) * step)
+
+    def _on_mousewheel(self, event):
+        """Scroll the data window with the mouse wheel (3 rows per notch)."""
+        if event.num == 4 or event.delta > 0:
+            self._scroll_to(self.view_offset - 3)
+        else:
+            self._scroll_to(self.view_offset + 3)
+        return "break"  # Prevent the Treeview's own scrolling
+
+    def _bind_place_suggestions(self, combobox, var):
+        """
+        Fill a place Combobox with the most used places matching what has
+        been typed, when its list opens and after every key press.
+
+        Args:
+            combobox (ttk.Combobox): Place input.
+            var (tk.StringVar): Variable bound to the Combobox.
+        """
+        def suggest(event=None):
+            # Prefix lookup in the place index; no full sort of all places
+            combobox['values'] = self.ledger.suggest_places(var.get())
+
+        combobox.configure(postcommand=suggest)
+        combobox.bind("<KeyRelease>", suggest, add="+")
+
+    def _show_loaded(self, eids):
+        """
+        Add lazily loaded expenses to the top of the data window, keeping
+        the rows currently on screen in place.
 
-    def _set_widget_bg(self, widget, color):
-        """Set background color for a widget if it's a Frame."""
-        if isinstance(widget, tk.Frame):
-            widget.config(bg=color)
+        Args:
+            eids (list[int]): IDs of the expenses that were just loaded.
+        """
+        if not eids:
+            return
+        if isinstance(self.view_ids, SortedView):
+            self.request_render()  # Already placed by the sort order
+            return
+        self.view_ids[:0] = eids
+        self.view_offset += len(eids)
+        self.request_render()
 
     def _set_action_frame_color(self, row_id, color):
         """
-        Set the background color of the action frame and all its child widgets
-        for a given Treeview row.
+        Set the background color of the action overlay for a given Treeview row.
 
         Args:
-            row_id (str): The Treeview row ID associated with the action frame.
+            row_id (str): The Treeview row ID associated with the overlay.
             color (str): The background color to apply.
         """
-        frame = self.action_frames.get(row_id)
-        if frame:
-            # Set background for the frame itself
-            self._set_widget_bg(frame, color)
+        self.action_overlays.set_color(row_id, color)
+
+    def _set_hover(self, row_id):
+        """
+        Move the hover styling to a row (or clear it with None).
+        Only the previously hovered row and the new one are touched.
 
-            # Set background for each child widget inside the frame
-            for child in frame.winfo_children():
-                self._set_widget_bg(child, color)
+        Args:
+            row_id (str or None): The row to highlight.
+        """
+        if row_id == self._hovered_row:
+            return
+
+        previous, self._hovered_row = self._hovered_row, row_id
 
-                # Set background for grandchildren (e.g., buttons inside nested frames)
-                for grandchild in child.winfo_children():
-                    self._set_widget_bg(grandchild, color)
+        # Restore the cached zebra styling of the previously hovered row
+        if previous:
+            self.tree.item(previous, tags=(self.row_styles[previous],))
+            self._set_action_frame_color(previous, self._row_color(previous))
+
+        # Apply hover styling to the new row and its action overlay
+        if row_id:
+            self.tree.item(row_id, tags=("hover",))
+            self._set_action_frame_color(row_id, self._row_color(row_id))
 
     def _on_tree_motion(self, event):
         """
@@ -389,58 +931,37 @@ class ExpenseTrackerApp:
 
         # If hovering over a new row
         if row_id != self._hovered_row:
-            # Restore background of previously hovered row
-            if self._hovered_row:
-                idx = self.tree.index(self._hovered_row)
-                orig = "even" if idx % 2 == 0 else "odd"  # Determine original zebra tag
-                self.tree.item(self._hovered_row, tags=(orig,))
-
-                # Restore background of action frame and its children
-                if self._hovered_row in self.action_frames:
-                    frame = self.action_frames[self._hovered_row]
-                    color = "#f2f2f2" if orig == "even" else "#ffffff"
-                    self._set_widget_bg(frame, color)
-                    for child in frame.winfo_children():
-                        self._set_widget_bg(child, color)
-                        for grandchild in child.winfo_children():
-                            self._set_widget_bg(grandchild, color)
-
-            # Apply hover styling to the new row
-            if row_id:
-                self.tree.item(row_id, tags=("hover",))
-
-                # Highlight action frame and its children
-                if row_id in self.action_frames:
-                    frame = self.action_frames[row_id]
-                    self._set_widget_bg(frame, ROW_HOVER_COLOR)
-                    for child in frame.winfo_children():
-                        self._set_widget_bg(child, ROW_HOVER_COLOR)
-                        for grandchild in child.winfo_children():
-                            self._set_widget_bg(grandchild, ROW_HOVER_COLOR)
-
-            # Reset hover state
-            self._hover_inside_actions = False
-            self._hovered_row = row_id
+            self._hover_inside_actions = False  # Reset hover state
+            self._set_hover(row_id)
 
     def _on_tree_leave(self, event):
         """
         Triggered when the mouse leaves the Treeview area.
         Restores the original styling of the previously hovered row.
         """
-        if self._hovered_row:
-            idx = self.tree.index(self._hovered_row)
-            orig = "even" if idx % 2 == 0 else "odd"  # Determine original zebra tag
-            self.tree.item(self._hovered_row, tags=(orig,))
-            self._hovered_row = None  # Clear hover state
+        self._set_hover(None)
 
     def _on_tree_click(self, event):
         """
-        Triggered when the Treeview is clicked.
-        If the click is outside any row, deselect all selected rows.
+        Triggered when the Treeview is clicked, before the row selection changes.
+        A plain click on a row starts a new selection, dropping expenses
+        selected earlier even if they are scrolled out of view; Shift and
+        Ctrl clicks extend it. A click outside any row deselects everything.
         """
+        if self.tree.identify_region(event.x, event.y) in ("heading", "separator"):
+            return  # Sorting or resizing columns keeps the selection
+
         row_id = self.tree.identify_row(event.y)
         if not row_id:
-            self.tree.selection_remove(self.tree.selection())
+            self._clear_selection()
+        elif not event.state & _EXTEND_SELECTION:
+            eid = self.ledger.expenses.id_of_row(row_id)
+            self.selected_ids = {eid} if eid is not None else set()
+
+    def _clear_selection(self):
+        """Deselect every expense, including rows scrolled out of view."""
+        self.selected_ids.clear()
+        self.tree.selection_remove(self.tree.selection())
 
     def center_window(self, win):
         """
@@ -501,33 +1022,20 @@ class ExpenseTrackerApp:
         ttk.Label(frm, text="Enter new initial amount (€):").pack(pady=(0, 10))
 
         # Entry field with current amount pre-filled
-        var = tk.StringVar(value=f"{self.initial_amount:.2f}")
+        var = tk.StringVar(value=f"{self.ledger.initial_amount:.2f}")
         ent = ttk.Entry(frm, textvariable=var, width=20)
         ent.pack(pady=(0, 10))
         ent.focus()
 
         # Save button logic
         def save():
-            val = var.get().replace(",", ".").strip()
+            # The ledger validates (max two decimals) and journals the change;
+            # its "initial" notification updates the labels
             try:
-                amt = float(val)
-                # Ensure max two decimal places
-                if '.' in val and len(val.split('.')[-1]) > 2:
-                    raise ValueError
-
-                # Update internal state
-                self.initial_amount = round(amt, 2)
-                self.initial_changes.append(
-                    InitialChange(date.today(), self.initial_amount)
-                )
-
-                # Update UI
-                self.initial_text_var.set(f"Initial Amount: €{self.initial_amount:.2f}")
-                self.refresh_current()
-                popup.destroy()
-
-            except:
-                messagebox.showerror("Invalid", "Enter a valid amount.")
+                self.ledger.set_initial_amount(var.get())
+            except ValueError as err:
+                return messagebox.showerror("Invalid", str(err))
+            popup.destroy()
 
         # Save button
         ttk.Button(frm, text="Save", command=save).pack()
@@ -537,18 +1045,190 @@ class ExpenseTrackerApp:
 
     def refresh_current(self):
         """
-        Recalculate and update the current remaining budget.
-        Displays the difference between initial amount and total expenses.
+        Update the current remaining budget.
+        Displays the difference between initial amount and total expenses,
+        using the ledger's running total in exact integer cents (O(1)).
         """
-        total = sum(exp.amount for exp in self.expenses.values())  # Sum all expenses
-        bal   = self.initial_amount - total                         # Calculate remaining balance
+        bal = self.ledger.balance_cents()  # Remaining balance in cents
 
         # Update UI label
-        self.current_text_var.set(f"Current Amount: €{bal:.2f}")
+        self.current_text_var.set(f"Current Amount: €{format_cents(bal)}")
 
         # Adjust button width to fit new text
         self.update_button_width()
 
+        # Keep an open summary window current (reads only the rollup buckets)
+        if self.summary_popup is not None:
+            self._summary_refresh()
+
+    def find_duplicates(self):
+        """
+        Select every likely duplicate expense except the first of each
+        group, so they can be reviewed and removed with "Delete Selected".
+        """
+        groups = self.ledger.duplicate_groups()
+        if not groups:
+            return messagebox.showinfo("Duplicates", "No likely duplicates found.")
+
+        self.selected_ids = {eid for group in groups for eid in group[1:]}
+
+        # Bring the first selected expense into view
+        self.view_offset = next(
+            (pos for pos, eid in enumerate(self.view_ids) if eid in self.selected_ids),
+            self.view_offset
+        )
+        self.request_render()
+
+        messagebox.showinfo(
+            "Duplicates",
+            f"{len(groups)} group(s) of likely duplicates found.\n"
+            f"{len(self.selected_ids)} later entries are selected; "
+            "use Delete Selected to remove them."
+        )
+
+    def import_statement(self):
+        """
+        Import a bank statement or CSV export chosen by the user.
+
+        The file is streamed through the import pipeline and added as one
+        batch, so the table and balance are refreshed once at the end;
+        progress is shown in the window title meanwhile.
+        """
+        path = filedialog.askopenfilename(
+            title="Import expenses",
+            filetypes=[("CSV files", "*.csv *.txt"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+
+        title = self.root.title()
+
+        def progress(stats):
+            self.root.title(f"Importing... {stats.fraction:.0%}")
+            self.root.update_idletasks()
+
+        self.root.config(cursor="watch")
+        try:
+            # Credits are skipped only if the file has signed amounts
+            stats = importer.import_file(self.ledger, path, progress=progress)
+        except (OSError, ValueError) as err:
+            return messagebox.showerror("Import failed", str(err))
+        finally:
+            self.root.title(title)
+            self.root.config(cursor="")
+
+        lines = [
+            f"Imported: {stats.imported}",
+            f"Already in the ledger: {stats.duplicates}",
+            f"Rejected: {stats.errors}",
+        ]
+        if stats.credits:
+            lines.insert(2, f"Incoming payments skipped: {stats.credits}")
+        lines += stats.error_samples[:5]
+        messagebox.showinfo("Import", "\n".join(lines))
+
+    def open_summary_popup(self):
+        """
+        Opens a window with spending totals per month, category and place.
+        All figures come from the store's rollup index, so opening and
+        refreshing it costs O(number of buckets), not O(number of expenses).
+        """
+        if self.summary_popup is not None:
+            self.summary_popup.lift()
+            return
+
+        rollups = self.ledger.rollups
+        popup = tk.Toplevel(self.root, bg=BG_COLOR)
+        popup.title("Spending Summary")
+
+        frm = ttk.Frame(popup, padding=15)
+        frm.pack(fill="both", expand=True)
+
+        # Month filter for the category and place tables
+        ttk.Label(frm, text="Month:").grid(row=0, column=0, sticky="w", pady=4)
+        month_var = tk.StringVar(value="All months")
+        month_cb = ttk.Combobox(frm, textvariable=month_var, state="readonly", width=15)
+        month_cb.grid(row=0, column=1, sticky="w", pady=4)
+
+        # One table per summary
+        tables = {}
+        for col, (key, title) in enumerate((("month", "Month"),
+                                            ("category", "Category"),
+                                            ("place", "Place"))):
+            tree = ttk.Treeview(frm, columns=(title, "Total", "Count"),
+                                show="headings", height=15)
+            for name, width in ((title, 140), ("Total", 100), ("Count", 60)):
+                tree.heading(name, text=name)
+                tree.column(name, width=width, anchor="w" if name == title else "e")
+            tree.grid(row=1, column=col * 2, columnspan=2, padx=5, pady=(10, 0), sticky="nsew")
+            tables[key] = tree
+
+        def fill(tree, totals):
+            """Replace a table's rows with (name, (cents, count)) pairs."""
+            tree.delete(*tree.get_children())
+            for name, (cents, count) in totals:
+                tree.insert("", "end", values=(name, format_cents(cents), count))
+
+        def refresh():
+            months = rollups.months()
+            month_cb['values'] = ["All months"] + months[::-1]
+            month = month_var.get()
+            if month not in months:
+                month_var.set("All months")
+                month = None
+
+            by_total = lambda item: -item[1][0]
+            fill(tables["month"], reversed(rollups.month_totals().items()))
+            fill(tables["category"], sorted(rollups.category_totals(month).items(), key=by_total))
+            fill(tables["place"], sorted(rollups.place_totals(month).items(), key=by_total))
+            if range_text.get():
+                calculate()
+
+        def close():
+            self.summary_popup = None
+            popup.destroy()
+
+        # Date range totals and balance on a date (O(log n) each)
+        dates = self.ledger.dates
+        rng = ttk.Frame(frm)
+        rng.grid(row=2, column=0, columnspan=6, sticky="w", pady=(10, 0))
+
+        today = date.today()
+        from_var = tk.StringVar(value=today.replace(day=1).strftime("%d.%m.%Y"))
+        to_var   = tk.StringVar(value=today.strftime("%d.%m.%Y"))
+        range_text = tk.StringVar()
+
+        ttk.Label(rng, text="From:").pack(side="left")
+        ttk.Entry(rng, textvariable=from_var, width=12).pack(side="left", padx=(5, 10))
+        ttk.Label(rng, text="To:").pack(side="left")
+        ttk.Entry(rng, textvariable=to_var, width=12).pack(side="left", padx=(5, 10))
+
+        def calculate():
+            try:
+                start = datetime.strptime(from_var.get().strip(), "%d.%m.%Y").date()
+                end   = datetime.strptime(to_var.get().strip(), "%d.%m.%Y").date()
+            except ValueError:
+                range_text.set("Enter dates as dd.mm.yyyy.")
+                return
+            spent = dates.total_between(start, end)
+            count = dates.count_between(start, end)
+            range_text.set(
+                f"Spent: €{format_cents(spent)} ({count} expenses)   "
+                f"Balance on {end.strftime('%d.%m.%Y')}: €{format_cents(dates.balance_on(end))}"
+            )
+
+        ttk.Button(rng, text="Calculate", command=calculate).pack(side="left")
+        ttk.Label(rng, textvariable=range_text).pack(side="left", padx=(10, 0))
+
+        month_cb.bind("<<ComboboxSelected>>", lambda e: refresh())
+        ttk.Button(frm, text="Close", command=close)\
+            .grid(row=3, column=0, columnspan=6, pady=(10, 0))
+        popup.protocol("WM_DELETE_WINDOW", close)
+
+        self.summary_popup   = popup
+        self._summary_refresh = refresh
+        refresh()
+
     def toggle_calendar(self):
         """
         Toggle visibility of the calendar popup.
@@ -583,171 +1263,93 @@ class ExpenseTrackerApp:
         Adds a new expense entry to the tracker.
         Validates input, updates internal data, and refreshes the UI.
         """
-        # Get and sanitize input values
-        amt_s = self.amount_entry.get().strip()
-        cat   = self.category_var.get().strip()
-        plc   = self.place_var.get().strip()
-
-        # Validate amount
         try:
-            amt = float(amt_s)
-        except:
-            return messagebox.showerror("Invalid", "Enter numeric amount.")
-
-        # Validate category and place
-        if not cat:
-            return messagebox.showerror("Missing", "Select a category.")
-        if not plc:
-            return messagebox.showerror("Missing", "Enter a place.")
-
-        # Update place frequency counter and dropdown suggestions
-        self.place_counter[plc] += 1
-        self.place_dropdown['values'] = [
-            p for p, _ in self.place_counter.most_common()
-        ]
-
-        # Determine row styling tag (zebra striping)
-        idx = len(self.tree.get_children())
-        tag = "even" if idx % 2 == 0 else "odd"
-
-        # Insert new row into Treeview
-        rid = self.tree.insert(
-            "", "end",
-            values=(
-                self.selected_date.strftime("%d.%m.%Y"),  # Format date
-                f"{amt:.2f}",                             # Format amount
-                cat,
-                plc,
-                ""                                        # Placeholder for action buttons
-            ),
-            tags=(tag,)
-        )
-
-        # Store expense object and add action buttons
-        self.expenses[rid] = Expense(self.selected_date, amt, cat, plc)
-        self.add_action_buttons(rid)
+            exp = self.ledger.validate_expense(
+                self.selected_date,
+                self.amount_entry.get(),
+                self.category_var.get(),
+                self.place_var.get()
+            )
+        except ValueError as err:
+            return messagebox.showerror("Invalid", str(err))
+
+        # Warn about a likely double entry (O(1) hash lookup)
+        if self.ledger.likely_duplicates(exp) and not messagebox.askyesno(
+            "Possible duplicate",
+            f"An expense of €{exp.amount:.2f} at {exp.place} "
+            f"({exp.category}) on {exp.date.strftime('%d.%m.%Y')} "
+            "already exists.\n\nAdd it anyway?"
+        ):
+            return
 
-        # Refresh current balance display
-        self.refresh_current()
+        # The ledger stores and journals the expense; its "add"
+        # notification appends it to the table and refreshes the balance
+        self.ledger.add_expense(exp.date, exp.amount, exp.category, exp.place)
 
         # ✅ Clear input fields for next entry
         self.amount_entry.delete(0, tk.END)
         self.place_var.set("")
         self.category_dropdown.current(0)  # Optional: reset category to first item
 
-        # ✅ Reposition action buttons after Treeview update
-        self.root.after(100, self.redraw_action_buttons)
-
-    def add_action_buttons(self, row_id):
+    def delete_expense(self, row_id):
         """
-        Adds Edit and Delete buttons to the 'Actions' column of a Treeview row.
+        Deletes the expense shown in a Treeview row from the internal data.
 
         Args:
-            row_id (str): The Treeview row ID to attach buttons to.
+            row_id (str): The Treeview row ID showing the expense.
         """
-        # Avoid duplicate button frames
-        if row_id in self.action_frames:
+        eid = self.ledger.expenses.id_of_row(row_id)
+        if eid is None:
             return
 
-        self.tree.update_idletasks()  # Ensure layout is up-to-date
-
-        # Get bounding box of the 'Actions' column for this row
-        bbox = self.tree.bbox(row_id, column="#5")  # Column index as string
-        if not bbox:
-            return  # Row might not be visible yet
-
-        x, y, w, h = bbox
-
-        # Calculate absolute position relative to root window
-        abs_x = self.tree.winfo_rootx() - self.root.winfo_rootx() + x
-        abs_y = self.tree.winfo_rooty() - self.root.winfo_rooty() + y
-
-        # Determine background color based on zebra striping
-        tags = self.tree.item(row_id, "tags")
-        if "even" in tags:
-            bg_color = "#f2f2f2"
-        elif "odd" in tags:
-            bg_color = "#ffffff"
-        else:
-            bg_color = "#ffffff"
-
-        # Create outer frame that overlays the cell
-        frm = tk.Frame(self.root, bg=bg_color, bd=0, highlightthickness=0)
-        frm.place(x=abs_x, y=abs_y, width=w, height=h)
+        # Delete and journal it; the "delete" notification drops it from
+        # the data window without touching any other row
+        self.ledger.delete_expenses([eid])
 
-        # Bind hover events for styling
-        frm.bind("<Enter>", lambda e: self._on_action_hover_enter(row_id))
-        frm.bind("<Leave>", lambda e: self._on_action_hover_leave(row_id))
-
-        # Inner frame to center buttons within the cell
-        inner = tk.Frame(frm, bg=bg_color)
-        inner.place(relx=0.5, rely=0.5, anchor="center")  # Centered placement
-
-        # Create Edit button
-        ttk.Button(
-            inner,
-            text="Edit",
-            style="Action.TButton",
-            command=lambda: self.open_edit_popup(row_id),
-            width=6
-        ).pack(side="left", padx=(2, 2))
-
-        # Create Delete button
-        ttk.Button(
-            inner,
-            text="Delete",
-            style="Action.TButton",
-            command=lambda: self.delete_expense(row_id),
-            width=6
-        ).pack(side="left", padx=(2, 2))
-
-        # Store reference to the frame for future updates
-        self.action_frames[row_id] = frm
-
-    def delete_expense(self, row_id):
+    def delete_selected(self):
         """
-        Deletes an expense entry from the Treeview and internal data.
+        Deletes every selected expense, including selected rows that are
+        scrolled out of view, after asking for confirmation.
 
-        Args:
-            row_id (str): The Treeview row ID to delete.
+        The data window is filtered in one pass and re-rendered once, so
+        deleting many rows costs about the same as deleting one.
         """
-        # Remove and destroy the associated action button frame
-        frame = self.action_frames.pop(row_id, None)
-        if frame:
-            frame.destroy()
+        eids = self.selected_ids & self.ledger.expenses.keys()
+        if not eids:
+            return
 
-        # Remove the row from the Treeview
-        self.tree.delete(row_id)
+        if not messagebox.askyesno(
+            "Delete", f"Delete {len(eids)} selected expense(s)?"
+        ):
+            return
 
-        # Remove the expense from internal tracking
-        self.expenses.pop(row_id, None)
+        # One journal write for all of them, then a single pass over the
+        # data window and a single re-render (see _on_ledger_change)
+        self.ledger.delete_expenses(eids)
 
-        # Reapply zebra striping to remaining rows
-        self._restyle_rows()
+    def _on_delete_key(self, event):
+        """Delete the selected expenses, unless the user is editing a text field."""
+        if isinstance(event.widget, (tk.Entry, ttk.Entry)):
+            return
+        self.delete_selected()
 
-        # Refresh the current balance display
-        self.refresh_current()
+    def undo(self):
+        """Undo the latest change (Ctrl+Z); the ledger events update the view."""
+        if self.ledger.undo() is None:
+            self.root.bell()  # Nothing to undo
+
+    def redo(self):
+        """Redo the latest undone change (Ctrl+Y)."""
+        if self.ledger.redo() is None:
+            self.root.bell()  # Nothing to redo
 
     def redraw_action_buttons(self):
         """
-        Repositions all floating action button frames to align with their
-        corresponding Treeview rows. Hides frames if the row is not visible.
+        Repositions the floating action button overlays to align with their
+        Treeview rows. Only the overlays of visible rows exist, so the cost
+        does not grow with the ledger.
         """
-        for rid, frm in list(self.action_frames.items()):
-            # Get bounding box of the 'Actions' column for the row
-            bbox = self.tree.bbox(rid, column="#5")  # "#5" refers to the 5th column
-            if bbox:
-                x, y, w, h = bbox
-
-                # Calculate absolute position relative to root window
-                abs_x = self.tree.winfo_rootx() - self.root.winfo_rootx() + x
-                abs_y = self.tree.winfo_rooty() - self.root.winfo_rooty() + y
-
-                # Move the frame to match the cell's position
-                frm.place(x=abs_x, y=abs_y, width=w, height=h)
-            else:
-                # Hide the frame if the row is not currently visible
-                frm.place_forget()
+        self.action_overlays.redraw()
 
     def open_edit_popup(self, row_id):
         """
@@ -759,7 +1361,8 @@ class ExpenseTrackerApp:
         popup.overrideredirect(True)  # Remove window decorations
         popup.grab_set()              # Make popup modal
 
-        data = self.expenses[row_id]  # Get expense data for the selected row
+        eid  = self.ledger.expenses.id_of_row(row_id)
+        data = self.ledger.expenses[eid]  # Get expense data for the selected row
 
         # Outer frame with border
         outer = tk.Frame(popup, bg="#cccccc", bd=2)
@@ -849,40 +1452,27 @@ class ExpenseTrackerApp:
         plc_var = tk.StringVar(value=data.place)
         plc_cb = ttk.Combobox(
             frm, textvariable=plc_var,
-            values=list(self.place_counter.keys()),
+            values=[],
             width=28
         )
         plc_cb.grid(row=3, column=1, pady=4)
+        self._bind_place_suggestions(plc_cb, plc_var)
 
         # --- Save Button Logic ---
         def save_edit():
             try:
                 new_date = datetime.strptime(date_var.get(), "%d.%m.%Y").date()
-                new_amt  = float(amt_var.get())
-            except:
-                return messagebox.showerror("Invalid", "Check date/amount format.")
+            except ValueError:
+                return messagebox.showerror("Invalid", "Check date format.")
 
-            # Update expense data
-            data.date     = new_date
-            data.amount   = new_amt
-            data.category = cat_var.get().strip()
-            data.place    = plc_var.get().strip()
-
-            # Update Treeview row
-            self.tree.item(
-                row_id,
-                values=(
-                    data.date.strftime("%d.%m.%Y"),
-                    f"{data.amount:.2f}",
-                    data.category,
-                    data.place,
-                    ""
+            # The ledger validates, stores and journals the change; its
+            # "edit" notification re-renders the visible rows
+            try:
+                self.ledger.edit_expense(
+                    eid, new_date, amt_var.get(), cat_var.get(), plc_var.get()
                 )
-            )
-
-            # Refresh UI
-            self.refresh_current()
-            self.redraw_action_buttons()
+            except ValueError as err:
+                return messagebox.showerror("Invalid", str(err))
             popup.destroy()
 
         # --- Save & Cancel Buttons ---
@@ -910,38 +1500,48 @@ class ExpenseTrackerApp:
 
     def _on_click_outside(self, event):
         """
-        Deselects any selected Treeview rows if the user clicks outside the Treeview.
+        Deselects every expense (including rows scrolled out of view) if the
+        user clicks outside the table.
 
         Args:
             event (tk.Event): The mouse click event.
         """
         widget = event.widget
 
-        # If the clicked widget is not the Treeview or one of its children
-        if not str(widget).startswith(str(self.tree)):
-            self.tree.selection_remove(self.tree.selection())  # Clear selection
+        # If the clicked widget is not the Treeview, one of its children or its scrollbar
+        if widget is not self.tree_scroll and not str(widget).startswith(str(self.tree)):
+            self._clear_selection()
 
     def _on_row_select(self, event):
         """
-        Triggered when a Treeview row is selected.
-        Updates the background color of action frames to reflect selection.
+        Triggered when the Treeview selection changes.
+        Records the selection by expense ID and recolors only the action
+        overlays of rows whose selection state actually changed.
         """
-        selected = self.tree.selection()  # Get selected row IDs
-
-        for row_id in self.tree.get_children():
-            tags = self.tree.item(row_id, "tags")
-            is_selected = row_id in selected
-
-            # Use highlight color if selected, otherwise zebra striping
-            color = "#d3d3d3" if is_selected else ("#f2f2f2" if "even" in tags else "#ffffff")
-            self._set_action_frame_color(row_id, color)
+        selected = set(self.tree.selection())  # Get selected row IDs
+        changed  = selected ^ self._selected_rows
+        self._selected_rows = selected
+
+        for row_id in changed:
+            # Remember the selection by expense ID so it survives scrolling
+            eid = self.ledger.expenses.id_of_row(row_id)
+            if eid is not None:
+                if row_id in selected:
+                    self.selected_ids.add(eid)
+                else:
+                    self.selected_ids.discard(eid)
+
+            # Use highlight color if selected, otherwise hover/zebra color
+            self._set_action_frame_color(row_id, self._row_color(row_id))
 
     def on_closing(self):
         """
-        Saves current data and closes the application.
+        Compacts the journal if needed and closes the application.
+        Every change is already journaled, so nothing is lost if this is skipped.
         """
-        save_data(self.initial_changes, self.expenses)  # Persist data
-        self.root.destroy()  # Close the window
+        self.autosaver.stop()  # Let an in-flight background save finish first
+        self.ledger.close()    # Compacts the journal into the data file if needed
+        self.root.destroy()    # Close the window
 
     def _on_action_hover_enter(self, row_id):
         """
@@ -968,36 +1568,4 @@ class ExpenseTrackerApp:
         Args:
             row_id (str or None): The row to apply hover styling to, or None to clear hover.
         """
-        # Only proceed if the target row is different from the currently hovered one
-        if row_id != self._hovered_row:
-            # Restore styling of previously hovered row
-            if self._hovered_row:
-                idx = self.tree.index(self._hovered_row)
-                orig = "even" if idx % 2 == 0 else "odd"
-                self.tree.item(self._hovered_row, tags=(orig,))
-
-                # Restore background of associated action frame
-                if self._hovered_row in self.action_frames:
-                    frame = self.action_frames[self._hovered_row]
-                    color = "#f2f2f2" if orig == "even" else "#ffffff"
-                    self._set_widget_bg(frame, color)
-                    for child in frame.winfo_children():
-                        self._set_widget_bg(child, color)
-                        for grandchild in child.winfo_children():
-                            self._set_widget_bg(grandchild, color)
-
-            # Apply hover styling to the new row
-            if row_id:
-                self.tree.item(row_id, tags=("hover",))
-
-                # Highlight associated action frame
-                if row_id in self.action_frames:
-                    frame = self.action_frames[row_id]
-                    self._set_widget_bg(frame, ROW_HOVER_COLOR)
-                    for child in frame.winfo_children():
-                        self._set_widget_bg(child, ROW_HOVER_COLOR)
-                        for grandchild in child.winfo_children():
-                            self._set_widget_bg(grandchild, ROW_HOVER_COLOR)
-
-            # Update hover tracking
-            self._hovered_row = row_id
+        self._set_hover(row_id)
@@ -0,0 +1,105 @@
+import logging
+import queue
+import threading
+
+log = logging.getLogger(__name__)
+
+
+class Autosaver:
+    """
+    Periodically writes a snapshot of the ledger on a background thread.
+
+    The Tk main thread owns the data, so every tick runs from the Tk event
+    loop: if anything changed since the last save, ``capture()`` takes a
+    cheap, independent copy of the data there and the copy is handed to a
+    worker thread, which runs ``write(snapshot)``. The slow part (formatting
+    and writing the file) therefore never blocks the UI.
+
+    Only one snapshot is in flight at a time, and an app that has not
+    changed since the last save never writes at all.
+    """
+
+    def __init__(self, widget, capture, write, interval_ms):
+        """
+        Args:
+            widget (tk.Misc): Any widget, used to reach the Tk event loop.
+            capture (callable): Returns an immutable snapshot of the data
+                (runs on the main thread).
+            write (callable): Persists a snapshot (runs on the worker thread).
+            interval_ms (int): Time between autosave checks in milliseconds
+                (0 disables autosaving).
+        """
+        self._widget   = widget
+        self._capture  = capture
+        self._write    = write
+        self._interval = interval_ms
+
+        self._dirty   = False            # Data changed since the last capture
+        self._busy    = threading.Event()  # Set while a snapshot is being written
+        self._failed  = threading.Event()  # Set by the worker if a write failed
+        self._jobs: queue.Queue = queue.Queue(maxsize=1)
+        self._pending = None             # ID of the scheduled after() call
+        self._thread  = None
+
+        self.saves = 0                   # Number of snapshots written
+
+    def start(self):
+        """Start the worker thread and schedule the first tick."""
+        if self._interval <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._work, name="autosave", daemon=True
+        )
+        self._thread.start()
+        self._pending = self._widget.after(self._interval, self._tick)
+
+    def mark_dirty(self):
+        """Record that the data changed and needs to be saved."""
+        self._dirty = True
+
+    @property
+    def dirty(self):
+        """True if there are changes that no snapshot has captured yet."""
+        return self._dirty
+
+    def stop(self):
+        """
+        Cancel future ticks and wait for an in-flight snapshot to finish,
+        so the caller may safely write the data file itself afterwards.
+        """
+        if self._pending is not None:
+            self._widget.after_cancel(self._pending)
+            self._pending = None
+        if self._thread is not None:
+            self._jobs.put(None)  # Sentinel: exit once the queue drains
+            self._thread.join()
+            self._thread = None
+
+    def _tick(self):
+        """Capture a snapshot if needed and reschedule (main thread)."""
+        # A failed write leaves its changes unsaved; try again this tick
+        if self._failed.is_set():
+            self._failed.clear()
+            self._dirty = True
+
+        if self._dirty and not self._busy.is_set():
+            self._dirty = False
+            self._busy.set()
+            self._jobs.put(self._capture())
+
+        self._pending = self._widget.after(self._interval, self._tick)
+
+    def _work(self):
+        """Write snapshots as they arrive (worker thread)."""
+        while True:
+            snapshot = self._jobs.get()
+            if snapshot is None:
+                return
+            try:
+                self._write(snapshot)
+                self.saves += 1
+            except Exception:
+                log.exception("Autosave failed")
+                self._failed.set()
+            finally:
+                self._busy.clear()
@@ -0,0 +1,376 @@
+"""
+Performance benchmarks for the expense tracker.
+
+Run from the project folder, e.g.:
+
+    python benchmark.py loader
+    python benchmark.py loader --rows 10000 100000
+    python benchmark.py snapshot
+    python benchmark.py reports --rows 10000000
+    python benchmark.py startup
+    python benchmark.py parallel --rows 5000000
+    python benchmark.py search
+
+The startup benchmark needs a display and the tkcalendar package.
+
+Benchmarks work on synthetic ledgers written to a temporary directory and
+never touch the real data file.
+"""
+import os
+import csv
+import time
+import random
+import argparse
+import tempfile
+from datetime import date, datetime, timedelta
+
+import storage
+import reports
+import binary_snapshot
+import parallel_load
+from rollups import RollupIndex
+from search_index import SearchIndex, parse_query
+from config import CATEGORIES
+from models import InitialChange, Expense
+from expense_store import ExpenseStore
+
+# === Synthetic Data ===
+def write_synthetic_csv(path: str, rows: int, seed: int = 42) -> None:
+    """
+    Write a synthetic ledger in the app's CSV format.
+
+    Args:
+        path: Destination file path.
+        rows: Number of expense rows to generate.
+        seed: Random seed, so runs are reproducible.
+    """
+    rng = random.Random(seed)
+    categories = [c for c in CATEGORIES if c]
+    places = [f"Vendor {i}" for i in range(500)]
+    start = date(2015, 1, 1)
+
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['record_type', 'date', 'amount', 'category', 'place', 'id'])
+        writer.writerow(['initial_change', start.strftime("%d.%m.%Y"), "100000.00", '', '', ''])
+        for i in range(rows):
+            day = start + timedelta(days=rng.randrange(3650))
+            writer.writerow([
+                'expense',
+                day.strftime("%d.%m.%Y"),
+                f"{rng.uniform(0.5, 500):.2f}",
+                rng.choice(categories),
+                rng.choice(places),
+                i
+            ])
+
+def synthetic_columns(rows: int, seed: int = 42) -> reports.Columns:
+    """
+    Build synthetic report columns directly in memory (no CSV round trip),
+    as NumPy arrays when NumPy is installed.
+    """
+    categories = [c for c in CATEGORIES if c]
+    start = date(2015, 1, 1).toordinal()
+
+    if reports.np is not None:
+        rng = reports.np.random.default_rng(seed)
+        days  = rng.integers(start, start + 3650, rows)
+        cents = rng.integers(50, 50_000, rows)
+        cats  = rng.integers(0, len(categories), rows)
+    else:
+        from array import array
+        rng = random.Random(seed)
+        days  = array('i', (start + rng.randrange(3650) for _ in range(rows)))
+        cents = array('q', (rng.randrange(50, 50_000) for _ in range(rows)))
+        cats  = array('H', (rng.randrange(len(categories)) for _ in range(rows)))
+
+    return reports.Columns(days, cents, cats, categories)
+
+# === Reference Implementations ===
+def legacy_load_csv(path: str) -> tuple[list[InitialChange], float, list[Expense]]:
+    """The original DictReader + strptime loader, kept for comparison."""
+    initial_changes: list[InitialChange] = []
+    expenses: list[Expense] = []
+    last_initial = 0.0
+
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+
+        for row in reader:
+            rtype = row.get('record_type', '').strip()
+            dstr  = row.get('date', '').strip()
+            astr  = row.get('amount', '').strip()
+
+            if not (rtype and dstr and astr):
+                continue
+
+            try:
+                dt = datetime.strptime(dstr, "%d.%m.%Y").date()
+                amt = float(astr)
+            except ValueError:
+                continue
+
+            if rtype == 'initial_change':
+                initial_changes.append(InitialChange(dt, amt))
+                last_initial = amt
+
+            elif rtype == 'expense':
+                cat = row.get('category', '').strip()
+                plc = row.get('place', '').strip()
+                expenses.append(Expense(dt, amt, cat, plc))
+
+    return initial_changes, last_initial, expenses
+
+def legacy_populate(root, tree, expenses: list[Expense]) -> None:
+    """
+    The original Treeview fill: one row, one child count, one layout pass
+    and one Edit/Delete frame per expense. Kept for comparison.
+    """
+    import tkinter as tk
+    from tkinter import ttk
+
+    for exp in expenses:
+        idx = len(tree.get_children())
+        tag = "even" if idx % 2 == 0 else "odd"
+        rid = tree.insert(
+            "", "end",
+            values=(exp.date.strftime("%d.%m.%Y"), f"{exp.amount:.2f}",
+                    exp.category, exp.place, ""),
+            tags=(tag,)
+        )
+
+        tree.update_idletasks()
+        bbox = tree.bbox(rid, column="#5")
+        if not bbox:
+            continue
+
+        x, y, w, h = bbox
+        frm = tk.Frame(root, bd=0, highlightthickness=0)
+        frm.place(x=tree.winfo_rootx() - root.winfo_rootx() + x,
+                  y=tree.winfo_rooty() - root.winfo_rooty() + y,
+                  width=w, height=h)
+        inner = tk.Frame(frm)
+        inner.place(relx=0.5, rely=0.5, anchor="center")
+        ttk.Button(inner, text="Edit", width=6).pack(side="left", padx=(2, 2))
+        ttk.Button(inner, text="Delete", width=6).pack(side="left", padx=(2, 2))
+
+# === Helpers ===
+def _time(func, *args, repeat: int = 1) -> float:
+    """Return the best wall-clock time of func(*args) over `repeat` runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+# === Benchmarks ===
+def bench_loader(sizes: list[int], repeat: int) -> None:
+    """Compare the legacy loader with storage.load_csv at each ledger size."""
+    print(f"{'rows':>10} {'legacy (s)':>12} {'fast (s)':>10} {'speedup':>8}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            path = os.path.join(tmp, f"ledger_{rows}.csv")
+            write_synthetic_csv(path, rows)
+
+            legacy = _time(legacy_load_csv, path, repeat=repeat)
+            fast   = _time(storage.load_csv, path, repeat=repeat)
+            print(f"{rows:>10} {legacy:>12.3f} {fast:>10.3f} {legacy / fast:>7.1f}x")
+
+def bench_snapshot(sizes: list[int], repeat: int) -> None:
+    """Compare parsing the CSV with loading its binary snapshot."""
+    print(f"{'rows':>10} {'csv (s)':>10} {'binary (s)':>11} {'speedup':>8}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            path = os.path.join(tmp, f"ledger_{rows}.csv")
+            snap = os.path.join(tmp, f"ledger_{rows}.snap")
+            write_synthetic_csv(path, rows)
+            initial_changes, _, expenses = storage.load_csv(path)
+            binary_snapshot.write(snap, initial_changes, expenses, path)
+
+            csv_s = _time(storage.load_csv, path, repeat=repeat)
+            bin_s = _time(binary_snapshot.read, snap, path, repeat=repeat)
+            print(f"{rows:>10} {csv_s:>10.3f} {bin_s:>11.3f} {csv_s / bin_s:>7.1f}x")
+
+def _run_reports(cols: reports.Columns) -> None:
+    """Compute every report once."""
+    reports.group_by_month(cols)
+    reports.category_shares(cols)
+    reports.rolling_average(cols, 30)
+    reports.percentiles(cols, (50, 90, 99))
+
+def bench_reports(sizes: list[int], repeat: int) -> None:
+    """Time the full set of reports on synthetic columns."""
+    engine = "NumPy" if reports.np is not None else "pure Python"
+    print(f"Reporting engine: {engine}")
+    print(f"{'rows':>10} {'reports (s)':>12}")
+
+    for rows in sizes:
+        cols = synthetic_columns(rows)
+        print(f"{rows:>10} {_time(_run_reports, cols, repeat=repeat):>12.3f}")
+
+def bench_startup(sizes: list[int], legacy_max: int) -> None:
+    """
+    Time from reading the data file to a fully drawn table: the legacy
+    per-row fill versus the app's virtualized, batched render.
+    """
+    import tkinter as tk
+    from tkinter import ttk
+
+    try:
+        tk.Tk().destroy()
+        import app as app_module
+    except (tk.TclError, ImportError) as e:
+        print(f"Skipped: startup benchmark needs a display and tkcalendar ({e})")
+        return
+
+    print(f"{'rows':>10} {'legacy (s)':>12} {'app (s)':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            path = os.path.join(tmp, f"ledger_{rows}.csv")
+            write_synthetic_csv(path, rows)
+
+            # Legacy: the per-row fill is quadratic, so cap its size
+            legacy = None
+            if rows <= legacy_max:
+                root = tk.Tk()
+                tree = ttk.Treeview(root, columns=("Date", "Amount", "Category",
+                                                   "Place", "Actions"),
+                                    show="headings", height=18)
+                tree.pack(fill="both", expand=True)
+                t0 = time.perf_counter()
+                legacy_populate(root, tree, legacy_load_csv(path)[2])
+                root.update()
+                legacy = time.perf_counter() - t0
+                root.destroy()
+
+            # Current app, reading the synthetic ledger instead of the real one
+            def load_synthetic(_path=None):
+                initial_changes, last_initial, expenses = real_load_csv(path)
+                expenses.attach("rollups", RollupIndex.from_rows(expenses.rows()))
+                return initial_changes, last_initial, expenses
+
+            real_load_csv = storage.load_csv
+            storage.load_csv = load_synthetic
+            try:
+                root = tk.Tk()
+                root.state = lambda *args: None  # "zoomed" is not available everywhere
+                t0 = time.perf_counter()
+                app_module.ExpenseTrackerApp(root)
+                root.update()
+                current = time.perf_counter() - t0
+                root.destroy()
+            finally:
+                storage.load_csv = real_load_csv
+
+            legacy_s = f"{legacy:>12.3f}" if legacy is not None else f"{'-':>12}"
+            print(f"{rows:>10} {legacy_s} {current:>10.3f}")
+
+def bench_parallel(sizes: list[int], workers: list[int], repeat: int) -> None:
+    """
+    Scaling of the parallel CSV loader across worker counts, against the
+    serial loader (the first column).
+    """
+    print(f"CPU cores: {os.cpu_count()}")
+    print(f"{'rows':>10} {'serial (s)':>11}"
+          + "".join(f" {f'{n} proc (s)':>12}" for n in workers))
+
+    def serial(path):
+        storage.read_csv(path, [], ExpenseStore())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            path = os.path.join(tmp, f"ledger_{rows}.csv")
+            write_synthetic_csv(path, rows)
+
+            base = _time(serial, path, repeat=repeat)
+            line = f"{rows:>10} {base:>11.3f}"
+            for n in workers:
+                t = _time(parallel_load.read, path, n, repeat=repeat)
+                line += f" {t:>7.3f} {base / t:>3.1f}x"
+            print(line)
+
+SEARCH_QUERIES = [
+    "vendor 42",
+    "cat:food",
+    "vendor 4 cat:food",
+    "date:2020-03 >400",
+    "vendor 42 cat:food date:2019 >=100",
+]
+
+def bench_search(sizes: list[int], repeat: int) -> None:
+    """Indexed search against a full scan of the ledger, per query."""
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            path = os.path.join(tmp, f"ledger_{rows}.csv")
+            write_synthetic_csv(path, rows)
+            _, _, expenses = storage.load_csv(path)
+            index = SearchIndex(expenses)
+            expenses.attach("search", index)
+
+            build = _time(index.search, parse_query("cat:food"))
+            print(f"{rows} rows, index built on first search in {build:.3f} s")
+            print(f"{'query':>32} {'matches':>9} {'scan (ms)':>10} {'index (ms)':>11}")
+
+            for text in SEARCH_QUERIES:
+                query = parse_query(text)
+                scan  = lambda: [row for row in expenses.rows() if query.matches(row)]
+                found = index.search(query)
+                scan_s  = _time(scan, repeat=repeat)
+                index_s = _time(index.search, query, repeat=repeat)
+                print(f"{text:>32} {len(found):>9} {scan_s * 1000:>10.1f} {index_s * 1000:>11.2f}")
+            print()
+
+# === Command Line ===
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+
+    p = sub.add_parser("loader", help="CSV loader: legacy vs fast path")
+    p.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    p.add_argument("--repeat", type=int, default=3)
+
+    p = sub.add_parser("snapshot", help="CSV loader vs binary snapshot")
+    p.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    p.add_argument("--repeat", type=int, default=3)
+
+    p = sub.add_parser("reports", help="Group-bys, rolling average, percentiles")
+    p.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000])
+    p.add_argument("--repeat", type=int, default=3)
+
+    p = sub.add_parser("startup", help="Table population: legacy vs virtualized")
+    p.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    p.add_argument("--legacy-max", type=int, default=10_000,
+                   help="Largest ledger to run the (quadratic) legacy fill on")
+
+    cores = os.cpu_count() or 1
+    p = sub.add_parser("parallel", help="Parallel CSV loader: scaling across cores")
+    p.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 5_000_000])
+    p.add_argument("--workers", type=int, nargs="+",
+                   default=sorted({1, 2, 4, 8, cores} & set(range(1, cores + 1))))
+    p.add_argument("--repeat", type=int, default=1)
+
+    p = sub.add_parser("search", help="Indexed search vs full scan")
+    p.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    p.add_argument("--repeat", type=int, default=3)
+
+    args = parser.parse_args()
+    if args.benchmark == "loader":
+        bench_loader(args.rows, args.repeat)
+    elif args.benchmark == "snapshot":
+        bench_snapshot(args.rows, args.repeat)
+    elif args.benchmark == "reports":
+        bench_reports(args.rows, args.repeat)
+    elif args.benchmark == "startup":
+        bench_startup(args.rows, args.legacy_max)
+    elif args.benchmark == "parallel":
+        bench_parallel(args.rows, args.workers, args.repeat)
+    elif args.benchmark == "search":
+        bench_search(args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
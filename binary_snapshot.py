@@ -0,0 +1,184 @@
+import os
+import sys
+import mmap
+import struct
+import zlib
+from array import array
+from datetime import date
+from models import InitialChange, to_cents
+from expense_store import ExpenseStore
+
+# === File Layout ===
+# Header (fixed size, little-endian):
+#   magic, version, byte order, row count, initial change count,
+#   category count, place count, next expense ID,
+#   size and mtime of the CSV file the snapshot was made from,
+#   CRC32 of everything after the header
+#
+# Payload (native byte order, recorded in the header):
+#   initial changes:  day ordinals ('i'), cents ('q')
+#   expense columns:  IDs ('q'), day ordinals ('i'), cents ('q'),
+#                     category codes ('H'), place codes ('I')
+#   string table:     byte length of every name ('I'), then the UTF-8
+#                     bytes of all category names followed by all place names
+#
+# Every column is a fixed-width block, so loading is one memcpy per column
+# straight into the store's arrays; no row is parsed.
+
+MAGIC   = b"EXPSNAP\0"
+VERSION = 1
+HEADER  = struct.Struct("<8sHBxQIIIqQqI")
+
+_LITTLE = 1 if sys.byteorder == "little" else 0
+
+def _source_stamp(source_path: str) -> tuple[int, int]:
+    """Return (size, mtime in ns) of the CSV file a snapshot belongs to."""
+    st = os.stat(source_path)
+    return st.st_size, st.st_mtime_ns
+
+# === Write ===
+def write(
+    path: str,
+    initial_changes: list[InitialChange],
+    expenses: ExpenseStore,
+    source_path: str
+) -> None:
+    """
+    Atomically write a binary snapshot of the ledger.
+
+    The snapshot records the size and modification time of `source_path`,
+    so it is only trusted while that file is unchanged. Write it right
+    after the CSV file it mirrors.
+
+    Args:
+        path: Destination file path.
+        initial_changes: List of InitialChange objects.
+        expenses: Store to write (compacted in the process).
+        source_path: The CSV data file holding the same data.
+    """
+    cols = expenses.columns()
+    try:
+        names = expenses.category_names + expenses.place_names
+        encoded = [name.encode('utf-8') for name in names]
+
+        blocks = [
+            array('i', (ch.date.toordinal() for ch in initial_changes)),
+            array('q', (to_cents(ch.amount) for ch in initial_changes)),
+            cols["ids"], cols["days"], cols["cents"],
+            cols["categories"], cols["places"],
+            array('I', (len(b) for b in encoded)),
+            b"".join(encoded),
+        ]
+
+        crc = 0
+        for block in blocks:
+            crc = zlib.crc32(block, crc)
+
+        size, mtime = _source_stamp(source_path)
+        header = HEADER.pack(
+            MAGIC, VERSION, _LITTLE,
+            len(expenses), len(initial_changes),
+            len(expenses.category_names), len(expenses.place_names),
+            expenses.next_id, size, mtime, crc
+        )
+
+        tmp_file = path + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(header)
+            for block in blocks:
+                f.write(block)
+            f.flush()
+            os.fsync(f.fileno())
+    finally:
+        for view in cols.values():
+            view.release()
+
+    os.replace(tmp_file, path)
+
+# === Read ===
+def read(
+    path: str,
+    source_path: str
+) -> tuple[list[InitialChange], ExpenseStore] | None:
+    """
+    Load a binary snapshot by memory-mapping it.
+
+    Args:
+        path: Snapshot file path.
+        source_path: The CSV data file the snapshot must match.
+
+    Returns:
+        (initial changes, expenses), or None if the snapshot is missing,
+        stale (the CSV file changed since it was written), from another
+        format version, or corrupt. Callers then fall back to the CSV.
+    """
+    try:
+        stamp = _source_stamp(source_path)
+        f = open(path, 'rb')
+    except OSError:
+        return None
+
+    with f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return None  # Empty file
+        with mm:
+            view = memoryview(mm)
+            try:
+                return _decode(view, stamp)
+            except (struct.error, ValueError, IndexError):
+                return None
+            finally:
+                view.release()
+
+def _decode(
+    buf: memoryview,
+    stamp: tuple[int, int]
+) -> tuple[list[InitialChange], ExpenseStore] | None:
+    """Validate the header and copy the column blocks out of the mapping."""
+    (magic, version, little, rows, changes, n_cats, n_places,
+     next_id, size, mtime, crc) = HEADER.unpack_from(buf)
+
+    if magic != MAGIC or version != VERSION or (size, mtime) != stamp:
+        return None
+    if zlib.crc32(buf[HEADER.size:]) != crc:
+        return None
+
+    offset = HEADER.size
+
+    def column(typecode: str, count: int) -> array:
+        nonlocal offset
+        col = array(typecode)
+        end = offset + col.itemsize * count
+        if end > len(buf):
+            raise ValueError("truncated snapshot")
+        col.frombytes(buf[offset:end])
+        offset = end
+        if little != _LITTLE:
+            col.byteswap()
+        return col
+
+    change_days  = column('i', changes)
+    change_cents = column('q', changes)
+    ids     = column('q', rows)
+    days    = column('i', rows)
+    cents   = column('q', rows)
+    cats    = column('H', rows)
+    places  = column('I', rows)
+    lengths = column('I', n_cats + n_places)
+
+    names, pos = [], offset
+    for length in lengths:
+        names.append(bytes(buf[pos:pos + length]).decode('utf-8'))
+        pos += length
+
+    initial_changes = [
+        InitialChange(date.fromordinal(day), c / 100)
+        for day, c in zip(change_days, change_cents)
+    ]
+    expenses = ExpenseStore.from_columns(
+        ids, days, cents, cats, places,
+        names[:n_cats], names[n_cats:], next_id
+    )
+    return initial_changes, expenses
@@ -7,6 +7,95 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 # Define the path to the CSV file storing expense data
 DATA_FILE = os.path.join(BASE_DIR, "expenses.csv")
 
+# Append-only journal of changes made since the last full snapshot
+JOURNAL_FILE = os.path.join(BASE_DIR, "expenses.journal")
+
+# Binary copy of the CSV data, memory-mapped at startup while it is current
+SNAPSHOT_FILE = os.path.join(BASE_DIR, "expenses.snap")
+
+# Per-month category/place totals, kept next to the data file
+ROLLUP_FILE = os.path.join(BASE_DIR, "expenses.rollup")
+
+# Journal moved aside while a background snapshot is being written
+ROTATED_JOURNAL_FILE = JOURNAL_FILE + ".old"
+
+# SQLite database used when STORAGE_BACKEND is "sqlite"
+SQLITE_FILE = os.path.join(BASE_DIR, "expenses.db")
+
+# Folder of per-month CSV partitions used when STORAGE_BACKEND is "partitioned"
+PARTITION_DIR = os.path.join(BASE_DIR, "expenses")
+
+# Per-partition totals and ledger metadata, read at startup instead of the data
+MANIFEST_FILE = os.path.join(PARTITION_DIR, "manifest.json")
+
+# === Storage Backend ===
+# "csv":    CSV snapshot plus append-only journal (human-readable, default)
+# "sqlite": indexed SQLite database, migrated once from the CSV on first use
+# "partitioned": one CSV per month; only recent months are loaded at startup
+STORAGE_BACKEND = "csv"
+
+# === Binary Snapshot ===
+# Also write SNAPSHOT_FILE whenever the CSV data file is written, and load
+# it instead of parsing the CSV when it is up to date
+BINARY_SNAPSHOT = True
+
+# === Parallel Loading ===
+# Parse large CSV data files with a pool of worker processes when no
+# binary snapshot can be used (e.g. after editing the CSV by hand)
+PARALLEL_LOAD = False
+PARALLEL_LOAD_WORKERS   = 0            # Worker processes (0 = one per CPU core)
+PARALLEL_LOAD_MIN_BYTES = 32_000_000   # Smaller files load faster serially
+
+# === Journal Settings ===
+# Rewrite the snapshot on close once the journal grows beyond this size (bytes)
+JOURNAL_COMPACT_BYTES = 1_000_000
+
+# === Autosave Settings ===
+# Write a fresh snapshot in the background every N milliseconds while there
+# are unsaved changes (0 = only on close)
+AUTOSAVE_INTERVAL_MS = 60_000
+
+# === Place Autocomplete ===
+# Number of places suggested in the place dropdowns (most used first)
+PLACE_SUGGESTIONS = 10
+
+# === Undo History ===
+# Approximate memory (bytes) kept for undoing changes with Ctrl+Z / Ctrl+Y;
+# the oldest changes are forgotten first (0 = no undo)
+UNDO_MEMORY_BUDGET = 4_000_000
+
+# === Search ===
+# Wait this long after the last keystroke before filtering the table (ms)
+SEARCH_DELAY_MS = 250
+
+# === Duplicate Detection ===
+# Expenses with the same category and place count as likely duplicates when
+# their dates differ by at most DUPLICATE_DAYS and their amounts by at most
+# DUPLICATE_CENTS (0 and 0 = exact repeats only)
+DUPLICATE_DAYS  = 0
+DUPLICATE_CENTS = 0
+
+# === Import Settings ===
+# Category given to imported expenses that no rule below matches
+IMPORT_DEFAULT_CATEGORY = "Other"
+
+# Keyword -> category for imported expenses without a known category.
+# Keywords are matched case-insensitively anywhere in the place/description.
+IMPORT_CATEGORY_RULES = {
+    "supermarket": "Food", "restaurant": "Food", "bakery": "Food",
+    "cafe": "Food", "lidl": "Food", "aldi": "Food",
+    "fuel": "Transport", "parking": "Transport", "railway": "Transport",
+    "taxi": "Transport", "uber": "Transport",
+    "electric": "Utilities", "energy": "Utilities", "water": "Utilities",
+    "internet": "Utilities", "telecom": "Utilities",
+    "cinema": "Entertainment", "netflix": "Entertainment",
+    "spotify": "Entertainment", "theater": "Entertainment",
+}
+
+# === Debug Settings ===
+# Verify the running balance against a full recompute every N refreshes (0 = off)
+BALANCE_CHECK_INTERVAL = 0
+
 # === UI Color Palette ===
 # Background and foreground colors
 BG_COLOR     = "#ecf0f1"  # Light gray background
@@ -27,6 +116,7 @@ SEL_FG       = "#ffffff"     # Selected row text color
 
 # Row hover effect
 ROW_HOVER_COLOR = "#d3d3d3"  # Light gray hover for table rows
+DUPLICATE_BG    = "#fdebd0"  # Light orange for rows flagged as likely duplicates
 
 # === Expense Categories ===
 # Predefined categories for expense tracking
@@ -0,0 +1,238 @@
+from array import array
+from bisect import bisect_right
+from datetime import date
+from models import InitialChange, to_cents
+
+
+class _Fenwick:
+    """Binary indexed tree over integer counters: O(log n) update and prefix sum."""
+
+    __slots__ = ("_tree",)
+
+    def __init__(self, values: array):
+        """Build the tree from per-position values in O(n)."""
+        tree = array('q', [0]) + values
+        size = len(tree)
+        for i in range(1, size):
+            parent = i + (i & -i)
+            if parent < size:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def add(self, pos: int, delta: int) -> None:
+        """Add `delta` at 0-based position `pos`."""
+        tree = self._tree
+        i = pos + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def prefix(self, end: int) -> int:
+        """Return the sum of positions [0, end)."""
+        tree = self._tree
+        i = min(end, len(tree) - 1)
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+
+class DateIndex:
+    """
+    Per-day expense totals with O(log n) range sums, plus the initial
+    amount history, for "spent between X and Y" and "balance on D".
+
+    Attached to the ExpenseStore as a secondary index, so adds, deletes and
+    edits that move an expense to another day are applied as they happen.
+    The trees are built on the first query (one pass over the store), so
+    attaching the index costs nothing at startup; changes made before that
+    are simply part of the build.
+
+    Days are positions in two Fenwick trees (cents and counts) covering a
+    window of day ordinals that grows when a date falls outside it.
+    """
+
+    MARGIN = 366  # Extra days kept on both sides when the window grows
+
+    def __init__(self, store):
+        """
+        Args:
+            store (ExpenseStore): The store this index is attached to.
+        """
+        self._store = store
+        self._built = False
+
+        self._base = 0                   # Day ordinal of position 0
+        self._day_cents  = array('q')    # Cents per day (source for rebuilds)
+        self._day_counts = array('q')    # Expenses per day
+        self._cents  = None              # Fenwick tree over _day_cents
+        self._counts = None              # Fenwick tree over _day_counts
+
+        # Per-day totals of data that is not in the store (unloaded
+        # partitions): day ordinal -> [cents, count]
+        self._seed: dict[int, list[int]] = {}
+
+        # Initial amount history, sorted by date (stable for equal dates)
+        self._init_days:  list[int] = []
+        self._init_cents: list[int] = []
+
+    # === Building ===
+    def _build(self) -> None:
+        """Build the trees from the store and the seeded days."""
+        cols = self._store.columns()
+        try:
+            days, cents = cols["days"], cols["cents"]
+            known = list(self._seed)
+            if len(days):
+                known += (min(days), max(days))
+            if known:
+                self._base = min(known) - self.MARGIN
+                span = max(known) - self._base + 1 + self.MARGIN
+            else:
+                self._base = date.today().toordinal() - self.MARGIN
+                span = 2 * self.MARGIN + 1
+
+            day_cents  = array('q', bytes(8 * span))
+            day_counts = array('q', bytes(8 * span))
+            base = self._base
+            for day, c in zip(days, cents):
+                day_cents[day - base] += c
+                day_counts[day - base] += 1
+        finally:
+            for view in cols.values():
+                view.release()
+
+        for day, (c, n) in self._seed.items():
+            day_cents[day - base] += c
+            day_counts[day - base] += n
+
+        self._day_cents, self._day_counts = day_cents, day_counts
+        self._cents  = _Fenwick(day_cents)
+        self._counts = _Fenwick(day_counts)
+        self._built  = True
+
+    def _ensure_built(self) -> None:
+        if not self._built:
+            self._build()
+
+    def _grow(self, day: int) -> None:
+        """Widen the window so it covers `day`, rebuilding the trees (O(span))."""
+        end   = self._base + len(self._day_cents)
+        base  = min(self._base, day - self.MARGIN)
+        end   = max(end, day + self.MARGIN + 1)
+        front = self._base - base
+        back  = end - self._base - len(self._day_cents)
+
+        pad = lambda n: array('q', bytes(8 * n))
+        self._day_cents  = pad(front) + self._day_cents + pad(back)
+        self._day_counts = pad(front) + self._day_counts + pad(back)
+        self._base   = base
+        self._cents  = _Fenwick(self._day_cents)
+        self._counts = _Fenwick(self._day_counts)
+
+    def _apply(self, day: int, cents: int, count: int) -> None:
+        """Add to one day's totals (only once the trees exist)."""
+        if not self._built:
+            return
+        pos = day - self._base
+        if pos < 0 or pos >= len(self._day_cents):
+            self._grow(day)
+            pos = day - self._base
+        self._day_cents[pos]  += cents
+        self._day_counts[pos] += count
+        self._cents.add(pos, cents)
+        self._counts.add(pos, count)
+
+    # === Store Events ===
+    def on_add(self, eid: int, day: int, cents: int, category: str, place: str) -> None:
+        """Count a new expense, or the new values of an edited one."""
+        self._apply(day, cents, 1)
+
+    def on_remove(self, eid: int, day: int, cents: int, category: str, place: str) -> None:
+        """Uncount a deleted expense, or the old values of an edited one."""
+        self._apply(day, -cents, -1)
+
+    # === Per-Month Summaries (partitioned storage) ===
+    @staticmethod
+    def summarize(rows, month: str) -> dict:
+        """
+        Return per-day totals of one month's rows in a JSON-friendly form.
+
+        Returns:
+            {"days": {"YYYY-MM-DD": [cents, count]}}
+        """
+        days: dict[int, list[int]] = {}
+        for _, day, cents, _, _ in rows:
+            bucket = days.setdefault(day, [0, 0])
+            bucket[0] += cents
+            bucket[1] += 1
+        return {"days": {date.fromordinal(d).isoformat(): b for d, b in days.items()}}
+
+    def add_month_summary(self, month: str, summary: dict, sign: int = 1) -> None:
+        """
+        Add (or with sign=-1, subtract) per-day totals of data that is not
+        in the store, e.g. a partition that is not loaded.
+        """
+        for iso, (cents, count) in summary.get("days", {}).items():
+            day = date.fromisoformat(iso).toordinal()
+            bucket = self._seed.setdefault(day, [0, 0])
+            bucket[0] += sign * cents
+            bucket[1] += sign * count
+            if not bucket[1]:
+                del self._seed[day]
+            self._apply(day, sign * cents, sign * count)
+
+    # === Initial Amount History ===
+    def set_initial_changes(self, changes: list[InitialChange]) -> None:
+        """Replace the initial amount history (O(k log k))."""
+        ordered = sorted(
+            enumerate(changes), key=lambda item: (item[1].date, item[0])
+        )
+        self._init_days  = [ch.date.toordinal() for _, ch in ordered]
+        self._init_cents = [to_cents(ch.amount) for _, ch in ordered]
+
+    def add_initial_change(self, change: InitialChange) -> None:
+        """Record a new initial amount; it wins over earlier ones on the same day."""
+        day = change.date.toordinal()
+        pos = bisect_right(self._init_days, day)
+        self._init_days.insert(pos, day)
+        self._init_cents.insert(pos, to_cents(change.amount))
+
+    # === Queries ===
+    def _prefix(self, tree: _Fenwick, day: int) -> int:
+        """Sum of a tree for all days up to and including `day`."""
+        return tree.prefix(day - self._base + 1) if day >= self._base else 0
+
+    def total_between(self, start: date, end: date) -> int:
+        """Total cents spent from `start` to `end`, both inclusive (O(log n))."""
+        if start > end:
+            return 0  # Empty range; the prefix difference would be negative
+        self._ensure_built()
+        return (self._prefix(self._cents, end.toordinal())
+                - self._prefix(self._cents, start.toordinal() - 1))
+
+    def count_between(self, start: date, end: date) -> int:
+        """Number of expenses from `start` to `end`, both inclusive (O(log n))."""
+        if start > end:
+            return 0
+        self._ensure_built()
+        return (self._prefix(self._counts, end.toordinal())
+                - self._prefix(self._counts, start.toordinal() - 1))
+
+    def total_until(self, day: date) -> int:
+        """Total cents spent up to and including `day` (O(log n))."""
+        self._ensure_built()
+        return self._prefix(self._cents, day.toordinal())
+
+    def initial_on(self, day: date) -> int:
+        """Initial amount in effect on `day`, in cents (0 before the first one)."""
+        pos = bisect_right(self._init_days, day.toordinal())
+        return self._init_cents[pos - 1] if pos else 0
+
+    def balance_on(self, day: date) -> int:
+        """
+        Balance at the end of `day` in cents: the initial amount in effect
+        then, minus everything spent up to that day (O(log n)).
+        """
+        return self.initial_on(day) - self.total_until(day)
@@ -0,0 +1,241 @@
+import re
+from collections.abc import Iterable
+
+_place_keys: dict[str, str] = {}  # Memoized place -> normalized place
+
+
+def normalize_place(place: str) -> str:
+    """Case-fold a place and reduce punctuation and spacing ("LIDL  Berlin." -> "lidl berlin")."""
+    key = _place_keys.get(place)
+    if key is None:
+        key = re.sub(r"[\W_]+", " ", place.casefold()).strip()
+        if len(_place_keys) < 100_000:
+            _place_keys[place] = key
+    return key
+
+
+class DuplicateIndex:
+    """
+    Hash index for finding likely duplicate expenses in O(1).
+
+    Two expenses are likely duplicates when they have the same category and
+    normalized place, their dates differ by at most `days` and their
+    amounts by at most `cents`. With both windows at 0 (the default) only
+    exact repeats match.
+
+    Expenses are hashed into cells keyed by (day, amount bucket, place),
+    where a bucket spans `cents + 1` cents, so all candidates of an
+    expense lie in (2 * days + 1) * 3 cells whatever the ledger size.
+
+    Attached to the ExpenseStore as a secondary index. Like the date
+    index, it is built from the store on the first query, so attaching it
+    costs nothing at startup; from then on adds, edits and deletes are
+    applied as they happen. Every expense that duplicated an earlier one
+    when it was indexed is recorded in ``flagged``.
+    """
+
+    def __init__(self, store=None, days: int = 0, cents: int = 0):
+        """
+        Args:
+            store (ExpenseStore | None): Store to build from on first use,
+                or None for an index filled only through ``on_add``.
+            days: Date window in days (±).
+            cents: Amount window in cents (±).
+        """
+        self.days  = days
+        self.cents = cents
+        self._store = store
+        self._built = store is None
+        self._width = cents + 1  # Amount bucket width
+        self._cells: dict[tuple[int, int, str], list[tuple[int, int, str]]] = {}  # -> [(eid, cents, category)]
+        self._flagged: set[int] = set()  # Expenses that duplicated an earlier one
+
+    @classmethod
+    def from_rows(
+        cls, rows: Iterable[tuple[int, int, int, str, str]], days: int = 0, cents: int = 0
+    ) -> "DuplicateIndex":
+        """
+        Build the index in one pass.
+
+        Args:
+            rows: Expenses as (ID, day ordinal, cents, category, place),
+                e.g. from ``ExpenseStore.rows()``.
+            days, cents: Matching windows (see the class docstring).
+        """
+        index = cls(None, days, cents)
+        for eid, day, c, category, place in rows:
+            index.on_add(eid, day, c, category, place)
+        return index
+
+    def _ensure_built(self) -> None:
+        """Index every expense of the store (once, on the first query)."""
+        if self._built:
+            return
+        self._built = True
+        if self.days or self.cents:
+            for eid, day, c, category, place in self._store.rows():
+                self.on_add(eid, day, c, category, place)
+            return
+
+        # Exact matching: every candidate is in the expense's own cell, so
+        # the build is one dict lookup per expense, straight from the
+        # columns (places are normalized once per distinct name)
+        store = self._store
+        cols = store.columns()
+        try:
+            categories = store.category_names
+            places = [normalize_place(p) for p in store.place_names]
+            cells, flagged = self._cells, self._flagged
+            for eid, day, c, cat, plc in zip(
+                cols["ids"], cols["days"], cols["cents"],
+                cols["categories"], cols["places"]
+            ):
+                key = (day, c, places[plc])
+                cell = cells.get(key)
+                if cell is None:
+                    cells[key] = [(eid, c, categories[cat])]
+                    continue
+                category = categories[cat]
+                if any(item[2] == category for item in cell):
+                    flagged.add(eid)
+                cell.append((eid, c, category))
+        finally:
+            for view in cols.values():
+                view.release()
+
+    # === Store Events ===
+    def on_add(self, eid: int, day: int, cents: int, category: str, place: str) -> None:
+        """Index an expense, flagging it if it duplicates an indexed one."""
+        if not self._built:
+            return
+        place = normalize_place(place)
+        if self._matches(day, cents, category, place, self.days, self.cents):
+            self._flagged.add(eid)
+        key = (day, cents // self._width, place)
+        cell = self._cells.get(key)
+        if cell is None:
+            cell = self._cells[key] = []
+        cell.append((eid, cents, category))
+
+    def on_remove(self, eid: int, day: int, cents: int, category: str, place: str) -> None:
+        """Unindex a deleted expense, or the old values of an edited one."""
+        if not self._built:
+            return
+        key = (day, cents // self._width, normalize_place(place))
+        cell = self._cells.get(key)
+        if cell is None:
+            return
+        for i, item in enumerate(cell):
+            if item[0] == eid:
+                del cell[i]
+                break
+        if not cell:
+            del self._cells[key]
+        self._flagged.discard(eid)
+
+    # === Queries ===
+    def _matches(
+        self, day: int, cents: int, category: str | None, place: str,
+        days: int, window: int
+    ) -> list[int]:
+        """IDs in the neighbouring cells within the windows (place already normalized)."""
+        width, cells = self._width, self._cells
+        bucket = cents // width
+        found = []
+        for d in range(day - days, day + days + 1):
+            for b in (bucket - 1, bucket, bucket + 1) if window else (bucket,):
+                for eid, c, cat in cells.get((d, b, place), ()):
+                    if abs(c - cents) <= window and (category is None or cat == category):
+                        found.append(eid)
+        return found
+
+    def matches(
+        self, day: int, cents: int, category: str | None, place: str,
+        days: int | None = None, window: int | None = None
+    ) -> list[int]:
+        """
+        Return the IDs of likely duplicates of an expense (O(1)).
+
+        Args:
+            day: Day ordinal.
+            cents: Amount in cents.
+            category: Category, or None to match any category.
+            place: Place (normalized here).
+            days, window: Narrower date and amount windows for this query
+                (default: the index's own; wider ones are capped to them).
+        """
+        self._ensure_built()
+        days   = self.days if days is None else min(days, self.days)
+        window = self.cents if window is None else min(window, self.cents)
+        return self._matches(day, cents, category, normalize_place(place), days, window)
+
+    def groups(self) -> list[list[int]]:
+        """
+        Find all groups of likely duplicates in one pass over the index.
+
+        Matching expenses are joined transitively (A~B and B~C put A, B
+        and C in one group). Every cell is visited once and compared with
+        its neighbouring cells only, so the report is O(n) for a fixed
+        window instead of comparing all pairs.
+
+        Returns:
+            Groups of two or more expense IDs, each sorted by ID.
+        """
+        self._ensure_built()
+        parent: dict[int, int] = {}
+
+        def find(eid: int) -> int:
+            root = eid
+            while parent.get(root, root) != root:
+                root = parent[root]
+            while eid != root:  # Path compression
+                parent[eid], eid = root, parent.get(eid, eid)
+            return root
+
+        def union(a: int, b: int) -> None:
+            ra, rb = find(a), find(b)
+            if ra != rb:
+                parent[max(ra, rb)] = min(ra, rb)
+
+        cells, window, days = self._cells, self.cents, self.days
+        for (day, bucket, place), cell in cells.items():
+            # Everything in one cell is within the amount window, so a cell
+            # only needs linking per category: O(cell size)
+            first: dict[str, int] = {}
+            for eid, c, cat in cell:
+                if cat in first:
+                    union(first[cat], eid)
+                else:
+                    first[cat] = eid
+
+            if not (days or window):
+                continue
+
+            # Later neighbouring cells (each pair of cells is visited once)
+            for d in range(day, day + days + 1):
+                for b in (bucket - 1, bucket, bucket + 1) if window else (bucket,):
+                    if (d, b) <= (day, bucket):
+                        continue
+                    other = cells.get((d, b, place))
+                    if not other:
+                        continue
+                    for eid, c, cat in cell:
+                        for oid, oc, ocat in other:
+                            if cat == ocat and abs(c - oc) <= window:
+                                union(eid, oid)
+
+        # Roots never get a parent entry; everything else was joined to one
+        members: dict[int, list[int]] = {}
+        for eid in parent:
+            members.setdefault(find(eid), []).append(eid)
+        return [sorted([root, *group]) for root, group in members.items()]
+
+    @property
+    def flagged(self) -> set[int]:
+        """IDs of expenses that duplicated an earlier one when indexed."""
+        self._ensure_built()
+        return self._flagged
+
+    def __len__(self) -> int:
+        self._ensure_built()
+        return sum(len(cell) for cell in self._cells.values())
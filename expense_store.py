@@ -0,0 +1,523 @@
+import logging
+from array import array
+from collections import Counter
+from collections.abc import Iterator, Mapping
+from datetime import date
+from models import Expense, to_cents
+
+log = logging.getLogger(__name__)
+
+
+class ExpenseStore(Mapping):
+    """
+    Compact columnar storage for expenses, keyed by stable expense ID.
+
+    Each expense occupies one slot across parallel typed arrays instead of
+    being a separate dataclass instance:
+
+    - day ordinals (``date.toordinal()``) and integer cents
+    - category and place as small-int codes into interned string tables
+
+    Slots keep insertion order. Deleting marks a slot dead (its cents are
+    zeroed so sums stay correct) and dead slots are compacted away once
+    they make up half of the store. An expense added back under its old
+    ID (undo, journal replay) returns to its dead slot, so it keeps its
+    position.
+
+    The total of all live amounts is maintained incrementally in integer
+    cents, so reading it is O(1) and never drifts from a full recompute.
+
+    The store also maps expense IDs to the Treeview rows currently showing
+    them, so the UI never has to keep its own per-row Expense objects.
+
+    Secondary indexes (rollups, date index, ...) can be attached by name;
+    every change to the store is forwarded to their ``on_add`` and
+    ``on_remove`` methods as (ID, day ordinal, cents, category, place), so
+    they stay current no matter who changes the data (UI, journal replay,
+    lazy loading).
+
+    Reading ``store[eid]`` builds a fresh Expense; use ``rows()`` or
+    ``columns()`` to scan the ledger without creating objects.
+    """
+
+    def __init__(self):
+        # === Column Arrays (one entry per slot) ===
+        self._ids    = array('q')   # Stable expense ID
+        self._days   = array('i')   # Date as proleptic Gregorian ordinal
+        self._cents  = array('q')   # Amount in integer cents (0 for dead slots)
+        self._cats   = array('H')   # Category code
+        self._places = array('I')   # Place code
+        self._alive  = bytearray()  # 1 if the slot holds a live expense
+
+        self._slot_of: dict[int, int] = {}  # Maps expense ID to slot index
+        self._dead_slot_of: dict[int, int] = {}  # Deleted expense ID -> its dead slot
+        self._dead = 0                      # Number of dead slots
+        self._total = 0                     # Running sum of live cents
+
+        # === Interned String Tables ===
+        self._cat_names:   list[str]      = []
+        self._cat_codes:   dict[str, int] = {}
+        self._place_names: list[str]      = []
+        self._place_codes: dict[str, int] = {}
+
+        # === Treeview Row Mapping ===
+        self._row_of: dict[int, str] = {}  # Maps expense ID to Treeview row ID
+        self._id_of:  dict[str, int] = {}  # Maps Treeview row ID to expense ID
+
+        # === Secondary Indexes ===
+        self._indexes: dict[str, object] = {}  # Name -> index receiving change events
+
+        self.next_id = 0  # Next unused stable expense ID
+
+    @classmethod
+    def from_columns(
+        cls,
+        ids: array,
+        days: array,
+        cents: array,
+        cats: array,
+        places: array,
+        category_names: list[str],
+        place_names: list[str],
+        next_id: int
+    ) -> "ExpenseStore":
+        """
+        Build a store directly from compacted column arrays (used by the
+        binary snapshot loader). The arrays are adopted, not copied.
+
+        Args:
+            ids, days, cents, cats, places: Column arrays of equal length,
+                with the same typecodes as the store's own columns.
+            category_names: Category names indexed by category code.
+            place_names: Place names indexed by place code.
+            next_id: Next unused stable expense ID (above every ID in `ids`).
+
+        Returns:
+            The new store.
+        """
+        store = cls()
+        store._ids, store._days, store._cents = ids, days, cents
+        store._cats, store._places = cats, places
+        store._alive   = bytearray(b'\x01') * len(ids)
+        store._slot_of = dict(zip(ids, range(len(ids))))
+        store._total   = sum(cents)
+
+        store._cat_names   = category_names
+        store._cat_codes   = {name: code for code, name in enumerate(category_names)}
+        store._place_names = place_names
+        store._place_codes = {name: code for code, name in enumerate(place_names)}
+
+        store.next_id = next_id
+        return store
+
+    # === String Interning ===
+    def _cat_code(self, name: str) -> int:
+        """Return the code for a category name, adding it if new."""
+        code = self._cat_codes.get(name)
+        if code is None:
+            code = len(self._cat_names)
+            self._cat_names.append(name)
+            self._cat_codes[name] = code
+        return code
+
+    def _place_code(self, name: str) -> int:
+        """Return the code for a place name, adding it if new."""
+        code = self._place_codes.get(name)
+        if code is None:
+            code = len(self._place_names)
+            self._place_names.append(name)
+            self._place_codes[name] = code
+        return code
+
+    # === Mapping Interface ===
+    def __getitem__(self, eid: int) -> Expense:
+        slot = self._slot_of[eid]
+        return Expense(
+            date.fromordinal(self._days[slot]),
+            self._cents[slot] / 100,
+            self._cat_names[self._cats[slot]],
+            self._place_names[self._places[slot]]
+        )
+
+    def __contains__(self, eid) -> bool:
+        return eid in self._slot_of
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def position(self, eid: int) -> int:
+        """
+        Return the slot of an expense. Only the order of positions is
+        meaningful: it is the order of iteration, and survives compaction.
+
+        Raises:
+            KeyError: If the ID is unknown.
+        """
+        return self._slot_of[eid]
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over expense IDs in insertion order."""
+        ids, alive = self._ids, self._alive
+        for slot in range(len(ids)):
+            if alive[slot]:
+                yield ids[slot]
+
+    # === Mutations ===
+    def add_row(
+        self, eid: int, day: int, cents: int, category: str, place: str
+    ) -> None:
+        """
+        Append an expense from raw column values (used by the loaders).
+
+        An expense deleted earlier is put back into its dead slot instead,
+        unless that slot was compacted away.
+
+        Args:
+            eid: Stable expense ID (must not already be present).
+            day: Date as an ordinal.
+            cents: Amount in integer cents.
+            category: Category name.
+            place: Place name.
+        """
+        slot = self._dead_slot_of.pop(eid, None) if self._dead_slot_of else None
+        if slot is None:
+            self._slot_of[eid] = len(self._ids)
+            self._ids.append(eid)
+            self._days.append(day)
+            self._cents.append(cents)
+            self._cats.append(self._cat_code(category))
+            self._places.append(self._place_code(place))
+            self._alive.append(1)
+        else:
+            self._slot_of[eid] = slot
+            self._days[slot]   = day
+            self._cents[slot]  = cents
+            self._cats[slot]   = self._cat_code(category)
+            self._places[slot] = self._place_code(place)
+            self._alive[slot]  = 1
+            self._dead -= 1
+        self._total += cents
+
+        if eid >= self.next_id:
+            self.next_id = eid + 1
+
+        if self._indexes:
+            for index in self._indexes.values():
+                index.on_add(eid, day, cents, category, place)
+
+    def restore_row(
+        self, eid: int, day: int, cents: int, category: str, place: str
+    ) -> None:
+        """
+        Add a deleted expense back at its old position (undo and redo).
+
+        Its dead slot is reused while it exists (O(1)). After a compaction
+        the expense is inserted before the first one with a higher ID
+        instead, since IDs follow the order expenses were added (O(n)).
+
+        Args:
+            eid: Stable expense ID (must not already be present).
+            day, cents, category, place: Column values as for ``add_row``.
+        """
+        ids = self._ids
+        if eid in self._dead_slot_of or not ids or eid > ids[-1]:
+            self.add_row(eid, day, cents, category, place)
+            return
+
+        pos = next(slot for slot, other in enumerate(ids) if other > eid)
+        ids.insert(pos, eid)
+        self._days.insert(pos, day)
+        self._cents.insert(pos, cents)
+        self._cats.insert(pos, self._cat_code(category))
+        self._places.insert(pos, self._place_code(place))
+        self._alive.insert(pos, 1)
+        self._total += cents
+
+        # Every later slot moved up by one
+        for slot in range(pos, len(ids)):
+            if self._alive[slot]:
+                self._slot_of[ids[slot]] = slot
+        for other, slot in self._dead_slot_of.items():
+            if slot >= pos:
+                self._dead_slot_of[other] = slot + 1
+
+        if self._indexes:
+            for index in self._indexes.values():
+                index.on_add(eid, day, cents, category, place)
+
+    def add(self, exp: Expense, eid: int | None = None) -> int:
+        """
+        Append an expense.
+
+        Args:
+            exp: The expense to store.
+            eid: Stable ID to use, or None to allocate the next one.
+
+        Returns:
+            The expense ID.
+        """
+        if eid is None:
+            eid = self.next_id
+        self.add_row(eid, exp.date.toordinal(), to_cents(exp.amount),
+                     exp.category, exp.place)
+        return eid
+
+    def _set_row(
+        self, slot: int, day: int, cents: int, category: str, place: str
+    ) -> None:
+        """Overwrite the column values of a live slot."""
+        if self._indexes:
+            self._notify_remove(slot)
+
+        self._total += cents - self._cents[slot]
+        self._days[slot]   = day
+        self._cents[slot]  = cents
+        self._cats[slot]   = self._cat_code(category)
+        self._places[slot] = self._place_code(place)
+
+        if self._indexes:
+            for index in self._indexes.values():
+                index.on_add(self._ids[slot], day, cents, category, place)
+
+    def put_row(
+        self, eid: int, day: int, cents: int, category: str, place: str
+    ) -> None:
+        """Overwrite the expense if the ID exists (keeping its position), else append it."""
+        slot = self._slot_of.get(eid)
+        if slot is None:
+            self.add_row(eid, day, cents, category, place)
+        else:
+            self._set_row(slot, day, cents, category, place)
+
+    def edit(self, eid: int, exp: Expense) -> None:
+        """
+        Overwrite an existing expense in place, keeping its position.
+
+        Raises:
+            KeyError: If the ID is unknown.
+        """
+        self._set_row(self._slot_of[eid], exp.date.toordinal(),
+                      to_cents(exp.amount), exp.category, exp.place)
+
+    def put(self, eid: int, exp: Expense) -> None:
+        """Edit the expense if the ID exists, otherwise append it."""
+        self.put_row(eid, exp.date.toordinal(), to_cents(exp.amount),
+                     exp.category, exp.place)
+
+    def delete(self, eid: int) -> bool:
+        """
+        Remove an expense and its Treeview row mapping.
+
+        Returns:
+            True if the expense existed.
+        """
+        slot = self._slot_of.pop(eid, None)
+        if slot is None:
+            return False
+
+        if self._indexes:
+            self._notify_remove(slot)
+
+        self._total -= self._cents[slot]
+        self._alive[slot] = 0
+        self._cents[slot] = 0  # Keeps sum(self._cents) equal to the live total
+        self._dead_slot_of[eid] = slot
+        self._dead += 1
+        self.unbind_row(eid)
+
+        # Reclaim space once half of the slots are dead
+        if self._dead > 1024 and self._dead * 2 > len(self._ids):
+            self.compact()
+        return True
+
+    def compact(self) -> None:
+        """Drop dead slots and rebuild the slot index (O(n))."""
+        if not self._dead:
+            return
+
+        alive = self._alive
+        keep = [slot for slot in range(len(alive)) if alive[slot]]
+
+        for name in ('_ids', '_days', '_cents', '_cats', '_places'):
+            old = getattr(self, name)
+            setattr(self, name, array(old.typecode, [old[s] for s in keep]))
+
+        self._alive = bytearray(b'\x01') * len(keep)
+        self._slot_of = {eid: slot for slot, eid in enumerate(self._ids)}
+        self._dead_slot_of.clear()
+        self._dead = 0
+
+    def snapshot(self) -> "ExpenseStore":
+        """
+        Return an independent copy of the expenses for another thread to read.
+
+        The columns are copied with a single memcpy each, so this is cheap
+        enough to run on the UI thread even for large ledgers. Treeview row
+        mappings and secondary indexes are not copied.
+        """
+        copy = ExpenseStore()
+        copy._ids    = self._ids[:]
+        copy._days   = self._days[:]
+        copy._cents  = self._cents[:]
+        copy._cats   = self._cats[:]
+        copy._places = self._places[:]
+        copy._alive  = bytearray(self._alive)
+
+        copy._slot_of = self._slot_of.copy()
+        copy._dead_slot_of = self._dead_slot_of.copy()
+        copy._dead    = self._dead
+        copy._total   = self._total
+
+        copy._cat_names   = self._cat_names[:]
+        copy._cat_codes   = self._cat_codes.copy()
+        copy._place_names = self._place_names[:]
+        copy._place_codes = self._place_codes.copy()
+
+        copy.next_id = self.next_id
+        return copy
+
+    # === Secondary Indexes ===
+    def attach(self, name: str, index) -> None:
+        """
+        Register a secondary index to receive every later change.
+
+        Args:
+            name: Key to look the index up with (see ``index()``).
+            index: Object with ``on_add`` and ``on_remove`` methods, taking
+                (ID, day ordinal, cents, category, place). It must already
+                reflect the current contents of the store.
+        """
+        self._indexes[name] = index
+
+    def detach(self, name: str) -> None:
+        """Stop forwarding changes to a secondary index."""
+        self._indexes.pop(name, None)
+
+    def index(self, name: str):
+        """Return the secondary index registered under a name, or None."""
+        return self._indexes.get(name)
+
+    def _notify_remove(self, slot: int) -> None:
+        """Tell the secondary indexes that a live slot's values go away."""
+        eid, day, cents = self._ids[slot], self._days[slot], self._cents[slot]
+        category = self._cat_names[self._cats[slot]]
+        place    = self._place_names[self._places[slot]]
+        for index in self._indexes.values():
+            index.on_remove(eid, day, cents, category, place)
+
+    # === Treeview Row Mapping ===
+    def bind_row(self, eid: int, row_id: str) -> None:
+        """Associate an expense with the Treeview row that displays it."""
+        self._row_of[eid] = row_id
+        self._id_of[row_id] = eid
+
+    def unbind_row(self, eid: int) -> None:
+        """Forget the Treeview row associated with an expense, if any."""
+        row_id = self._row_of.pop(eid, None)
+        if row_id is not None:
+            self._id_of.pop(row_id, None)
+
+    def unbind_all_rows(self) -> None:
+        """Forget every Treeview row mapping (before rebinding a new window)."""
+        self._row_of.clear()
+        self._id_of.clear()
+
+    def row_of(self, eid: int) -> str | None:
+        """Return the Treeview row ID for an expense, or None."""
+        return self._row_of.get(eid)
+
+    def id_of_row(self, row_id: str) -> int | None:
+        """Return the expense ID shown in a Treeview row, or None."""
+        return self._id_of.get(row_id)
+
+    # === Aggregates ===
+    def total_cents(self) -> int:
+        """Sum of all live expenses in integer cents (O(1))."""
+        return self._total
+
+    def verify_total(self) -> bool:
+        """
+        Check the running total against a full O(n) recompute.
+
+        On a mismatch the discrepancy is logged and the running total is
+        reset to the recomputed value.
+
+        Returns:
+            True if the running total was correct.
+        """
+        actual = sum(self._cents)  # Dead slots hold 0
+        if actual == self._total:
+            return True
+
+        log.warning("Running total drifted: %d != %d cents", self._total, actual)
+        self._total = actual
+        return False
+
+    def place_counts(self) -> Counter:
+        """Count how many live expenses use each place."""
+        alive = self._alive
+        codes = Counter(
+            code for slot, code in enumerate(self._places) if alive[slot]
+        )
+        return Counter({self._place_names[c]: n for c, n in codes.items()})
+
+    # === Bulk Access for Reporting ===
+    def row(self, eid: int) -> tuple[int, int, int, str, str]:
+        """
+        Return one expense as raw column values, without an Expense object.
+
+        Raises:
+            KeyError: If the ID is unknown.
+        """
+        slot = self._slot_of[eid]
+        return (
+            eid, self._days[slot], self._cents[slot],
+            self._cat_names[self._cats[slot]],
+            self._place_names[self._places[slot]]
+        )
+
+    def rows(self) -> Iterator[tuple[int, int, int, str, str]]:
+        """
+        Iterate over live expenses without creating Expense objects.
+
+        Yields:
+            Tuples of (expense ID, day ordinal, cents, category, place).
+        """
+        cats, places = self._cat_names, self._place_names
+        for eid, day, cents, cat, plc, alive in zip(
+            self._ids, self._days, self._cents,
+            self._cats, self._places, self._alive
+        ):
+            if alive:
+                yield eid, day, cents, cats[cat], places[plc]
+
+    def columns(self) -> dict[str, memoryview]:
+        """
+        Return read-only, zero-copy views of the compacted columns.
+
+        The views share memory with the store, so they must be released
+        (``view.release()``) before the store is modified again.
+
+        Returns:
+            Dict with "ids", "days", "cents", "categories" and "places"
+            views; category/place codes index into ``category_names`` and
+            ``place_names``.
+        """
+        self.compact()
+        return {
+            "ids":        memoryview(self._ids).toreadonly(),
+            "days":       memoryview(self._days).toreadonly(),
+            "cents":      memoryview(self._cents).toreadonly(),
+            "categories": memoryview(self._cats).toreadonly(),
+            "places":     memoryview(self._places).toreadonly(),
+        }
+
+    @property
+    def category_names(self) -> list[str]:
+        """Category names indexed by category code."""
+        return self._cat_names
+
+    @property
+    def place_names(self) -> list[str]:
+        """Place names indexed by place code."""
+        return self._place_names
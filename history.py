@@ -0,0 +1,138 @@
+from array import array
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from models import InitialChange
+
+# Rough memory cost of the undo log, used for the budget
+_ENTRY_BYTES = 200  # Per change (objects, arrays, deque slot)
+_ROW_BYTES   = 36   # Per expense value set (8 + 4 + 8 bytes of columns + 2 string refs)
+
+
+class Rows:
+    """
+    Expense values of one change, stored as compact columns.
+
+    Category and place names are references to the store's interned
+    strings, so an expense costs about 36 bytes here, whether a change
+    touches one expense or a whole import.
+    """
+
+    __slots__ = ("ids", "days", "cents", "categories", "places")
+
+    def __init__(self, rows: Iterable[tuple[int, int, int, str, str]] = ()):
+        """
+        Args:
+            rows: (ID, day ordinal, cents, category, place) tuples, e.g.
+                from ``ExpenseStore.row``.
+        """
+        self.ids, self.days, self.cents = array('q'), array('i'), array('q')
+        self.categories: list[str] = []
+        self.places:     list[str] = []
+        for eid, day, cents, category, place in rows:
+            self.ids.append(eid)
+            self.days.append(day)
+            self.cents.append(cents)
+            self.categories.append(category)
+            self.places.append(place)
+
+    def __iter__(self) -> Iterator[tuple[int, int, int, str, str]]:
+        return zip(self.ids, self.days, self.cents, self.categories, self.places)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+@dataclass(slots=True)
+class Change:
+    """
+    One undoable ledger change, as a delta instead of a ledger copy.
+
+    - "add":     ``after`` holds the added expenses
+    - "delete":  ``before`` holds the deleted expenses
+    - "edit":    ``before`` and ``after`` hold the old and new values
+    - "initial": ``initial`` is the appended initial amount record; undo
+      removes it again, so the one before it is current
+    """
+    kind: str                             # "add", "edit", "delete" or "initial"
+    before: Rows | None = None            # Expense values before the change
+    after:  Rows | None = None            # Expense values after the change
+    initial: InitialChange | None = None  # New initial amount ("initial")
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the change."""
+        rows = sum(len(r) for r in (self.before, self.after) if r is not None)
+        return _ENTRY_BYTES + rows * _ROW_BYTES
+
+
+class History:
+    """
+    Undo/redo stacks of ledger changes, capped by a memory budget.
+
+    Recording, undoing and redoing move one Change between the two stacks
+    in O(1). A new change clears the redo stack; once the undo stack
+    exceeds the budget, its oldest changes are forgotten first.
+
+    The History only keeps the deltas. Applying them is up to the Ledger,
+    which replays them as ordinary (journaled) changes.
+    """
+
+    def __init__(self, budget: int):
+        """
+        Args:
+            budget: Maximum approximate memory of the undo stack in bytes
+                (0 = keep no history).
+        """
+        self.budget = budget
+        self._undo: deque[Change] = deque()
+        self._redo: list[Change]  = []
+        self._bytes = 0  # Approximate memory of both stacks
+
+    def record(self, change: Change) -> None:
+        """Push a new change; it can no longer be redone past it."""
+        for old in self._redo:
+            self._bytes -= old.nbytes
+        self._redo.clear()
+
+        self._undo.append(change)
+        self._bytes += change.nbytes
+
+        # Forget the oldest changes (possibly this one, if it alone is too big)
+        while self._undo and self._bytes > self.budget:
+            self._bytes -= self._undo.popleft().nbytes
+
+    def undo(self) -> Change | None:
+        """Move the latest change to the redo stack and return it (None if empty)."""
+        if not self._undo:
+            return None
+        change = self._undo.pop()
+        self._redo.append(change)
+        return change
+
+    def redo(self) -> Change | None:
+        """Move the latest undone change back and return it (None if empty)."""
+        if not self._redo:
+            return None
+        change = self._redo.pop()
+        self._undo.append(change)
+        return change
+
+    def clear(self) -> None:
+        """Forget all changes (e.g. after reloading the ledger)."""
+        self._undo.clear()
+        self._redo.clear()
+        self._bytes = 0
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the history."""
+        return self._bytes
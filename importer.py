@@ -0,0 +1,448 @@
+"""
+Streaming import of bank statements and CSV exports into the ledger, as a
+chain of generators ending in one Ledger.add_expenses batch.
+"""
+import os
+import re
+import csv
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from config import CATEGORIES, IMPORT_CATEGORY_RULES, IMPORT_DEFAULT_CATEGORY
+from models import Expense, MAX_CENTS, to_cents, format_cents, month_key
+from ledger import Ledger
+
+PROGRESS_EVERY = 1000  # Rows between progress reports
+MAX_ERROR_SAMPLES = 20  # Error messages kept for the report
+
+# Header names per field, most specific first
+COLUMN_ALIASES = {
+    "date":        ("date", "booking date", "transaction date", "posting date",
+                    "value date", "datum", "buchungstag", "buchungsdatum", "valuta"),
+    "amount":      ("amount", "betrag", "umsatz", "value", "sum"),
+    "debit":       ("debit", "withdrawal", "paid out", "soll"),
+    "credit":      ("credit", "deposit", "paid in", "haben"),
+    "place":       ("place", "payee", "merchant", "beneficiary", "counterparty",
+                    "name", "empfänger", "description", "details", "memo",
+                    "verwendungszweck"),
+    "category":    ("category", "kategorie"),
+    "record_type": ("record_type",),
+}
+
+# Date spellings tried in order (day-first before month-first)
+DATE_FORMATS = ("%d.%m.%Y", "%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y",
+                "%d.%m.%y", "%m/%d/%Y", "%Y/%m/%d")
+
+
+@dataclass
+class ImportStats:
+    """Counters of an import, updated as rows stream through the pipeline."""
+    rows: int = 0              # Data rows read
+    imported: int = 0          # Expenses added to the ledger
+    duplicates: int = 0        # Rows already in the ledger
+    credits: int = 0           # Incoming payments skipped
+    errors: int = 0            # Rows that could not be imported
+    error_samples: list[str] = field(default_factory=list)
+    chars_read: int = 0        # Progress through the file
+    chars_total: int = 0       # File size (an estimate of its length in characters)
+
+    @property
+    def fraction(self) -> float:
+        """Share of the file read so far, between 0 and 1."""
+        if not self.chars_total:
+            return 1.0
+        return min(1.0, self.chars_read / self.chars_total)
+
+    def error(self, line: int, message: str) -> None:
+        """Count a rejected row, keeping the first few messages."""
+        self.errors += 1
+        if len(self.error_samples) < MAX_ERROR_SAMPLES:
+            self.error_samples.append(f"Line {line}: {message}")
+
+# === Stage 1: Read ===
+def _normalize_header(name: str) -> str:
+    """Lowercase a header and drop a trailing unit, e.g. "Amount (EUR)"."""
+    return re.sub(r"\s*[\(\[].*$", "", name.strip().lower())
+
+def _resolve_columns(header: list[str]) -> dict[str, int]:
+    """
+    Map field names to column positions.
+
+    Raises:
+        ValueError: If the date, amount or place column is missing.
+    """
+    names = [_normalize_header(h) for h in header]
+    columns = {}
+    for name, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in names:
+                columns[name] = names.index(alias)
+                break
+
+    missing = [
+        label for label, ok in (
+            ("date", "date" in columns),
+            ("amount", "amount" in columns or "debit" in columns or "credit" in columns),
+            ("place or description", "place" in columns),
+        ) if not ok
+    ]
+    if missing:
+        raise ValueError(f"No {', '.join(missing)} column found in the header.")
+    return columns
+
+def _counted_lines(f, stats: ImportStats) -> Iterator[str]:
+    """Yield the lines of a file, tracking how much of it has been read."""
+    for line in f:
+        stats.chars_read += len(line)
+        yield line
+
+def read_rows(
+    f, stats: ImportStats, progress: Callable[[ImportStats], None] | None = None
+) -> Iterator[tuple[int, dict[str, str]]]:
+    """
+    Parse a delimited text file one row at a time.
+
+    The delimiter is detected from the start of the file; the first row
+    must be a header.
+
+    Args:
+        f: Text file opened with newline=''.
+        stats: Counters to update.
+        progress: Called with `stats` every PROGRESS_EVERY rows.
+
+    Returns:
+        Iterator of (line number, {field: text}) per data row. The header
+        is checked right away, before the first row is requested.
+
+    Raises:
+        ValueError: If the header is missing required columns.
+    """
+    sample = f.read(16 * 1024)
+    f.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+    except csv.Error:
+        dialect = csv.excel
+
+    reader = csv.reader(_counted_lines(f, stats), dialect)
+    try:
+        header = next(reader, None)
+    except csv.Error as err:
+        raise ValueError(f"Line 1: {err}") from None
+    if header is None:
+        return iter(())
+    return _data_rows(reader, _resolve_columns(header), stats, progress)
+
+def _data_rows(
+    reader, columns: dict[str, int], stats: ImportStats, progress
+) -> Iterator[tuple[int, dict[str, str]]]:
+    """
+    Yield the data rows of a reader positioned after the header (see read_rows).
+
+    Raises:
+        ValueError: If the file cannot be parsed (e.g. a field over the
+            csv module's size limit).
+    """
+    rows = iter(reader)
+    while True:
+        try:
+            row = next(rows, None)
+        except csv.Error as err:
+            raise ValueError(f"Line {reader.line_num}: {err}") from None
+        if row is None:
+            return
+        if not any(cell.strip() for cell in row):
+            continue
+        stats.rows += 1
+        if progress is not None and stats.rows % PROGRESS_EVERY == 0:
+            progress(stats)
+        yield reader.line_num, {
+            name: row[pos].strip() if pos < len(row) else ""
+            for name, pos in columns.items()
+        }
+
+def uses_signed_amounts(path: str) -> bool:
+    """
+    Check whether a file tells outgoing from incoming payments.
+
+    Bank statements do, with separate debit/credit columns or with
+    negative amounts for payments; expense lists (including the app's own
+    data file, recognized by its record_type column) list every expense
+    as a positive amount. Stops at the first negative amount.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file has no usable header.
+    """
+    stats = ImportStats()
+    with open(path, 'r', newline='', encoding='utf-8-sig', errors='replace') as f:
+        for _, fields in read_rows(f, stats):
+            if "record_type" in fields:
+                return False
+            if "amount" not in fields:
+                return True  # Separate debit/credit columns
+            try:
+                if parse_amount_cents(fields["amount"]) < 0:
+                    return True
+            except ValueError:
+                continue  # Reported by the import itself
+    return False
+
+# === Stage 2: Normalize ===
+def parse_amount_cents(text: str) -> int:
+    """
+    Parse an amount as written in bank exports into signed integer cents.
+
+    Handles currency symbols, thousands separators in either convention
+    ("1.234,56", "1,234.56", "1 234,56"), and negatives written as "-12",
+    "12-" or "(12)".
+
+    Raises:
+        ValueError: If the text is not an amount.
+    """
+    s = text.strip()
+    negative = False
+    if s.startswith("(") and s.endswith(")"):
+        negative, s = True, s[1:-1]
+    s = re.sub(r"[^\d,.\-+]", "", s)  # Drop currency, spaces, apostrophes
+    if s.endswith("-"):
+        negative, s = True, s[:-1]
+    if s.startswith(("-", "+")):
+        negative, s = negative or s[0] == "-", s[1:]
+    if not s or not any(c.isdigit() for c in s):
+        raise ValueError(f"Not an amount: {text!r}")
+
+    # The rightmost separator is the decimal point if both kinds occur, or
+    # if it is the only one and followed by one or two digits
+    last = max(s.rfind("."), s.rfind(","))
+    both = "." in s and "," in s
+    if last >= 0 and (both or (len(s) - last - 1 in (1, 2) and s.count(s[last]) == 1)):
+        whole, frac = s[:last], s[last + 1:]
+    else:
+        whole, frac = s, ""
+    whole = whole.replace(".", "").replace(",", "")
+    if (whole and not whole.isdigit()) or (frac and not frac.isdigit()) \
+            or len(frac) > 2 or not (whole or frac):
+        raise ValueError(f"Not an amount: {text!r}")
+
+    cents = int(whole or "0") * 100 + int(frac.ljust(2, "0"))
+    if cents > MAX_CENTS:
+        raise ValueError(f"Amount too large: {text!r}")
+    return -cents if negative else cents
+
+class DateNormalizer:
+    """
+    Parse dates in the common bank-export spellings, memoizing every result.
+
+    Once a format has matched, it is tried first for the following rows,
+    so a file in one consistent format costs one strptime per distinct day.
+    """
+
+    def __init__(self, date_format: str | None = None):
+        """
+        Args:
+            date_format: strptime format to use exclusively (e.g. for
+                month-first dates), or None to detect it.
+        """
+        self._formats = [date_format] if date_format else list(DATE_FORMATS)
+        self._cache: dict[str, date] = {}
+
+    def __call__(self, text: str) -> date:
+        """
+        Raises:
+            ValueError: If the text matches none of the formats.
+        """
+        day = self._cache.get(text)
+        if day is not None:
+            return day
+        for i, fmt in enumerate(self._formats):
+            try:
+                day = datetime.strptime(text, fmt).date()
+            except ValueError:
+                continue
+            if i:
+                self._formats.insert(0, self._formats.pop(i))
+            self._cache[text] = day
+            return day
+        raise ValueError(f"Unknown date: {text!r}")
+
+def normalize(
+    rows: Iterable[tuple[int, dict[str, str]]],
+    stats: ImportStats,
+    parse_date: DateNormalizer,
+    skip_credits: bool = False
+) -> Iterator[tuple[int, date, int, str, str]]:
+    """
+    Turn raw fields into typed values.
+
+    Amounts become positive cents: outgoing payments (negative amounts or
+    debit columns) are expenses. Incoming payments are skipped when
+    `skip_credits` is set and kept as expenses otherwise (for files that
+    list expenses as positive amounts).
+
+    Yields:
+        (line number, date, cents, category text, place) per row.
+    """
+    amounts: dict[str, int] = {}  # Memoized amount texts (statements repeat them)
+
+    def amount(text: str) -> int:
+        cents = amounts.get(text)
+        if cents is None:
+            cents = parse_amount_cents(text)
+            if len(amounts) < 100_000:
+                amounts[text] = cents
+        return cents
+
+    for line, fields in rows:
+        # Ledger files written by this app: only expense records count
+        if fields.get("record_type", "expense") != "expense":
+            continue
+        try:
+            day = parse_date(fields["date"])
+            if fields.get("amount"):
+                cents = amount(fields["amount"])
+            else:
+                cents = (amount(fields.get("credit") or "0")
+                         - amount(fields.get("debit") or "0"))
+        except ValueError as err:
+            stats.error(line, str(err))
+            continue
+
+        if cents > 0 and skip_credits:
+            stats.credits += 1
+            continue
+        yield line, day, abs(cents), fields.get("category", ""), fields["place"]
+
+# === Stage 3: Categories ===
+def map_categories(
+    rows: Iterable[tuple[int, date, int, str, str]],
+    rules: dict[str, str] | None = None,
+    default: str | None = None
+) -> Iterator[tuple[int, date, int, str, str]]:
+    """
+    Assign one of the app's categories to every row.
+
+    A category column value that names an app category (case-insensitive)
+    is kept; otherwise the first keyword rule found in the place decides,
+    else `default`. Results are memoized per place.
+    """
+    rules   = IMPORT_CATEGORY_RULES if rules is None else rules
+    default = IMPORT_DEFAULT_CATEGORY if default is None else default
+    known   = {c.casefold(): c for c in CATEGORIES if c}
+    keywords = [(k.casefold(), c) for k, c in rules.items()]
+    by_place: dict[str, str] = {}
+
+    for line, day, cents, category, place in rows:
+        mapped = known.get(category.casefold())
+        if mapped is None:
+            mapped = by_place.get(place)
+            if mapped is None:
+                folded = place.casefold()
+                mapped = next((c for k, c in keywords if k in folded), default)
+                if len(by_place) < 100_000:
+                    by_place[place] = mapped
+        yield line, day, cents, mapped, place
+
+# === Stage 4: Validate ===
+def validate(
+    rows: Iterable[tuple[int, date, int, str, str]],
+    ledger: Ledger,
+    stats: ImportStats
+) -> Iterator[Expense]:
+    """Apply the ledger's own input rules, rejecting rows that break them."""
+    for line, day, cents, category, place in rows:
+        try:
+            yield ledger.validate_expense(day, format_cents(cents), category, place)
+        except ValueError as err:
+            stats.error(line, str(err))
+
+# === Stage 5: Dedupe ===
+def dedupe(
+    expenses: Iterable[Expense], ledger: Ledger, stats: ImportStats
+) -> Iterator[Expense]:
+    """
+    Drop rows that are already in the ledger (same day, amount and place),
+    using the ledger's duplicate index (O(1) per row).
+
+    Matching is one-to-one: two identical coffees in the file and one in
+    the ledger import one, so importing the same file twice adds nothing
+    the second time while genuine repeats on a day are kept.
+    """
+    index = ledger.duplicates
+    first_new = ledger.expenses.next_id  # Rows of this import get IDs from here
+    matched: set[int] = set()            # Ledger expenses already matched once
+
+    months: set[str] = set()
+    for exp in expenses:
+        # Stored months must be loaded before they can be matched
+        # (partitioned storage); loading indexes their rows
+        month = month_key(exp.date.toordinal())
+        if month not in months:
+            months.add(month)
+            ledger.ensure_loaded(exp.date)
+
+        # Exact matches in any category: the import may categorize differently
+        candidates = index.matches(
+            exp.date.toordinal(), to_cents(exp.amount), None, exp.place,
+            days=0, window=0
+        )
+        eid = next((e for e in candidates if e < first_new and e not in matched), None)
+        if eid is not None:
+            matched.add(eid)
+            stats.duplicates += 1
+            continue
+        yield exp
+
+# === Pipeline ===
+def import_file(
+    ledger: Ledger,
+    path: str,
+    *,
+    date_format: str | None = None,
+    skip_credits: bool | None = None,
+    category_rules: dict[str, str] | None = None,
+    default_category: str | None = None,
+    progress: Callable[[ImportStats], None] | None = None
+) -> ImportStats:
+    """
+    Import a bank statement or CSV export into the ledger in one batch.
+
+    Args:
+        ledger: The ledger to add to (loaded).
+        path: CSV or similar delimited text file with a header row.
+        date_format: strptime format of the date column if it is ambiguous
+            (e.g. "%m/%d/%Y"); detected otherwise.
+        skip_credits: Skip incoming payments (positive amounts), or keep
+            them as expenses; None detects it with ``uses_signed_amounts``.
+        category_rules: Keyword -> category (default: IMPORT_CATEGORY_RULES).
+        default_category: Category when no rule matches
+            (default: IMPORT_DEFAULT_CATEGORY).
+        progress: Called with the stats every PROGRESS_EVERY rows and at
+            the end, e.g. to update a progress bar.
+
+    Returns:
+        The import statistics.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file has no usable header or cannot be parsed
+            (nothing is imported then).
+    """
+    stats = ImportStats(chars_total=os.path.getsize(path))
+    if skip_credits is None:
+        skip_credits = uses_signed_amounts(path)
+
+    with open(path, 'r', newline='', encoding='utf-8-sig', errors='replace') as f:
+        rows = read_rows(f, stats, progress)
+        rows = normalize(rows, stats, DateNormalizer(date_format), skip_credits)
+        rows = map_categories(rows, category_rules, default_category)
+        expenses = dedupe(validate(rows, ledger, stats), ledger, stats)
+
+        eids = ledger.add_expenses(
+            (exp.date, exp.amount, exp.category, exp.place) for exp in expenses
+        )
+
+    stats.imported = len(eids)
+    if progress is not None:
+        progress(stats)
+    return stats
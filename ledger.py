@@ -0,0 +1,473 @@
+from datetime import date
+from collections import Counter
+from collections.abc import Callable, Iterable
+import storage
+from config import PLACE_SUGGESTIONS, BALANCE_CHECK_INTERVAL, UNDO_MEMORY_BUDGET
+from models import Expense, InitialChange, to_cents, month_key
+from expense_store import ExpenseStore
+from place_index import PlaceIndex
+from history import History, Change, Rows
+from search_index import Query
+from sort_index import SortedView
+
+# === Change Events ===
+# Listeners are called as listener(event, eids) after every change:
+#   "reset"   - the ledger was (re)loaded; eids are all loaded expenses
+#   "load"    - older expenses were loaded from disk (lazy loading)
+#   "add"     - an expense was added
+#   "edit"    - an expense was changed
+#   "delete"  - expenses were deleted
+#   "restore" - deleted expenses came back at their old position (undo/redo)
+#   "initial" - the initial amount changed (eids is empty)
+Listener = Callable[[str, list[int]], None]
+
+
+class Ledger:
+    """
+    The expense ledger without any user interface.
+
+    Owns the expenses, the initial amount history, the secondary indexes
+    (rollups, dates, places) and persistence: every change is validated,
+    applied to the store and journaled here, then announced to the
+    registered listeners. The Tk app is one such listener; scripts,
+    batch jobs and benchmarks can drive a Ledger directly.
+
+    Invalid input raises ValueError with a message meant for the user.
+    Likely duplicates are not rejected; callers can check them first with
+    ``likely_duplicates``.
+
+    Every change is also recorded in ``history`` as a compact delta, so it
+    can be undone and redone. Undo and redo are applied like any other
+    change: journaled, and announced with the matching event ("delete"
+    for an undone add, "add" for an undone delete, ...).
+    """
+
+    def __init__(self):
+        self.expenses        = ExpenseStore()  # Columnar expense storage
+        self.initial_changes = []              # List of InitialChange objects
+        self.initial_amount  = 0.00            # Current initial amount
+        storage.attach_indexes(self.initial_changes, self.expenses)  # Usable before load()
+        self.history = History(UNDO_MEMORY_BUDGET)  # Undo/redo log
+        self._listeners: list[Listener] = []
+        self._total_reads = 0                  # For the debug balance check
+
+    # === Change Notification ===
+    def subscribe(self, listener: Listener) -> None:
+        """Register a callable to be told about every change."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Listener) -> None:
+        """Stop telling a listener about changes."""
+        self._listeners.remove(listener)
+
+    def _notify(self, event: str, eids: list[int]) -> None:
+        for listener in list(self._listeners):
+            listener(event, eids)
+
+    # === Loading ===
+    def load(self) -> None:
+        """Load the ledger with the configured storage backend."""
+        self.initial_changes, self.initial_amount, self.expenses = storage.load_data()
+        self.history.clear()
+        self._notify("reset", list(self.expenses))
+
+    def has_unloaded(self) -> bool:
+        """True if older expenses are still on disk (partitioned storage)."""
+        return storage.has_unloaded()
+
+    def load_older(self) -> list[int]:
+        """Load the next older stored period; returns the loaded IDs."""
+        eids = storage.load_older(self.expenses)
+        if eids:
+            self._notify("load", eids)
+        return eids
+
+    def ensure_loaded(self, day: date) -> list[int]:
+        """Load the stored period containing `day`; returns the loaded IDs."""
+        eids = storage.ensure_loaded(self.expenses, day)
+        if eids:
+            self._notify("load", eids)
+        return eids
+
+    def load_all(self) -> list[int]:
+        """Load every stored period; returns the loaded IDs."""
+        eids = storage.load_all(self.expenses)
+        if eids:
+            self._notify("load", eids)
+        return eids
+
+    # === Validation ===
+    @staticmethod
+    def parse_amount(text: str | float) -> float:
+        """
+        Parse a euro amount typed by the user ("12.5", "12,50").
+
+        Raises:
+            ValueError: If it is not a number with at most two decimals.
+        """
+        val = text.replace(",", ".").strip() if isinstance(text, str) else text
+        try:
+            amount = float(val)
+            to_cents(amount)  # Rejects inf, nan and absurdly large amounts
+        except ValueError:
+            raise ValueError("Enter a valid amount.") from None
+        if isinstance(val, str) and '.' in val and len(val.split('.')[-1]) > 2:
+            raise ValueError("Enter at most two decimal places.")
+        return round(amount, 2)
+
+    def validate_expense(
+        self, day: date, amount: str | float, category: str, place: str
+    ) -> Expense:
+        """Build an Expense from user input, or raise ValueError."""
+        amount   = self.parse_amount(amount)
+        category = category.strip()
+        place    = place.strip()
+        if not category:
+            raise ValueError("Select a category.")
+        if not place:
+            raise ValueError("Enter a place.")
+        return Expense(day, amount, category, place)
+
+    # === Changes ===
+    def add_expense(
+        self, day: date, amount: str | float, category: str, place: str
+    ) -> int:
+        """
+        Add and journal an expense.
+
+        Returns:
+            The new expense ID.
+
+        Raises:
+            ValueError: If the input is invalid.
+        """
+        exp = self.validate_expense(day, amount, category, place)
+
+        # New expenses must land in a loaded period (partitioned storage)
+        self.ensure_loaded(day)
+        eid = self.expenses.add(exp)
+        storage.record_add(eid, self.expenses[eid])
+        self.history.record(Change("add", after=Rows([self.expenses.row(eid)])))
+        self._notify("add", [eid])
+        return eid
+
+    def add_expenses(
+        self, items: Iterable[tuple[date, str | float, str, str]]
+    ) -> list[int]:
+        """
+        Add and journal many expenses as one batch (e.g. an import).
+
+        Every item is validated like in ``add_expense``. The batch is all or
+        nothing: if one item is invalid, the ones added before it are
+        removed again and nothing is journaled. Listeners get a single
+        "add" notification for the whole batch.
+
+        Args:
+            items: (date, amount, category, place) tuples; consumed lazily.
+
+        Returns:
+            The new expense IDs, in input order.
+
+        Raises:
+            ValueError: If an item is invalid (the message names its position).
+            Any error raised while reading `items`, after the batch was
+            rolled back.
+        """
+        eids: list[int] = []
+        months: set[str] = set()
+        try:
+            for pos, (day, amount, category, place) in enumerate(items, 1):
+                try:
+                    exp = self.validate_expense(day, amount, category, place)
+                except ValueError as err:
+                    raise ValueError(f"Item {pos}: {err}") from None
+
+                # Load each stored period once (partitioned storage)
+                month = month_key(day.toordinal())
+                if month not in months:
+                    months.add(month)
+                    self.ensure_loaded(day)
+
+                eids.append(self.expenses.add(exp))
+        except BaseException:
+            # Whatever stopped the batch, none of it stays in the store
+            for eid in eids:
+                self.expenses.delete(eid)
+            raise
+
+        if eids:
+            # A single journal write (or transaction) for the whole batch
+            storage.record_adds((eid, self.expenses[eid]) for eid in eids)
+            self.history.record(Change("add", after=Rows(map(self.expenses.row, eids))))
+            self._notify("add", eids)
+        return eids
+
+    def edit_expense(
+        self, eid: int, day: date, amount: str | float, category: str, place: str
+    ) -> None:
+        """
+        Change and journal an expense.
+
+        Raises:
+            ValueError: If the input is invalid.
+            KeyError: If there is no such expense.
+        """
+        exp = self.validate_expense(day, amount, category, place)
+        if eid not in self.expenses:
+            raise KeyError(eid)
+
+        self.ensure_loaded(day)
+        before = Rows([self.expenses.row(eid)])
+        self.expenses.edit(eid, exp)
+        storage.record_edit(eid, exp)
+        self.history.record(Change("edit", before, Rows([self.expenses.row(eid)])))
+        self._notify("edit", [eid])
+
+    def delete_expenses(self, eids: Iterable[int]) -> list[int]:
+        """
+        Delete and journal expenses; unknown IDs are ignored.
+
+        Returns:
+            The IDs that were deleted.
+        """
+        deleted = [eid for eid in dict.fromkeys(eids) if eid in self.expenses]
+        if not deleted:
+            return []
+
+        # Keep the deleted values (not the ledger) for undo
+        self.history.record(Change("delete", before=Rows(map(self.expenses.row, deleted))))
+        self._delete(deleted)
+        return deleted
+
+    def set_initial_amount(self, amount: str | float, day: date | None = None) -> None:
+        """
+        Record a new initial amount, effective from `day` (default: today).
+
+        Raises:
+            ValueError: If the amount is invalid.
+        """
+        change = InitialChange(day or date.today(), self.parse_amount(amount))
+        self.history.record(Change("initial", initial=change))
+        self._set_initial(change)
+
+    # === Undo / Redo ===
+    def undo(self) -> str | None:
+        """
+        Revert the latest change (O(1) for a single-expense change).
+
+        Returns:
+            The kind of change undone ("add", "edit", "delete", "initial"),
+            or None if there is nothing to undo.
+        """
+        change = self.history.undo()
+        if change is None:
+            return None
+
+        if change.kind == "add":
+            self._delete(list(change.after.ids))
+        elif change.kind == "delete":
+            self._insert(change.before)
+        elif change.kind == "edit":
+            self._put(change.before)
+        else:
+            self._unset_initial()
+        return change.kind
+
+    def redo(self) -> str | None:
+        """
+        Apply the latest undone change again.
+
+        Returns:
+            The kind of change redone, or None if there is nothing to redo.
+        """
+        change = self.history.redo()
+        if change is None:
+            return None
+
+        if change.kind == "add":
+            self._insert(change.after)
+        elif change.kind == "delete":
+            self._delete(list(change.before.ids))
+        elif change.kind == "edit":
+            self._put(change.after)
+        else:
+            self._set_initial(change.initial)
+        return change.kind
+
+    # === Applying Changes (no history) ===
+    def _insert(self, rows: Rows) -> None:
+        """Add expenses back under their old IDs and at their old positions."""
+        months: set[str] = set()
+        for eid, day, cents, category, place in rows:
+            month = month_key(day)
+            if month not in months:
+                months.add(month)
+                self.ensure_loaded(date.fromordinal(day))
+            self.expenses.restore_row(eid, day, cents, category, place)
+
+        eids = list(rows.ids)
+        storage.record_adds((eid, self.expenses[eid]) for eid in eids)
+        self._notify("restore", eids)
+
+    def _put(self, rows: Rows) -> None:
+        """Overwrite expenses with earlier values."""
+        for eid, day, cents, category, place in rows:
+            self.expenses.put_row(eid, day, cents, category, place)
+            storage.record_edit(eid, self.expenses[eid])
+        self._notify("edit", list(rows.ids))
+
+    def _delete(self, eids: list[int]) -> None:
+        """Delete existing expenses."""
+        for eid in eids:
+            self.expenses.delete(eid)
+
+        # A single journal write, however many expenses were deleted
+        if len(eids) == 1:
+            storage.record_delete(eids[0])
+        else:
+            storage.record_deletes(eids)
+        self._notify("delete", eids)
+
+    def _set_initial(self, change: InitialChange) -> None:
+        """Make `change` the current initial amount."""
+        self.initial_amount = change.amount
+        self.initial_changes.append(change)
+        self.dates.add_initial_change(change)
+        storage.record_initial_change(len(self.initial_changes) - 1, change)
+        self._notify("initial", [])
+
+    def _unset_initial(self) -> None:
+        """Drop the latest initial amount, making the one before it current."""
+        self.initial_changes.pop()
+        self.initial_amount = self.initial_changes[-1].amount if self.initial_changes else 0.0
+        self.dates.set_initial_changes(self.initial_changes)
+        storage.record_initial_truncate(len(self.initial_changes))
+        self._notify("initial", [])
+
+    # === Queries ===
+    @property
+    def rollups(self):
+        """Per-month category and place totals (RollupIndex)."""
+        return self.expenses.index("rollups")
+
+    @property
+    def dates(self):
+        """Date-range totals and balances (DateIndex)."""
+        return self.expenses.index("dates")
+
+    @property
+    def places(self) -> PlaceIndex:
+        """Place usage counts for autocomplete."""
+        places = self.expenses.index("places")
+        return places if places is not None else PlaceIndex(PLACE_SUGGESTIONS)
+
+    @property
+    def duplicates(self):
+        """Likely duplicate detection (DuplicateIndex)."""
+        return self.expenses.index("duplicates")
+
+    def likely_duplicates(self, exp: Expense) -> list[int]:
+        """IDs of existing expenses that `exp` would likely duplicate (O(1))."""
+        self.ensure_loaded(exp.date)  # Its period must be in memory to compare
+        return self.duplicates.matches(
+            exp.date.toordinal(), to_cents(exp.amount), exp.category, exp.place
+        )
+
+    def flagged_duplicates(self) -> set[int]:
+        """
+        IDs of loaded expenses that duplicated an earlier one when they were
+        loaded or added. Building it on first use is one pass over the
+        store; the returned set is then kept current by every change.
+        """
+        return self.duplicates.flagged
+
+    def duplicate_groups(self) -> list[list[int]]:
+        """
+        All groups of likely duplicates (O(n)).
+
+        Periods still on disk are loaded first, so no duplicate is missed.
+        """
+        self.load_all()
+        return self.duplicates.groups()
+
+    @property
+    def search_index(self):
+        """Place, category, date and amount search (SearchIndex)."""
+        return self.expenses.index("search")
+
+    def search(self, query: Query) -> list[int] | None:
+        """
+        Find the expenses matching a search, in stored order (the order
+        they were added, as in the unsorted table).
+
+        Periods still on disk are loaded first, so no match is missed.
+
+        Returns:
+            Matching expense IDs, or None for an empty query (everything).
+        """
+        if not query:
+            return None
+        self.load_all()
+        return sorted(self.search_index.search(query), key=self.expenses.position)
+
+    def search_facets(self, eids: Iterable[int]) -> Counter:
+        """Number of expenses per category among `eids` (search results)."""
+        return self.search_index.facet_counts(set(eids))
+
+    @property
+    def sorts(self):
+        """Maintained sort orders per column (SortIndex)."""
+        return self.expenses.index("sorts")
+
+    def sorted_view(self, column: str, descending: bool = False) -> SortedView:
+        """
+        All expenses ordered by a column ("date", "amount", "category",
+        "place") as a live sequence of IDs that follows every change.
+
+        Periods still on disk are loaded first, so the order is complete.
+        """
+        self.load_all()
+        return self.sorts.view(column, descending)
+
+    def sort_ids(self, eids: Iterable[int], column: str, descending: bool = False) -> list[int]:
+        """Order some expenses (e.g. search results) by a column."""
+        return self.sorts.sort(eids, column, descending)
+
+    def sort_key(self, column: str) -> Callable[[int], object]:
+        """Sort key of an expense ID by a column, matching ``sort_ids``."""
+        return self.sorts.key_func(column)
+
+    def total_cents(self) -> int:
+        """Total of all expenses in cents, including periods still on disk (O(1))."""
+        # Debug mode: periodically compare the running total to a full recompute
+        self._total_reads += 1
+        if BALANCE_CHECK_INTERVAL and self._total_reads % BALANCE_CHECK_INTERVAL == 0:
+            self.expenses.verify_total()
+
+        return self.expenses.total_cents() + storage.unloaded_total_cents()
+
+    def balance_cents(self) -> int:
+        """Remaining balance: the initial amount minus all expenses, in cents."""
+        return to_cents(self.initial_amount) - self.total_cents()
+
+    def suggest_places(self, prefix: str = "") -> list[str]:
+        """Most used places starting with `prefix` (case-insensitive)."""
+        return self.places.complete(prefix.strip())
+
+    # === Persistence ===
+    def uses_journal(self) -> bool:
+        """True if changes are journaled and need snapshots (not SQLite)."""
+        return storage.uses_journal()
+
+    def capture_snapshot(self):
+        """Cheap copy of the ledger for ``storage.write_snapshot`` (autosave)."""
+        return storage.capture_snapshot(self.initial_changes, self.expenses)
+
+    def save(self) -> None:
+        """Write the full ledger and clear the journal."""
+        storage.save_data(self.initial_changes, self.expenses)
+
+    def close(self) -> None:
+        """Compact the journal into the data file if it has grown large."""
+        if storage.journal_needs_compaction():
+            self.save()
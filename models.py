@@ -1,3 +1,4 @@
+import math
 from dataclasses import dataclass
 from datetime import date
 
@@ -14,3 +15,36 @@ class Expense:
     amount: float    # The amount spent
     category: str    # The category of the expense (e.g., Food, Transport)
     place: str       # The place or vendor where the expense occurred
+
+# === Date Helpers ===
+_month_keys: dict[int, str] = {}  # Memoized day ordinal -> "YYYY-MM"
+
+def month_key(day: int) -> str:
+    """Return the "YYYY-MM" month key for a day ordinal (memoized)."""
+    key = _month_keys.get(day)
+    if key is None:
+        key = _month_keys[day] = date.fromordinal(day).strftime("%Y-%m")
+    return key
+
+# === Money Helpers ===
+MAX_CENTS = 10**13  # Largest amount (€100 billion), far inside the 64-bit columns
+
+def to_cents(amount: float) -> int:
+    """
+    Convert a euro amount to exact integer cents.
+
+    Raises:
+        ValueError: If the amount is not finite or larger than MAX_CENTS.
+    """
+    if not math.isfinite(amount):
+        raise ValueError(f"Not a finite amount: {amount}")
+    cents = round(amount * 100)
+    if abs(cents) > MAX_CENTS:
+        raise ValueError(f"Amount too large: {amount}")
+    return cents
+
+def format_cents(cents: int) -> str:
+    """Format integer cents as a plain decimal string, e.g. 1234 -> "12.34"."""
+    sign = "-" if cents < 0 else ""
+    euros, rest = divmod(abs(cents), 100)
+    return f"{sign}{euros}.{rest:02d}"
@@ -0,0 +1,156 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class ActionOverlay:
+    """
+    One floating Edit/Delete button pair drawn over a Treeview cell.
+
+    The widgets are kept as attributes so recoloring never has to walk
+    ``winfo_children()``.
+    """
+
+    __slots__ = ("row_id", "frame", "inner", "edit_button", "delete_button",
+                 "geometry", "color")
+
+    def __init__(self, root, on_edit, on_delete, on_enter, on_leave):
+        """
+        Build the overlay widgets (hidden until placed).
+
+        Args:
+            root (tk.Tk): Window the overlay is placed in.
+            on_edit, on_delete (callable): Called with the bound row ID.
+            on_enter, on_leave (callable): Hover callbacks, called with the row ID.
+        """
+        self.row_id   = None   # Treeview row currently served by this overlay
+        self.geometry = None   # Last (x, y, w, h) passed to place()
+        self.color    = None   # Current background color
+
+        # Outer frame that overlays the cell
+        self.frame = tk.Frame(root, bd=0, highlightthickness=0)
+        self.frame.bind("<Enter>", lambda e: on_enter(self.row_id))
+        self.frame.bind("<Leave>", lambda e: on_leave(self.row_id))
+
+        # Inner frame to center buttons within the cell
+        self.inner = tk.Frame(self.frame)
+        self.inner.place(relx=0.5, rely=0.5, anchor="center")  # Centered placement
+
+        # Buttons look up the bound row at click time, so a recycled
+        # overlay never needs new Tcl callbacks
+        self.edit_button = ttk.Button(
+            self.inner,
+            text="Edit",
+            style="Action.TButton",
+            command=lambda: on_edit(self.row_id),
+            width=6
+        )
+        self.edit_button.pack(side="left", padx=(2, 2))
+
+        self.delete_button = ttk.Button(
+            self.inner,
+            text="Delete",
+            style="Action.TButton",
+            command=lambda: on_delete(self.row_id),
+            width=6
+        )
+        self.delete_button.pack(side="left", padx=(2, 2))
+
+    def set_color(self, color):
+        """Set the background of the overlay frames (no-op if unchanged)."""
+        if color != self.color:
+            self.frame.config(bg=color)
+            self.inner.config(bg=color)
+            self.color = color
+
+    def hide(self):
+        """Remove the overlay from the screen."""
+        if self.geometry is not None:
+            self.frame.place_forget()
+            self.geometry = None
+
+
+class ActionOverlayPool:
+    """
+    Keeps exactly one ActionOverlay per visible Treeview row.
+
+    Overlays for rows that go away are hidden and kept on a free list, and
+    rows that appear reuse them, so widgets are only created when the
+    number of visible rows grows past its previous maximum. Redrawing
+    touches only the bound overlays, i.e. cost is proportional to the
+    visible rows, not the ledger size.
+    """
+
+    def __init__(self, root, tree, column, on_edit, on_delete, on_enter, on_leave):
+        """
+        Args:
+            root (tk.Tk): Window the overlays are placed in.
+            tree (ttk.Treeview): Table whose cells the overlays cover.
+            column (str): Treeview column for the overlays, e.g. "#5".
+            on_edit, on_delete (callable): Button callbacks, called with a row ID.
+            on_enter, on_leave (callable): Hover callbacks, called with a row ID.
+        """
+        self._root   = root
+        self._tree   = tree
+        self._column = column
+        self._callbacks = (on_edit, on_delete, on_enter, on_leave)
+
+        self._bound: dict[str, ActionOverlay] = {}  # Maps row ID to its overlay
+        self._free:  list[ActionOverlay]      = []  # Hidden overlays ready for reuse
+
+    def __contains__(self, row_id):
+        return row_id in self._bound
+
+    def attach(self, row_id, color):
+        """
+        Give a row an overlay, recycling a hidden one when possible.
+
+        Args:
+            row_id (str): Treeview row ID.
+            color (str): Initial background color.
+        """
+        overlay = self._bound.get(row_id)
+        if overlay is None:
+            overlay = self._free.pop() if self._free else ActionOverlay(
+                self._root, *self._callbacks
+            )
+            overlay.row_id = row_id
+            self._bound[row_id] = overlay
+        overlay.set_color(color)
+
+    def detach(self, row_id):
+        """Hide a row's overlay and return it to the free list."""
+        overlay = self._bound.pop(row_id, None)
+        if overlay is not None:
+            overlay.hide()
+            overlay.row_id = None
+            self._free.append(overlay)
+
+    def set_color(self, row_id, color):
+        """Set the background color of a row's overlay, if it has one."""
+        overlay = self._bound.get(row_id)
+        if overlay is not None:
+            overlay.set_color(color)
+
+    def redraw(self):
+        """
+        Align each bound overlay with its row's cell, hiding those whose
+        row is not currently laid out.
+        """
+        # Offset of the Treeview inside the root window (same for all rows)
+        dx = self._tree.winfo_rootx() - self._root.winfo_rootx()
+        dy = self._tree.winfo_rooty() - self._root.winfo_rooty()
+
+        for row_id, overlay in self._bound.items():
+            bbox = self._tree.bbox(row_id, column=self._column)
+            if not bbox:
+                overlay.hide()
+                continue
+
+            x, y, w, h = bbox
+            geometry = (dx + x, dy + y, w, h)
+
+            # Skip the Tk call when nothing moved
+            if geometry != overlay.geometry:
+                overlay.frame.place(x=geometry[0], y=geometry[1],
+                                    width=w, height=h)
+                overlay.geometry = geometry
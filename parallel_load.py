@@ -0,0 +1,232 @@
+import os
+import io
+import csv
+from array import array
+from datetime import date
+from concurrent.futures import ProcessPoolExecutor
+from models import InitialChange, to_cents
+from expense_store import ExpenseStore
+from storage import DateParser
+
+# === How It Works ===
+# The CSV data file is cut into byte ranges that start and end on line
+# boundaries. Each range is parsed in a worker process into the same
+# compact columns the ExpenseStore uses, with its own small category and
+# place tables. The main process then concatenates the columns in file
+# order, remapping the string codes, and adopts them into a store without
+# touching individual rows.
+#
+# Record order is preserved because ranges are merged in file order, so
+# the last initial_change in the file is still the current one.
+#
+# Cases the fast merge cannot reproduce exactly fall back to the serial
+# loader: quoted fields containing a line break (a range boundary could
+# split them), rows without a valid ID (IDs would depend on earlier rows),
+# and duplicate IDs (the serial loader keeps the first position, last
+# values).
+#
+# Quoted line breaks are detected by parsing rather than by counting
+# quotes, which stray quotes or a range starting inside one quoted field
+# and ending inside another can fool. Every range up to the first one
+# with a quoted line break starts at a real record start, so that range
+# sees the line break either in a record spanning several lines or in a
+# quoted field cut off at its end. If no range sees one, every boundary
+# is a real record start and the merge is exact.
+
+CHUNK_TARGET = 8 * 1024 * 1024  # Aim for ranges of about this many bytes
+
+# === Splitting ===
+def split_ranges(path: str, parts: int) -> tuple[bytes, list[tuple[int, int]]]:
+    """
+    Cut a file into about `parts` byte ranges aligned to line starts.
+
+    Returns:
+        (header line, list of (start, end) byte offsets covering the rest
+        of the file).
+    """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        header = f.readline()
+        start  = f.tell()
+        step   = max(1, (size - start) // max(1, parts))
+
+        bounds = [start]
+        while bounds[-1] < size:
+            pos = bounds[-1] + step
+            if pos >= size:
+                bounds.append(size)
+                break
+            f.seek(pos)
+            f.readline()  # Move to the start of the next line
+            bounds.append(min(f.tell(), size))
+
+    return header, list(zip(bounds, bounds[1:]))
+
+# === Worker ===
+def _parse_range(
+    path: str, start: int, end: int, cols: dict[str, int], width: int
+) -> dict | None:
+    """
+    Parse the records in one byte range (runs in a worker process).
+
+    Returns:
+        Columns, local string tables and initial changes of the range, or
+        None if the range cannot be merged exactly (see the notes above).
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    i_type, i_date, i_amt = cols['record_type'], cols['date'], cols['amount']
+    i_cat = cols.get('category')
+    i_plc = cols.get('place')
+    i_id  = cols.get('id')
+    if i_id is None:
+        return None
+
+    ids, days_col, cents = array('q'), array('i'), array('q')
+    cats, places = array('H'), array('I')
+    cat_codes:   dict[str, int] = {}
+    place_codes: dict[str, int] = {}
+    changes: list[tuple[int, float]] = []
+
+    parse_date = DateParser()
+    days: dict[str, int] = {}  # Memoized date string -> day ordinal
+
+    reader = csv.reader(io.StringIO(data.decode('utf-8'), newline=''))
+    records = 0
+    row: list[str] = []
+    for row in reader:
+        records += 1
+
+        # Same rules as storage.read_csv
+        if len(row) < width:
+            row += [''] * (width - len(row))
+
+        rtype = row[i_type].strip()
+        dstr  = row[i_date].strip()
+        astr  = row[i_amt].strip()
+        if not (rtype and dstr and astr):
+            continue
+
+        try:
+            day = days.get(dstr)
+            if day is None:
+                day = days[dstr] = parse_date(dstr).toordinal()
+            amt = float(astr)
+            amt_cents = to_cents(amt)
+        except ValueError:
+            continue
+
+        if rtype == 'expense':
+            try:
+                eid = int(row[i_id])
+            except ValueError:
+                return None
+
+            cat = row[i_cat].strip() if i_cat is not None else ''
+            plc = row[i_plc].strip() if i_plc is not None else ''
+            code = cat_codes.get(cat)
+            if code is None:
+                code = cat_codes[cat] = len(cat_codes)
+            cats.append(code)
+            code = place_codes.get(plc)
+            if code is None:
+                code = place_codes[plc] = len(place_codes)
+            places.append(code)
+
+            ids.append(eid)
+            days_col.append(day)
+            cents.append(amt_cents)
+
+        elif rtype == 'initial_change':
+            changes.append((day, amt))
+
+    # A quoted line break: a record spanning lines, or a quoted field cut
+    # off by the end of the range
+    if reader.line_num != records or any('\n' in f or '\r' in f for f in row):
+        return None
+
+    return {
+        "ids": ids, "days": days_col, "cents": cents,
+        "cats": cats, "places": places,
+        "cat_names": list(cat_codes), "place_names": list(place_codes),
+        "changes": changes,
+    }
+
+# === Merge ===
+def _merge(parts: list[dict]) -> tuple[list[InitialChange], ExpenseStore] | None:
+    """Concatenate parsed ranges in file order into one store."""
+    ids, days, cents = array('q'), array('i'), array('q')
+    cats, places = array('H'), array('I')
+    cat_codes:   dict[str, int] = {}
+    place_codes: dict[str, int] = {}
+    initial_changes: list[InitialChange] = []
+
+    def remap(names: list[str], codes: dict[str, int]) -> list[int]:
+        """Global codes for a range's local string table."""
+        return [codes.setdefault(name, len(codes)) for name in names]
+
+    for part in parts:
+        ids.extend(part["ids"])
+        days.extend(part["days"])
+        cents.extend(part["cents"])
+        cats.extend(map(remap(part["cat_names"], cat_codes).__getitem__, part["cats"]))
+        places.extend(map(remap(part["place_names"], place_codes).__getitem__, part["places"]))
+        initial_changes.extend(
+            InitialChange(date.fromordinal(day), amt) for day, amt in part["changes"]
+        )
+
+    if len(set(ids)) != len(ids):
+        return None
+
+    expenses = ExpenseStore.from_columns(
+        ids, days, cents, cats, places,
+        list(cat_codes), list(place_codes),
+        max(ids) + 1 if ids else 0
+    )
+    return initial_changes, expenses
+
+# === Entry Point ===
+def read(
+    path: str, workers: int = 0
+) -> tuple[list[InitialChange], ExpenseStore] | None:
+    """
+    Read a CSV data file with a pool of worker processes.
+
+    Args:
+        path: CSV data file (without the journal; see storage.load_csv).
+        workers: Number of processes (0 = one per CPU core).
+
+    Returns:
+        (initial changes, expenses) exactly as ``storage.read_csv`` would
+        read them, or None if the file is missing or needs the serial
+        loader (callers then fall back to it).
+    """
+    if not os.path.exists(path):
+        return None
+
+    workers = workers or os.cpu_count() or 1
+    parts = max(workers, os.path.getsize(path) // CHUNK_TARGET)  # Extra ranges even out the load
+    header_line, ranges = split_ranges(path, parts)
+
+    # Resolve column positions once from the header row
+    header = next(csv.reader([header_line.decode('utf-8')]), [])
+    header = [name.strip() for name in header]
+    cols = {name: i for i, name in enumerate(header)}
+    if not all(k in cols for k in ('record_type', 'date', 'amount')):
+        return None
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(
+            _parse_range,
+            [path] * len(ranges),
+            [start for start, _ in ranges],
+            [end for _, end in ranges],
+            [cols] * len(ranges),
+            [len(header)] * len(ranges),
+        ))
+
+    if any(part is None for part in results):
+        return None
+    return _merge(results)
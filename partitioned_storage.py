@@ -0,0 +1,315 @@
+import os
+import json
+import threading
+from datetime import date
+import storage
+from config import (
+    DATA_FILE, JOURNAL_FILE, ROTATED_JOURNAL_FILE, PARTITION_DIR, MANIFEST_FILE,
+    PLACE_SUGGESTIONS
+)
+from models import InitialChange, to_cents, month_key
+from expense_store import ExpenseStore
+from rollups import RollupIndex
+from date_index import DateIndex
+from place_index import PlaceIndex
+
+# === Layout ===
+# PARTITION_DIR/2025-09.csv  one CSV per month (same columns as DATA_FILE)
+# PARTITION_DIR/manifest.json
+#     {"version": 1, "next_id": 1234,
+#      "initial_changes": [["2025-01-01", 150000], ...],
+#      "partitions": {"2025-09": {"count": 42, "total_cents": 51234,
+#                                 "categories": {"Food": [cents, count]},
+#                                 "places": {"Vendor": [cents, count]},
+#                                 "days": {"2025-09-03": [cents, count]}}, ...}}
+#
+# Startup reads only the manifest and the most recent month. The manifest
+# totals, rollups and per-day sums stand in for the months that are not
+# loaded, so the balance, the summaries and date-range totals are exact
+# without reading them. Older months are loaded on demand.
+#
+# Every month that has been loaded is owned by the in-memory store from
+# then on and is rewritten from it on save; months never loaded are never
+# touched. Expenses must therefore only be stored in loaded months (see
+# ensure_loaded).
+
+MANIFEST_VERSION = 1
+
+# Secondary indexes seeded from the manifest summaries of unloaded months
+SUMMARY_INDEXES = {"rollups": RollupIndex, "dates": DateIndex, "places": PlaceIndex}
+
+_manifest: dict | None = None  # Parsed manifest, loaded on first use
+_loaded: set[str] = set()      # Month keys owned by the in-memory store
+_lock = threading.Lock()       # Saves may run on the autosave thread
+
+# === Partition Files ===
+def _partition_path(month: str) -> str:
+    """Return the CSV file path of a month partition."""
+    return os.path.join(PARTITION_DIR, f"{month}.csv")
+
+# === Manifest ===
+def _read_manifest() -> dict:
+    """Read the manifest, migrating the single-file CSV data on first use."""
+    global _manifest
+    if _manifest is not None:
+        return _manifest
+
+    if not os.path.exists(MANIFEST_FILE):
+        migrate_from_csv()
+    else:
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            _manifest = json.load(f)
+    return _manifest
+
+def _write_manifest(manifest: dict) -> None:
+    """Atomically replace the manifest file."""
+    tmp_file = MANIFEST_FILE + ".tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, MANIFEST_FILE)
+
+# === One-Shot CSV Migration ===
+def migrate_from_csv(csv_path: str | None = None) -> int:
+    """
+    Split the single-file CSV data (and its journal) into month partitions.
+
+    Runs automatically when no manifest exists yet; afterwards the CSV
+    file is left untouched and no longer read.
+
+    Args:
+        csv_path: Path of the CSV data file to import (default: DATA_FILE).
+
+    Returns:
+        The number of expenses imported.
+    """
+    global _manifest
+    if csv_path is None:
+        csv_path = DATA_FILE
+    os.makedirs(PARTITION_DIR, exist_ok=True)
+
+    initial_changes, _, expenses = storage.load_csv(csv_path)
+    months = frozenset(month_key(day) for _, day, _, _, _ in expenses.rows())
+
+    _manifest = {
+        "version": MANIFEST_VERSION, "next_id": 0,
+        "initial_changes": [], "partitions": {}
+    }
+    save_data(initial_changes, expenses, months)
+    with _lock:
+        _loaded.clear()  # The imported store is discarded
+
+    # The journals were replayed into the imported data
+    for path in (ROTATED_JOURNAL_FILE, JOURNAL_FILE):
+        if os.path.exists(path):
+            os.remove(path)
+
+    return len(expenses)
+
+# === Save Data ===
+def loaded_months() -> frozenset:
+    """Return the keys of the months owned by the in-memory store."""
+    with _lock:
+        return frozenset(_loaded)
+
+def save_data(
+    initial_changes: list[InitialChange],
+    expenses: ExpenseStore,
+    months: frozenset | None = None
+) -> None:
+    """
+    Rewrite the partitions of the loaded months and the manifest.
+
+    Cost is proportional to the loaded data, not to the whole history.
+
+    Args:
+        initial_changes: List of InitialChange objects.
+        expenses: Store of the loaded expenses.
+        months: Months owned by `expenses` (default: the currently loaded
+            ones). Loaded months without expenses are removed.
+    """
+    manifest = _read_manifest()
+    if months is None:
+        months = loaded_months()
+
+    # Group the rows by month in a single pass
+    groups: dict[str, list] = {month: [] for month in months}
+    for row in expenses.rows():
+        groups.setdefault(month_key(row[1]), []).append(row)
+
+    # Write the partitions first: a crash before the manifest is replaced
+    # leaves the journal in place, and replaying it repairs the totals
+    os.makedirs(PARTITION_DIR, exist_ok=True)
+    stats = {}
+    for month, rows in groups.items():
+        path = _partition_path(month)
+        if rows:
+            storage.write_csv(path, [], rows)
+            stats[month] = {
+                "count": len(rows),
+                "total_cents": sum(row[2] for row in rows),
+            }
+            for index_cls in SUMMARY_INDEXES.values():
+                stats[month].update(index_cls.summarize(rows, month))
+        else:
+            if os.path.exists(path):
+                os.remove(path)
+            stats[month] = None
+
+    with _lock:
+        # Months written from the store are owned by it from now on
+        _loaded.update(stats)
+
+        partitions = manifest["partitions"]
+        for month, entry in stats.items():
+            if entry is None:
+                partitions.pop(month, None)
+            else:
+                partitions[month] = entry
+
+        manifest["next_id"] = max(manifest["next_id"], expenses.next_id)
+        manifest["initial_changes"] = [
+            [ch.date.isoformat(), to_cents(ch.amount)] for ch in initial_changes
+        ]
+        _write_manifest(manifest)
+
+# === Load Data ===
+def _load_month(expenses: ExpenseStore, month: str) -> list[int]:
+    """
+    Read one month partition into the store and mark it loaded.
+
+    Returns:
+        IDs of the loaded expenses, in stored order.
+    """
+    with _lock:
+        if month in _loaded:
+            return []
+        _loaded.add(month)
+        entry = _read_manifest()["partitions"].get(month)
+
+    # The indexes counted this month from the manifest; its rows take over
+    if entry is not None:
+        for name in SUMMARY_INDEXES:
+            index = expenses.index(name)
+            if index is not None:
+                index.add_month_summary(month, entry, -1)
+
+    part = ExpenseStore()
+    storage.read_csv(_partition_path(month), [], part)
+
+    next_id = expenses.next_id
+    for row in part.rows():
+        expenses.put_row(*row)
+
+    # IDs of months that are still on disk must never be reused
+    expenses.next_id = max(next_id, expenses.next_id, _read_manifest()["next_id"])
+    return list(part)
+
+def load_data() -> tuple[list[InitialChange], float, ExpenseStore]:
+    """
+    Load the initial changes and the most recent month of expenses.
+
+    If a journal is left over from a session that did not close cleanly,
+    every month is loaded instead so the journal can be replayed safely.
+
+    Returns:
+        A tuple containing:
+        - List of InitialChange objects
+        - Last initial amount (float)
+        - ExpenseStore with the loaded expenses, keyed by stable expense ID
+    """
+    manifest = _read_manifest()
+    with _lock:
+        _loaded.clear()
+
+    initial_changes = [
+        InitialChange(date.fromisoformat(d), cents / 100)
+        for d, cents in manifest["initial_changes"]
+    ]
+    expenses = ExpenseStore()
+    expenses.next_id = manifest["next_id"]
+
+    # Summaries start from the manifest; loading a month swaps its
+    # manifest buckets for its actual rows
+    indexes = {
+        "rollups": RollupIndex(),
+        "dates":   DateIndex(expenses),
+        "places":  PlaceIndex(PLACE_SUGGESTIONS),
+    }
+    with _lock:
+        for month, entry in manifest["partitions"].items():
+            for index in indexes.values():
+                index.add_month_summary(month, entry)
+    for name, index in indexes.items():
+        expenses.attach(name, index)
+
+    if os.path.exists(JOURNAL_FILE) or os.path.exists(ROTATED_JOURNAL_FILE):
+        load_all(expenses)
+        storage.replay_journal(initial_changes, expenses)
+
+        # Replayed expenses may live in months that had no partition yet
+        with _lock:
+            _loaded.update(month_key(row[1]) for row in expenses.rows())
+    else:
+        # The current month, or the newest stored one if the current month
+        # has no expenses yet
+        if not ensure_loaded(expenses, date.today()):
+            load_older(expenses)
+
+    last_initial = initial_changes[-1].amount if initial_changes else 0.0
+    return initial_changes, last_initial, expenses
+
+def has_unloaded() -> bool:
+    """True if some month partitions have not been loaded yet."""
+    manifest = _read_manifest()
+    with _lock:
+        return any(month not in _loaded for month in manifest["partitions"])
+
+def unloaded_total_cents() -> int:
+    """Sum of the expenses in months that are not loaded, from the manifest."""
+    manifest = _read_manifest()
+    with _lock:
+        return sum(
+            entry["total_cents"]
+            for month, entry in manifest["partitions"].items()
+            if month not in _loaded
+        )
+
+def load_older(expenses: ExpenseStore) -> list[int]:
+    """
+    Load the most recent month that is not loaded yet.
+
+    Returns:
+        IDs of the loaded expenses (empty if every month is loaded).
+    """
+    manifest = _read_manifest()
+    with _lock:
+        unloaded = [m for m in manifest["partitions"] if m not in _loaded]
+    if not unloaded:
+        return []
+    return _load_month(expenses, max(unloaded))
+
+def ensure_loaded(expenses: ExpenseStore, day: date) -> list[int]:
+    """
+    Load the month containing a date, if it is not loaded yet.
+
+    Returns:
+        IDs of the loaded expenses (empty if it was already loaded).
+    """
+    _read_manifest()
+    return _load_month(expenses, day.strftime("%Y-%m"))
+
+def load_all(expenses: ExpenseStore) -> list[int]:
+    """
+    Load every month that is not loaded yet, newest first.
+
+    Returns:
+        IDs of the loaded expenses.
+    """
+    eids = []
+    while True:
+        loaded = load_older(expenses)
+        if not loaded and not has_unloaded():
+            return eids
+        eids.extend(loaded)
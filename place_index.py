@@ -0,0 +1,160 @@
+from bisect import bisect_left, insort
+from heapq import nsmallest
+
+_MAX_CACHED = 4096  # Prefixes whose completions are kept
+
+
+class PlaceIndex:
+    """
+    Usage counts of places with frequency-ranked prefix completion.
+
+    Places are kept in a table sorted by their case-folded name, so the
+    places starting with a prefix form one contiguous slice found by
+    binary search. The top-k of a slice is computed once and cached per
+    prefix; when a place is used again, the cached lists of its own
+    prefixes are patched in O(k) instead of being recomputed, so adding
+    an expense never sorts all places.
+
+    Attached to the ExpenseStore as a secondary index, so counts follow
+    adds, edits and deletes.
+    """
+
+    def __init__(self, k: int = 10):
+        """
+        Args:
+            k: Default number of completions returned.
+        """
+        self.k = k
+        self._counts: dict[str, int] = {}          # Place -> number of expenses
+        self._entries: list[tuple[str, str]] = []  # Sorted (case-folded name, name)
+        self._top: dict[str, list[str]] = {}       # Case-folded prefix -> ranked places
+
+    @classmethod
+    def from_counts(cls, counts, k: int = 10) -> "PlaceIndex":
+        """
+        Build the index from (place, count) pairs in O(P log P).
+
+        Args:
+            counts: Iterable of (place, number of expenses).
+            k: Default number of completions returned.
+        """
+        index = cls(k)
+        index._counts = {p: n for p, n in counts if p and n > 0}
+        index._entries = sorted((p.casefold(), p) for p in index._counts)
+        return index
+
+    # === Store Events ===
+    def on_add(self, eid: int, day: int, cents: int, category: str, place: str) -> None:
+        """Count a use of a place."""
+        self.add(place, 1)
+
+    def on_remove(self, eid: int, day: int, cents: int, category: str, place: str) -> None:
+        """Uncount a use of a place."""
+        self.add(place, -1)
+
+    # === Per-Month Summaries (partitioned storage) ===
+    @staticmethod
+    def summarize(rows, month: str) -> dict:
+        """Nothing extra: the place counts come from the rollup summaries."""
+        return {}
+
+    def add_month_summary(self, month: str, summary: dict, sign: int = 1) -> None:
+        """Add (or with sign=-1, subtract) the place counts of a rollup summary."""
+        for place, (_, count) in summary.get("places", {}).items():
+            self.add(place, sign * count)
+
+    # === Updates ===
+    def add(self, place: str, delta: int) -> None:
+        """
+        Change the usage count of a place by `delta`.
+
+        Places whose count drops to zero are removed.
+        """
+        if not place or not delta:
+            return
+
+        key = place.casefold()
+        old = self._counts.get(place, 0)
+        new = old + delta
+
+        if new <= 0:
+            self._counts.pop(place, None)
+            if old:
+                pos = bisect_left(self._entries, (key, place))
+                del self._entries[pos]
+            self._invalidate(key)
+            return
+
+        self._counts[place] = new
+        if not old:
+            insort(self._entries, (key, place))
+
+        if delta > 0:
+            self._promote(key, place)
+        else:
+            self._invalidate(key, place)
+
+    def _promote(self, key: str, place: str) -> None:
+        """Patch the cached rankings of every prefix of a place whose count grew."""
+        top, rank = self._top, self._rank
+        for i in range(len(key) + 1):
+            ranked = top.get(key[:i])
+            if ranked is None:
+                continue
+            if place in ranked:
+                ranked.sort(key=rank)
+            elif len(ranked) < self.k or rank(place) < rank(ranked[-1]):
+                ranked.append(place)
+                ranked.sort(key=rank)
+                del ranked[self.k:]
+
+    def _invalidate(self, key: str, place: str | None = None) -> None:
+        """
+        Drop the cached rankings of a place's prefixes that a decrease may
+        have changed (all of them when `place` is None).
+        """
+        top = self._top
+        for i in range(len(key) + 1):
+            ranked = top.get(key[:i])
+            if ranked is not None and (place is None or place in ranked):
+                del top[key[:i]]
+
+    def _rank(self, place: str) -> tuple[int, str, str]:
+        """Sort key: most used first, then alphabetical."""
+        return -self._counts[place], place.casefold(), place
+
+    # === Queries ===
+    def complete(self, prefix: str = "", k: int | None = None) -> list[str]:
+        """
+        Return the most used places starting with `prefix` (case-insensitive).
+
+        Args:
+            prefix: Text typed so far.
+            k: Maximum number of places (default: the index's k).
+
+        Returns:
+            Place names, most used first.
+        """
+        k = self.k if k is None else k
+        key = prefix.casefold()
+
+        # Only the default k is cached; longer lists are computed each time
+        ranked = self._top.get(key) if k <= self.k else None
+        if ranked is None:
+            entries = self._entries
+            lo = bisect_left(entries, (key,))
+            hi = bisect_left(entries, (key + "\U0010ffff",))
+            ranked = nsmallest(max(k, self.k), (p for _, p in entries[lo:hi]), key=self._rank)
+
+            if len(self._top) >= _MAX_CACHED:
+                self._top.clear()
+            self._top[key] = ranked[:self.k]
+
+        return ranked[:k]
+
+    def count(self, place: str) -> int:
+        """Return how many expenses use a place."""
+        return self._counts.get(place, 0)
+
+    def __len__(self) -> int:
+        return len(self._counts)
@@ -0,0 +1,68 @@
+import time
+
+
+class RedrawScheduler:
+    """
+    Coalesces redraw requests into at most one redraw per frame.
+
+    Event handlers call ``request()`` as often as they like; the callback
+    runs once, from the Tk event loop, after the burst of events has been
+    processed. If the previous redraw ran less than one frame ago, the
+    next one is delayed until the frame budget has elapsed.
+
+    The ``requested`` and ``executed`` counters show how much work the
+    coalescing saved.
+    """
+
+    def __init__(self, widget, callback, frame_ms=16):
+        """
+        Args:
+            widget (tk.Misc): Any widget, used to reach the Tk event loop.
+            callback (callable): The redraw to run (takes no arguments).
+            frame_ms (int): Minimum time between two redraws in milliseconds.
+        """
+        self._widget   = widget
+        self._callback = callback
+        self._frame_s  = frame_ms / 1000
+
+        self._pending  = None   # ID of the scheduled after/after_idle call
+        self._last_run = 0.0    # perf_counter() of the last redraw
+
+        self.requested = 0      # Number of request() calls
+        self.executed  = 0      # Number of redraws actually run
+
+    @property
+    def pending(self):
+        """True if a redraw is scheduled but has not run yet."""
+        return self._pending is not None
+
+    def request(self):
+        """Ask for a redraw; repeated requests before it runs are merged."""
+        self.requested += 1
+        if self._pending is not None:
+            return
+
+        wait = self._last_run + self._frame_s - time.perf_counter()
+        if wait > 0:
+            self._pending = self._widget.after(int(wait * 1000) + 1, self._run)
+        else:
+            self._pending = self._widget.after_idle(self._run)
+
+    def flush(self):
+        """Run a pending redraw immediately."""
+        if self._pending is not None:
+            self._widget.after_cancel(self._pending)
+            self._run()
+
+    def cancel(self):
+        """Drop a pending redraw without running it."""
+        if self._pending is not None:
+            self._widget.after_cancel(self._pending)
+            self._pending = None
+
+    def _run(self):
+        """Perform the redraw and update the bookkeeping."""
+        self._pending  = None
+        self._last_run = time.perf_counter()
+        self.executed += 1
+        self._callback()
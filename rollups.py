@@ -0,0 +1,185 @@
+import os
+import json
+from collections.abc import Iterable
+from models import month_key
+
+VERSION = 1
+
+
+class RollupIndex:
+    """
+    Spending totals per (month, category) and per (month, place).
+
+    Each bucket holds [cents, count]. The index is attached to the
+    ExpenseStore as a secondary index, so every add, edit and delete
+    adjusts two buckets in O(1) and the summaries never need a scan of the
+    ledger; every query is O(number of buckets).
+
+    Buckets whose count drops to zero are removed, so the index only
+    contains months, categories and places that still have expenses.
+    """
+
+    def __init__(self):
+        self.categories: dict[tuple[str, str], list[int]] = {}  # (month, category) -> [cents, count]
+        self.places:     dict[tuple[str, str], list[int]] = {}  # (month, place) -> [cents, count]
+
+    # === Building ===
+    @classmethod
+    def from_rows(
+        cls, rows: Iterable[tuple[int, int, int, str, str]]
+    ) -> "RollupIndex":
+        """
+        Build the index in one pass.
+
+        Args:
+            rows: Expenses as (ID, day ordinal, cents, category, place),
+                e.g. from ``ExpenseStore.rows()``.
+        """
+        index = cls()
+        for _, day, cents, category, place in rows:
+            index._bump(month_key(day), category, place, cents, 1)
+        return index
+
+    @classmethod
+    def summarize(cls, rows, month: str) -> dict:
+        """Return the ``month_summary`` of one month's rows."""
+        return cls.from_rows(rows).month_summary(month)
+
+    def copy(self) -> "RollupIndex":
+        """Return an independent copy (O(buckets))."""
+        index = RollupIndex()
+        index.categories = {k: b[:] for k, b in self.categories.items()}
+        index.places     = {k: b[:] for k, b in self.places.items()}
+        return index
+
+    # === Store Events ===
+    def on_add(self, eid: int, day: int, cents: int, category: str, place: str) -> None:
+        """Count a new or edited expense."""
+        self._bump(month_key(day), category, place, cents, 1)
+
+    def on_remove(self, eid: int, day: int, cents: int, category: str, place: str) -> None:
+        """Uncount a deleted expense, or the old values of an edited one."""
+        self._bump(month_key(day), category, place, -cents, -1)
+
+    def _bump(self, month: str, category: str, place: str, cents: int, count: int) -> None:
+        """Add to the category and place buckets of a month."""
+        for table, key in ((self.categories, (month, category)),
+                           (self.places, (month, place))):
+            bucket = table.get(key)
+            if bucket is None:
+                bucket = table[key] = [0, 0]
+            bucket[0] += cents
+            bucket[1] += count
+            if not bucket[1]:
+                del table[key]
+
+    # === Per-Month Summaries (partitioned storage) ===
+    def month_summary(self, month: str) -> dict:
+        """
+        Return the buckets of one month in a JSON-friendly form.
+
+        Returns:
+            {"categories": {name: [cents, count]}, "places": {name: [cents, count]}}
+        """
+        return {
+            "categories": {c: b[:] for (m, c), b in self.categories.items() if m == month},
+            "places":     {p: b[:] for (m, p), b in self.places.items() if m == month},
+        }
+
+    def add_month_summary(self, month: str, summary: dict, sign: int = 1) -> None:
+        """
+        Add (or with sign=-1, subtract) a summary from ``month_summary``.
+
+        Lets partitioned storage count months that are not loaded.
+        """
+        for table, names in ((self.categories, summary.get("categories", {})),
+                             (self.places, summary.get("places", {}))):
+            for name, (cents, count) in names.items():
+                bucket = table.get((month, name))
+                if bucket is None:
+                    bucket = table[(month, name)] = [0, 0]
+                bucket[0] += sign * cents
+                bucket[1] += sign * count
+                if not bucket[1]:
+                    del table[(month, name)]
+
+    # === Queries ===
+    def months(self) -> list[str]:
+        """Months that have expenses, oldest first."""
+        return sorted({m for m, _ in self.categories})
+
+    def month_totals(self) -> dict[str, tuple[int, int]]:
+        """Return {month: (cents, count)}, oldest month first."""
+        totals: dict[str, list[int]] = {}
+        for (month, _), (cents, count) in sorted(self.categories.items()):
+            t = totals.setdefault(month, [0, 0])
+            t[0] += cents
+            t[1] += count
+        return {m: (c, n) for m, (c, n) in totals.items()}
+
+    def category_totals(self, month: str | None = None) -> dict[str, tuple[int, int]]:
+        """Return {category: (cents, count)} for one month, or for all months."""
+        return self._totals(self.categories, month)
+
+    def place_totals(self, month: str | None = None) -> dict[str, tuple[int, int]]:
+        """Return {place: (cents, count)} for one month, or for all months."""
+        return self._totals(self.places, month)
+
+    @staticmethod
+    def _totals(table: dict, month: str | None) -> dict[str, tuple[int, int]]:
+        """Sum a bucket table by name, optionally for one month only."""
+        totals: dict[str, list[int]] = {}
+        for (m, name), (cents, count) in table.items():
+            if month is None or m == month:
+                t = totals.setdefault(name, [0, 0])
+                t[0] += cents
+                t[1] += count
+        return {name: (c, n) for name, (c, n) in totals.items()}
+
+    # === Persistence ===
+    def save(self, path: str, source_path: str) -> None:
+        """
+        Atomically write the index next to the data file it summarizes.
+
+        The size and modification time of `source_path` are recorded, so
+        the file is only trusted while the data file is unchanged.
+        """
+        st = os.stat(source_path)
+        data = {
+            "version": VERSION,
+            "source": [st.st_size, st.st_mtime_ns],
+            "categories": [[m, c, *b] for (m, c), b in self.categories.items()],
+            "places":     [[m, p, *b] for (m, p), b in self.places.items()],
+        }
+
+        tmp_file = path + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+
+    @classmethod
+    def load(cls, path: str, source_path: str) -> "RollupIndex | None":
+        """
+        Read an index written by ``save``.
+
+        Returns:
+            The index, or None if the file is missing, unreadable, from
+            another version, or older than the data file.
+        """
+        try:
+            st = os.stat(source_path)
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if (data.get("version") != VERSION
+                or data.get("source") != [st.st_size, st.st_mtime_ns]):
+            return None
+
+        index = cls()
+        index.categories = {(m, c): [cents, n] for m, c, cents, n in data["categories"]}
+        index.places     = {(m, p): [cents, n] for m, p, cents, n in data["places"]}
+        return index
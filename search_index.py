@@ -0,0 +1,351 @@
+import re
+from calendar import monthrange
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date
+from duplicates import normalize_place
+from sortedlist import SortedList
+
+# === Query Syntax ===
+# Words match places by word prefix ("lid" finds "LIDL Berlin"); all words
+# must match. Filters can be mixed in freely:
+#   cat:Food / category:Food       category (case-insensitive)
+#   date:2024 / date:2024-03 / date:2024-03-15 (also year:, month:, 03.2024)
+#   >50  >=50  <100  <=100  =12.50  50..100   amount in euros
+# Example: "lidl cat:food month:2024-03 >50"
+
+_AMOUNT = r"\d+(?:[.,]\d{1,2})?"
+_COMPARE = re.compile(rf"(<=|>=|<|>|=)({_AMOUNT})")
+_BETWEEN = re.compile(rf"({_AMOUNT})\.\.({_AMOUNT})")
+
+_ID_SPAN = 1 << 40  # Sorted keys pack (value, ID) as value * _ID_SPAN + ID
+_ROW_COST = 20      # Checking one expense costs about as much as collecting this many IDs
+
+_place_words: dict[str, tuple[str, ...]] = {}  # Memoized place -> words
+
+
+def place_words(place: str) -> tuple[str, ...]:
+    """Split a place into normalized words ("LIDL Berlin." -> ("lidl", "berlin"))."""
+    words = _place_words.get(place)
+    if words is None:
+        words = tuple(normalize_place(place).split())
+        if len(_place_words) < 100_000:
+            _place_words[place] = words
+    return words
+
+
+def _cents(text: str) -> int:
+    """Parse a euro amount of the query ("12,5" -> 1250)."""
+    return round(float(text.replace(",", ".")) * 100)
+
+
+def _date_bucket(text: str) -> tuple[int, int]:
+    """
+    Parse a year, month or day into its first and last day ordinal.
+
+    Accepts YYYY, YYYY-MM, YYYY-MM-DD, MM.YYYY and DD.MM.YYYY.
+
+    Raises:
+        ValueError: If the text is not such a date.
+    """
+    parts = text.split(".")[::-1] if "." in text else text.split("-")
+    try:
+        nums = [int(p) for p in parts]
+        if len(nums) == 1:
+            return date(nums[0], 1, 1).toordinal(), date(nums[0], 12, 31).toordinal()
+        if len(nums) == 2:
+            year, month = nums
+            last = monthrange(year, month)[1]
+            return date(year, month, 1).toordinal(), date(year, month, last).toordinal()
+        if len(nums) == 3:
+            day = date(*nums).toordinal()
+            return day, day
+    except ValueError:
+        pass
+    raise ValueError(f"Unknown date: {text}")
+
+
+@dataclass
+class Query:
+    """
+    A parsed search: place words plus optional category, date and amount filters.
+
+    Ranges are inclusive. An empty query matches everything.
+    """
+    words: list[str] = field(default_factory=list)  # Normalized place word prefixes
+    category: str | None = None                     # Case-folded category
+    first_day: int | None = None                    # Date range as day ordinals
+    last_day:  int | None = None
+    min_cents: int | None = None                    # Amount range in cents
+    max_cents: int | None = None
+
+    def __bool__(self) -> bool:
+        return bool(self.words) or any(
+            v is not None for v in (
+                self.category, self.first_day, self.last_day,
+                self.min_cents, self.max_cents
+            )
+        )
+
+    def matches(self, row: tuple[int, int, int, str, str]) -> bool:
+        """
+        Test one expense without any index (O(1)).
+
+        Args:
+            row: (ID, day ordinal, cents, category, place), e.g. from
+                ``ExpenseStore.row``.
+        """
+        _, day, cents, category, place = row
+        if self.category is not None and category.casefold() != self.category:
+            return False
+        if self.first_day is not None and day < self.first_day:
+            return False
+        if self.last_day is not None and day > self.last_day:
+            return False
+        if self.min_cents is not None and cents < self.min_cents:
+            return False
+        if self.max_cents is not None and cents > self.max_cents:
+            return False
+        if self.words:
+            have = place_words(place)
+            return all(any(w.startswith(word) for w in have) for word in self.words)
+        return True
+
+
+def parse_query(text: str) -> Query:
+    """
+    Parse search bar text (see the syntax above).
+
+    Raises:
+        ValueError: If a filter is malformed, with a message for the user.
+    """
+    query = Query()
+    words = []
+
+    def narrow_days(first: int, last: int) -> None:
+        if query.first_day is None or first > query.first_day:
+            query.first_day = first
+        if query.last_day is None or last < query.last_day:
+            query.last_day = last
+
+    def narrow_cents(low: int | None, high: int | None) -> None:
+        if low is not None and (query.min_cents is None or low > query.min_cents):
+            query.min_cents = low
+        if high is not None and (query.max_cents is None or high < query.max_cents):
+            query.max_cents = high
+
+    for token in text.split():
+        key, sep, value = token.partition(":")
+        key = key.casefold()
+
+        if sep and key in ("cat", "category"):
+            if not value:
+                raise ValueError("Enter a category after cat:")
+            query.category = value.casefold()
+        elif sep and key in ("date", "month", "year"):
+            narrow_days(*_date_bucket(value))
+        elif m := _COMPARE.fullmatch(token):
+            op, cents = m.group(1), _cents(m.group(2))
+            if op == "=":
+                narrow_cents(cents, cents)
+            elif op[0] == ">":
+                narrow_cents(cents if op == ">=" else cents + 1, None)
+            else:
+                narrow_cents(None, cents if op == "<=" else cents - 1)
+        elif m := _BETWEEN.fullmatch(token):
+            narrow_cents(_cents(m.group(1)), _cents(m.group(2)))
+        elif re.fullmatch(r"\d{1,2}\.\d{4}|\d{1,2}\.\d{1,2}\.\d{4}", token):
+            narrow_days(*_date_bucket(token))
+        else:
+            words.append(token)
+
+    # Place words are normalized like the indexed places ("mc-donalds" -> "mc", "donalds")
+    query.words = list(place_words(" ".join(words)))
+    return query
+
+
+class SearchIndex:
+    """
+    Inverted and sorted indexes for searching expenses.
+
+    - place words -> places -> expense IDs (inverted index; word prefixes
+      are found by binary search over the sorted vocabulary)
+    - category -> expense IDs
+    - dates and amounts: sorted (value, ID) keys, so a date bucket or
+      amount range is found in O(log n) and its size is known before any
+      ID is touched
+
+    A search starts from the most selective filter and checks the other
+    filters only on its candidates, so its cost follows the size of the
+    smallest filter instead of the ledger.
+
+    Attached to the ExpenseStore as a secondary index. It is built on the
+    first search, so it costs nothing until the search bar is used; from
+    then on adds, edits and deletes are applied as they happen.
+    """
+
+    def __init__(self, store):
+        """
+        Args:
+            store (ExpenseStore): The store to index.
+        """
+        self._store = store
+        self._built = False
+        self._places:     dict[str, set[int]] = {}  # Place -> expense IDs
+        self._words:      dict[str, set[str]] = {}  # Place word -> places
+        self._vocabulary = SortedList()             # All place words
+        self._categories: dict[str, set[int]] = {}  # Case-folded category -> expense IDs
+        self._days    = SortedList()                # day * _ID_SPAN + ID
+        self._amounts = SortedList()                # cents * _ID_SPAN + ID
+
+    def _ensure_built(self) -> None:
+        """Index every expense of the store (once, on the first search)."""
+        if self._built:
+            return
+        self._built = True
+
+        days, amounts = [], []
+        places, categories = self._places, self._categories
+        for eid, day, cents, category, place in self._store.rows():
+            ids = places.get(place)
+            if ids is None:
+                ids = places[place] = set()
+                self._add_words(place)
+            ids.add(eid)
+            categories.setdefault(category.casefold(), set()).add(eid)
+            days.append(day * _ID_SPAN + eid)
+            amounts.append(cents * _ID_SPAN + eid)
+
+        # One sort each instead of a million inserts
+        self._days    = SortedList(days)
+        self._amounts = SortedList(amounts)
+
+    def _add_words(self, place: str) -> None:
+        for word in place_words(place):
+            owners = self._words.get(word)
+            if owners is None:
+                owners = self._words[word] = set()
+                self._vocabulary.add(word)
+            owners.add(place)
+
+    def _remove_words(self, place: str) -> None:
+        for word in place_words(place):
+            owners = self._words.get(word)
+            if owners is None:
+                continue
+            owners.discard(place)
+            if not owners:
+                del self._words[word]
+                self._vocabulary.discard(word)
+
+    # === Store Events ===
+    def on_add(self, eid: int, day: int, cents: int, category: str, place: str) -> None:
+        """Index a new expense, or the new values of an edited one."""
+        if not self._built:
+            return
+        ids = self._places.get(place)
+        if ids is None:
+            ids = self._places[place] = set()
+            self._add_words(place)
+        ids.add(eid)
+        self._categories.setdefault(category.casefold(), set()).add(eid)
+        self._days.add(day * _ID_SPAN + eid)
+        self._amounts.add(cents * _ID_SPAN + eid)
+
+    def on_remove(self, eid: int, day: int, cents: int, category: str, place: str) -> None:
+        """Unindex a deleted expense, or the old values of an edited one."""
+        if not self._built:
+            return
+        ids = self._places.get(place)
+        if ids is not None:
+            ids.discard(eid)
+            if not ids:
+                del self._places[place]
+                self._remove_words(place)
+        key = category.casefold()
+        ids = self._categories.get(key)
+        if ids is not None:
+            ids.discard(eid)
+            if not ids:
+                del self._categories[key]
+        self._days.discard(day * _ID_SPAN + eid)
+        self._amounts.discard(cents * _ID_SPAN + eid)
+
+    # === Queries ===
+    def _places_for(self, words: list[str]) -> set[str]:
+        """Places having, for every word, a word that starts with it."""
+        found = None
+        for word in words:
+            owners = set()
+            for w in self._vocabulary.irange(word, word + "\U0010ffff"):
+                owners |= self._words[w]
+            found = owners if found is None else found & owners
+            if not found:
+                break
+        return found
+
+    def search(self, query: Query) -> set[int] | None:
+        """
+        Find the expenses matching a query.
+
+        Returns:
+            The matching expense IDs, or None for an empty query (all match).
+        """
+        if not query:
+            return None
+        self._ensure_built()
+
+        # (estimated size, producer of candidate IDs) per filter
+        filters = []
+        if query.words:
+            # All words must match the same place, so they are combined per
+            # place before any expense ID is touched
+            places = self._places_for(query.words)
+            filters.append((
+                sum(len(self._places[p]) for p in places),
+                lambda: set().union(*(self._places[p] for p in places))
+            ))
+        if query.category is not None:
+            ids = self._categories.get(query.category, set())
+            filters.append((len(ids), lambda: ids))
+        for low, high, keys in (
+            (query.first_day, query.last_day, self._days),
+            (query.min_cents, query.max_cents, self._amounts),
+        ):
+            if low is None and high is None:
+                continue
+            lo = None if low is None else low * _ID_SPAN
+            hi = None if high is None else (high + 1) * _ID_SPAN
+            filters.append((
+                keys.count_range(lo, hi),
+                lambda lo=lo, hi=hi, keys=keys: {k % _ID_SPAN for k in keys.irange(lo, hi)}
+            ))
+
+        # Start from the smallest candidate set and intersect it with the
+        # next ones while building them is cheaper than checking the
+        # remaining candidates one expense at a time
+        filters.sort(key=lambda f: f[0])
+        size, produce = filters[0]
+        if not size:
+            return set()
+        found = set(produce())
+        for size, produce in filters[1:]:
+            if not found:
+                break
+            if size > _ROW_COST * len(found):
+                row, matches = self._store.row, query.matches
+                found = {eid for eid in found if matches(row(eid))}
+                break
+            found &= produce()
+        return found
+
+    def facet_counts(self, eids: set[int]) -> Counter:
+        """Number of matching expenses per category (one set intersection each)."""
+        self._ensure_built()
+        counts = Counter()
+        for ids in self._categories.values():
+            n = len(ids & eids)
+            if n:
+                # Report the category as stored, not case-folded
+                counts[self._store.row(next(iter(ids)))[3]] = n
+        return counts
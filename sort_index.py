@@ -0,0 +1,121 @@
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from sortedlist import SortedList
+
+_ID_SPAN = 1 << 40  # Integer keys pack (value, ID) as value * _ID_SPAN + ID
+
+COLUMNS = ("date", "amount", "category", "place")  # Sortable columns
+
+
+def _key(column: str, eid: int, day: int, cents: int, category: str, place: str):
+    """
+    Sort key of an expense for a column. The expense ID is part of every
+    key, so keys are unique and ties keep the order the expenses were added.
+    """
+    if column == "date":
+        return day * _ID_SPAN + eid
+    if column == "amount":
+        return cents * _ID_SPAN + eid
+    if column == "category":
+        return category.casefold(), day, eid  # Newest last within a category
+    return place.casefold(), day, eid
+
+
+def _eid_of(key) -> int:
+    """Expense ID of a sort key."""
+    return key % _ID_SPAN if isinstance(key, int) else key[-1]
+
+
+class SortedView(Sequence):
+    """
+    Read-only, live sequence of expense IDs in a maintained sort order.
+
+    Reading position i is O(log n) and the view follows every change of
+    the underlying order, so the table never re-sorts or moves rows: it
+    just reads the positions on screen.
+    """
+
+    def __init__(self, order: SortedList, descending: bool = False):
+        """
+        Args:
+            order: Sort keys, kept current by the SortIndex.
+            descending: Read the order back to front.
+        """
+        self._order = order
+        self.descending = descending
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __getitem__(self, index: int) -> int:
+        if index < 0:
+            index += len(self._order)
+        if self.descending:
+            index = len(self._order) - 1 - index
+        if index < 0:
+            raise IndexError("view index out of range")
+        return _eid_of(self._order[index])
+
+    def __iter__(self) -> Iterator[int]:
+        keys = reversed(self._order) if self.descending else iter(self._order)
+        return map(_eid_of, keys)
+
+
+class SortIndex:
+    """
+    Maintained sort orders of the expenses, one per table column.
+
+    Each order is a SortedList of unique keys, built on the first sort by
+    that column (O(n log n), once) and from then on updated in O(log n)
+    by every add, edit and delete, like the other secondary indexes
+    attached to the ExpenseStore. Switching the table between columns or
+    directions is then free: it only reads the rows on screen.
+    """
+
+    def __init__(self, store):
+        """
+        Args:
+            store (ExpenseStore): The store to sort.
+        """
+        self._store = store
+        self._orders: dict[str, SortedList] = {}  # Column -> sort keys (built columns only)
+
+    # === Store Events ===
+    def on_add(self, eid: int, day: int, cents: int, category: str, place: str) -> None:
+        """Insert a new expense, or the new values of an edited one, into each order."""
+        for column, order in self._orders.items():
+            order.add(_key(column, eid, day, cents, category, place))
+
+    def on_remove(self, eid: int, day: int, cents: int, category: str, place: str) -> None:
+        """Remove a deleted expense, or the old values of an edited one, from each order."""
+        for column, order in self._orders.items():
+            order.discard(_key(column, eid, day, cents, category, place))
+
+    # === Queries ===
+    def order(self, column: str) -> SortedList:
+        """
+        Return the maintained order of a column, building it on first use.
+
+        Raises:
+            ValueError: If the column is not sortable.
+        """
+        order = self._orders.get(column)
+        if order is None:
+            if column not in COLUMNS:
+                raise ValueError(f"Unknown sort column: {column}")
+            order = self._orders[column] = SortedList(
+                _key(column, *row) for row in self._store.rows()
+            )
+        return order
+
+    def view(self, column: str, descending: bool = False) -> SortedView:
+        """All expenses ordered by a column, as a live sequence of IDs."""
+        return SortedView(self.order(column), descending)
+
+    def key_func(self, column: str) -> Callable[[int], object]:
+        """Sort key of an expense ID by a column (for sorting a subset)."""
+        row = self._store.row
+        return lambda eid: _key(column, *row(eid))
+
+    def sort(self, eids: Iterable[int], column: str, descending: bool = False) -> list[int]:
+        """Order some expenses (e.g. search results) by a column in O(m log m)."""
+        return sorted(eids, key=self.key_func(column), reverse=descending)
@@ -0,0 +1,176 @@
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable, Iterator
+from itertools import accumulate, chain, islice
+
+
+class SortedList:
+    """
+    A list kept in sorted order, for indexes that change one value at a time.
+
+    Values are stored in a list of sorted sublists of at most 2 * `load`
+    values, with the maximum of each sublist kept for binary search. Adding
+    or removing a value is a binary search plus a short list insert or
+    delete, so it stays fast at millions of values, where a flat list
+    would move half the values on every change.
+
+    Positional access (``sl[i]``, ``bisect_left``, ``islice``) uses the
+    running offsets of the sublists, rebuilt lazily after changes in
+    O(number of sublists).
+    """
+
+    def __init__(self, values: Iterable = (), load: int = 1000):
+        """
+        Args:
+            values: Initial values (sorted once, in O(n log n)).
+            load: Target sublist length.
+        """
+        self._load = load
+        self._lists: list[list] = []
+        self._maxes: list = []
+        self._offsets: list[int] | None = None  # Start position of each sublist
+        self._len = 0
+
+        values = sorted(values)
+        for i in range(0, len(values), load):
+            chunk = values[i:i + load]
+            self._lists.append(chunk)
+            self._maxes.append(chunk[-1])
+        self._len = len(values)
+
+    # === Changes ===
+    def add(self, value) -> None:
+        """Insert a value, keeping the order (O(log n + load))."""
+        lists, maxes = self._lists, self._maxes
+        self._len += 1
+        self._offsets = None
+
+        if not lists:
+            lists.append([value])
+            maxes.append(value)
+            return
+
+        pos = bisect_left(maxes, value)
+        if pos == len(maxes):
+            pos -= 1
+            lists[pos].append(value)
+            maxes[pos] = value
+        else:
+            insort(lists[pos], value)
+
+        # Split sublists that grew too long
+        if len(lists[pos]) > 2 * self._load:
+            sub = lists[pos]
+            half = len(sub) // 2
+            lists[pos:pos + 1] = [sub[:half], sub[half:]]
+            maxes[pos:pos + 1] = [sub[half - 1], sub[-1]]
+
+    def remove(self, value) -> None:
+        """
+        Remove one occurrence of a value (O(log n + load)).
+
+        Raises:
+            ValueError: If the value is not in the list.
+        """
+        if not self.discard(value):
+            raise ValueError(f"{value!r} not in list")
+
+    def discard(self, value) -> bool:
+        """Remove one occurrence of a value if present; True if it was."""
+        lists, maxes = self._lists, self._maxes
+        pos = bisect_left(maxes, value)
+        if pos == len(maxes):
+            return False
+        sub = lists[pos]
+        i = bisect_left(sub, value)
+        if sub[i] != value:
+            return False
+
+        del sub[i]
+        self._len -= 1
+        self._offsets = None
+        if not sub:
+            del lists[pos]
+            del maxes[pos]
+        elif i == len(sub):
+            maxes[pos] = sub[-1]
+        return True
+
+    # === Positions ===
+    def _locate(self, index: int) -> tuple[int, int]:
+        """Return (sublist, position in it) of a global position."""
+        offsets = self._offsets
+        if offsets is None:
+            offsets = self._offsets = [0, *accumulate(map(len, self._lists))][:-1]
+        pos = bisect_right(offsets, index) - 1
+        return pos, index - offsets[pos]
+
+    def _position(self, pos: int, i: int) -> int:
+        """Return the global position of sublist `pos`, index `i`."""
+        if pos == len(self._lists):
+            return self._len
+        self._locate(0)  # Make sure the offsets exist
+        return self._offsets[pos] + i
+
+    def bisect_left(self, value) -> int:
+        """Position where `value` would be inserted before equal values."""
+        pos = bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            return self._len
+        return self._position(pos, bisect_left(self._lists[pos], value))
+
+    def bisect_right(self, value) -> int:
+        """Position where `value` would be inserted after equal values."""
+        pos = bisect_right(self._maxes, value)
+        if pos == len(self._maxes):
+            return self._len
+        return self._position(pos, bisect_right(self._lists[pos], value))
+
+    def islice(self, start: int = 0, stop: int | None = None) -> Iterator:
+        """Iterate over the values at positions [start, stop) without copying the rest."""
+        start = max(0, start)
+        stop = self._len if stop is None else min(stop, self._len)
+        if start >= stop:
+            return iter(())
+        pos, i = self._locate(start)
+        values = chain(islice(self._lists[pos], i, None), *self._lists[pos + 1:])
+        return islice(values, stop - start)
+
+    def _span(self, low, high) -> tuple[int, int]:
+        """Positions of the values v with low <= v < high (None = unbounded)."""
+        start = 0 if low is None else self.bisect_left(low)
+        stop = self._len if high is None else self.bisect_left(high)
+        return start, stop
+
+    def irange(self, low=None, high=None) -> Iterator:
+        """Iterate over the values v with low <= v < high (None = unbounded)."""
+        return self.islice(*self._span(low, high))
+
+    def count_range(self, low=None, high=None) -> int:
+        """Number of values v with low <= v < high (O(log n); None = unbounded)."""
+        start, stop = self._span(low, high)
+        return max(0, stop - start)
+
+    # === Sequence Interface ===
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("SortedList index out of range")
+        pos, i = self._locate(index)
+        return self._lists[pos][i]
+
+    def __contains__(self, value) -> bool:
+        pos = bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            return False
+        sub = self._lists[pos]
+        return sub[bisect_left(sub, value)] == value
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator:
+        return chain.from_iterable(self._lists)
+
+    def __reversed__(self) -> Iterator:
+        return chain.from_iterable(map(reversed, reversed(self._lists)))
@@ -0,0 +1,307 @@
+import os
+import sqlite3
+from collections.abc import Iterable
+from datetime import date
+from config import (
+    SQLITE_FILE, DATA_FILE, JOURNAL_FILE, ROTATED_JOURNAL_FILE, SNAPSHOT_FILE,
+    ROLLUP_FILE
+)
+from models import InitialChange, Expense, to_cents
+from expense_store import ExpenseStore
+
+# === Database Schema ===
+# Dates are stored as ISO strings (sortable), amounts as integer cents (exact)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS initial_changes (
+    seq          INTEGER PRIMARY KEY,
+    date         TEXT    NOT NULL,
+    amount_cents INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS expenses (
+    id           INTEGER PRIMARY KEY,
+    date         TEXT    NOT NULL,
+    amount_cents INTEGER NOT NULL,
+    category     TEXT    NOT NULL,
+    place        TEXT    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_expenses_date     ON expenses(date);
+CREATE INDEX IF NOT EXISTS idx_expenses_category ON expenses(category);
+CREATE INDEX IF NOT EXISTS idx_expenses_place    ON expenses(place);
+"""
+
+# Bumped once the CSV data has been imported, so migration runs only once
+SCHEMA_VERSION = 1
+
+_conn: sqlite3.Connection | None = None  # Lazily opened shared connection
+
+# === Connection Handling ===
+def _connect() -> sqlite3.Connection:
+    """
+    Open (or reuse) the database connection, creating the schema and
+    migrating the existing CSV data on first use.
+
+    Returns:
+        The shared sqlite3 connection.
+    """
+    global _conn
+    if _conn is not None:
+        return _conn
+
+    _conn = sqlite3.connect(SQLITE_FILE)
+    _conn.execute("PRAGMA journal_mode=WAL")    # Cheap, crash-safe commits
+    _conn.execute("PRAGMA synchronous=NORMAL")
+    _conn.executescript(SCHEMA)
+
+    version = _conn.execute("PRAGMA user_version").fetchone()[0]
+    if version < SCHEMA_VERSION:
+        migrate_from_csv()
+
+    return _conn
+
+def close() -> None:
+    """Close the shared connection (it is reopened on next use)."""
+    global _conn
+    if _conn is not None:
+        _conn.close()
+        _conn = None
+
+# === Row Conversion ===
+def _expense_row(eid: int, exp: Expense) -> tuple:
+    """Build the expenses table row for an Expense."""
+    return (
+        eid, exp.date.isoformat(), to_cents(exp.amount),
+        exp.category, exp.place
+    )
+
+def _change_row(seq: int, change: InitialChange) -> tuple:
+    """Build the initial_changes table row for an InitialChange."""
+    return (seq, change.date.isoformat(), to_cents(change.amount))
+
+_iso_dates: dict[int, str] = {}  # Memoized day ordinal -> ISO date string
+
+def _iso_date(day: int) -> str:
+    """Convert a day ordinal to an ISO date string."""
+    iso = _iso_dates.get(day)
+    if iso is None:
+        iso = _iso_dates[day] = date.fromordinal(day).isoformat()
+    return iso
+
+# === One-Shot CSV Migration ===
+def migrate_from_csv(csv_path: str | None = None) -> int:
+    """
+    Import the CSV snapshot (and its journal) into the database.
+
+    Runs automatically the first time the database is opened; afterwards
+    the CSV file is left untouched (as a backup) and no longer read. The
+    replayed journals are moved aside and the CSV caches are deleted.
+
+    Args:
+        csv_path: Path of the CSV data file to import (default: DATA_FILE).
+
+    Returns:
+        The number of expenses imported.
+    """
+    import storage  # Local import: storage dispatches back to this module
+
+    if csv_path is None:
+        csv_path = DATA_FILE
+
+    conn = _connect() if _conn is None else _conn
+
+    count = 0
+    if os.path.exists(csv_path):
+        initial_changes, _, expenses = storage.load_csv(csv_path)
+        _replace_all(conn, initial_changes, expenses)
+        count = len(expenses)
+        _retire_csv_files()
+
+    with conn:
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    return count
+
+def _retire_csv_files() -> None:
+    """
+    Keep the replayed journals as "<name>.migrated", so selecting the CSV
+    backend again never replays them twice, and delete the binary snapshot
+    and rollup caches of the CSV file.
+    """
+    for path in (ROTATED_JOURNAL_FILE, JOURNAL_FILE):
+        if os.path.exists(path):
+            os.replace(path, path + ".migrated")
+    for path in (SNAPSHOT_FILE, ROLLUP_FILE):
+        if os.path.exists(path):
+            os.remove(path)
+
+# === Save Data ===
+def _replace_all(
+    conn: sqlite3.Connection,
+    initial_changes: list[InitialChange],
+    expenses: ExpenseStore
+) -> None:
+    """Replace the whole database contents in a single transaction."""
+    with conn:
+        conn.execute("DELETE FROM initial_changes")
+        conn.execute("DELETE FROM expenses")
+        conn.executemany(
+            "INSERT INTO initial_changes VALUES (?, ?, ?)",
+            (_change_row(i, ch) for i, ch in enumerate(initial_changes))
+        )
+        conn.executemany(
+            "INSERT INTO expenses VALUES (?, ?, ?, ?, ?)",
+            (
+                (eid, _iso_date(day), cents, cat, plc)
+                for eid, day, cents, cat, plc in expenses.rows()
+            )
+        )
+
+def save_data(
+    initial_changes: list[InitialChange],
+    expenses: ExpenseStore
+) -> None:
+    """
+    Replace the stored data with a full snapshot.
+
+    Args:
+        initial_changes: List of InitialChange objects.
+        expenses: Store of all expenses.
+    """
+    _replace_all(_connect(), initial_changes, expenses)
+
+# === Single-Row Changes ===
+def record_add(eid: int, exp: Expense) -> None:
+    """Insert (or overwrite) one expense row."""
+    conn = _connect()
+    with conn:
+        conn.execute(
+            """INSERT INTO expenses VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT(id) DO UPDATE SET
+                   date = excluded.date,
+                   amount_cents = excluded.amount_cents,
+                   category = excluded.category,
+                   place = excluded.place""",
+            _expense_row(eid, exp)
+        )
+
+def record_adds(items: Iterable[tuple[int, Expense]]) -> None:
+    """Insert (or overwrite) many expense rows in a single transaction."""
+    conn = _connect()
+    with conn:
+        conn.executemany(
+            """INSERT INTO expenses VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT(id) DO UPDATE SET
+                   date = excluded.date,
+                   amount_cents = excluded.amount_cents,
+                   category = excluded.category,
+                   place = excluded.place""",
+            (_expense_row(eid, exp) for eid, exp in items)
+        )
+
+# An edit is the same single-row upsert as an add
+record_edit = record_add
+
+def record_delete(eid: int) -> None:
+    """Delete one expense row."""
+    conn = _connect()
+    with conn:
+        conn.execute("DELETE FROM expenses WHERE id = ?", (eid,))
+
+def record_deletes(eids: list[int]) -> None:
+    """Delete several expense rows in a single transaction."""
+    conn = _connect()
+    with conn:
+        conn.executemany(
+            "DELETE FROM expenses WHERE id = ?", ((eid,) for eid in eids)
+        )
+
+def record_initial_change(index: int, change: InitialChange) -> None:
+    """Insert (or overwrite) the initial change at the given history position."""
+    conn = _connect()
+    with conn:
+        conn.execute(
+            """INSERT INTO initial_changes VALUES (?, ?, ?)
+               ON CONFLICT(seq) DO UPDATE SET
+                   date = excluded.date,
+                   amount_cents = excluded.amount_cents""",
+            _change_row(index, change)
+        )
+
+def record_initial_truncate(length: int) -> None:
+    """Delete every initial change from the given history position on."""
+    conn = _connect()
+    with conn:
+        conn.execute("DELETE FROM initial_changes WHERE seq >= ?", (length,))
+
+# === Load Data ===
+def query_expenses(
+    start: date | None = None,
+    end: date | None = None,
+    category: str | None = None,
+    place: str | None = None
+) -> ExpenseStore:
+    """
+    Load only the expenses matching the given filters, using the indexes.
+
+    Args:
+        start: Earliest date to include (inclusive), or None.
+        end: Latest date to include (inclusive), or None.
+        category: Exact category to match, or None.
+        place: Exact place to match, or None.
+
+    Returns:
+        ExpenseStore with the matching expenses, in ID order.
+    """
+    clauses, params = [], []
+    if start is not None:
+        clauses.append("date >= ?")
+        params.append(start.isoformat())
+    if end is not None:
+        clauses.append("date <= ?")
+        params.append(end.isoformat())
+    if category is not None:
+        clauses.append("category = ?")
+        params.append(category)
+    if place is not None:
+        clauses.append("place = ?")
+        params.append(place)
+
+    sql = "SELECT id, date, amount_cents, category, place FROM expenses"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY id"
+
+    expenses = ExpenseStore()
+    days: dict[str, int] = {}  # Memoized ISO date string -> day ordinal
+    for eid, d, cents, cat, plc in _connect().execute(sql, params):
+        day = days.get(d)
+        if day is None:
+            day = days[d] = date.fromisoformat(d).toordinal()
+        expenses.add_row(eid, day, cents, cat, plc)
+    return expenses
+
+def load_data() -> tuple[list[InitialChange], float, ExpenseStore]:
+    """
+    Load all initial changes and expenses from the database.
+
+    The ledger keeps every expense in memory (balance, indexes, table), so
+    startup reads the whole table through an unfiltered query_expenses();
+    the database speeds up saving, not loading. Use the partitioned backend
+    to load only recent months at startup.
+
+    Returns:
+        A tuple containing:
+        - List of InitialChange objects
+        - Last initial amount (float)
+        - ExpenseStore with all expenses, keyed by stable expense ID
+    """
+    conn = _connect()
+
+    initial_changes = [
+        InitialChange(date.fromisoformat(d), cents / 100)
+        for d, cents in conn.execute(
+            "SELECT date, amount_cents FROM initial_changes ORDER BY seq"
+        )
+    ]
+    last_initial = initial_changes[-1].amount if initial_changes else 0.0
+
+    return initial_changes, last_initial, query_expenses()
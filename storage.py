@@ -1,28 +1,135 @@
 import os
 import csv
-from datetime import datetime
-from config import DATA_FILE
-from models import InitialChange, Expense
+import shutil
+from collections.abc import Iterable
+from datetime import date, datetime
+from config import (
+    DATA_FILE, JOURNAL_FILE, ROTATED_JOURNAL_FILE, JOURNAL_COMPACT_BYTES,
+    STORAGE_BACKEND, SNAPSHOT_FILE, BINARY_SNAPSHOT, ROLLUP_FILE,
+    PLACE_SUGGESTIONS, DUPLICATE_DAYS, DUPLICATE_CENTS,
+    PARALLEL_LOAD, PARALLEL_LOAD_WORKERS, PARALLEL_LOAD_MIN_BYTES
+)
+from models import InitialChange, Expense, to_cents, format_cents
+from expense_store import ExpenseStore
+from rollups import RollupIndex
+from date_index import DateIndex
+from place_index import PlaceIndex
+from duplicates import DuplicateIndex
+from search_index import SearchIndex
+from sort_index import SortIndex
+import binary_snapshot
 
-# === Save Data to CSV ===
+# === Backend Selection ===
+def _sqlite_backend():
+    """
+    Return the SQLite backend module if it is selected in config, else None.
+    Imported lazily so the default CSV backend never touches sqlite3.
+    """
+    if STORAGE_BACKEND == "sqlite":
+        import sqlite_storage
+        return sqlite_storage
+    return None
+
+def _partitioned_backend():
+    """
+    Return the month-partitioned backend module if it is selected in
+    config, else None. It shares the journal with the CSV backend.
+    """
+    if STORAGE_BACKEND == "partitioned":
+        import partitioned_storage
+        return partitioned_storage
+    return None
+
+def uses_journal() -> bool:
+    """True if the configured backend persists changes through the journal."""
+    return _sqlite_backend() is None
+
+# === Save Data ===
 def save_data(
     initial_changes: list[InitialChange],
-    expenses: dict[str, Expense]
+    expenses: ExpenseStore
+) -> None:
+    """
+    Write a full snapshot of initial changes and expenses with the
+    configured backend.
+
+    Args:
+        initial_changes: List of InitialChange objects.
+        expenses: Store of all expenses.
+    """
+    backend = _sqlite_backend()
+    if backend:
+        return backend.save_data(initial_changes, expenses)
+    partitions = _partitioned_backend()
+    if partitions:
+        partitions.save_data(initial_changes, expenses)
+        _clear_journals()
+        return
+    save_csv(initial_changes, expenses)
+
+# === Save Data to CSV ===
+def save_csv(
+    initial_changes: list[InitialChange],
+    expenses: ExpenseStore
 ) -> None:
     """
-    Save initial changes and expenses to a CSV file.
+    Save initial changes and expenses to a CSV snapshot and clear the journal.
 
     Args:
         initial_changes: List of InitialChange objects.
-        expenses: Dictionary of Expense objects keyed by unique identifiers.
+        expenses: Store of all expenses.
+    """
+    _write_data_file(initial_changes, expenses)
+    _clear_journals()
+
+def _write_data_file(
+    initial_changes: list[InitialChange],
+    expenses: ExpenseStore
+) -> None:
     """
-    with open(DATA_FILE, 'w', newline='', encoding='utf-8') as f:
+    Write the CSV data file, followed by its binary snapshot (if enabled)
+    and its rollup index (if the store has one).
+    """
+    write_csv(DATA_FILE, initial_changes, expenses.rows())
+    if BINARY_SNAPSHOT:
+        binary_snapshot.write(SNAPSHOT_FILE, initial_changes, expenses, DATA_FILE)
+
+    rollups = expenses.index("rollups")
+    if rollups is not None:
+        rollups.save(ROLLUP_FILE, DATA_FILE)
+
+def _clear_journals() -> None:
+    """Remove the journals once everything in them is part of a snapshot."""
+    for path in (ROTATED_JOURNAL_FILE, JOURNAL_FILE):
+        if os.path.exists(path):
+            os.remove(path)
+
+def write_csv(
+    path: str,
+    initial_changes: list[InitialChange],
+    rows: Iterable[tuple[int, int, int, str, str]]
+) -> None:
+    """
+    Atomically replace a CSV data file.
+
+    The data is written to a temporary file, flushed to disk and moved
+    into place, so a crash mid-write never leaves a truncated file.
+
+    Args:
+        path: Destination file path.
+        initial_changes: List of InitialChange objects.
+        rows: Expenses as (ID, day ordinal, cents, category, place) tuples,
+            e.g. from ``ExpenseStore.rows()``.
+    """
+    tmp_file = path + ".tmp"
+
+    with open(tmp_file, 'w', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
 
         # Write header row
         writer.writerow([
             'record_type', 'date', 'amount',
-            'category', 'place'
+            'category', 'place', 'id'
         ])
 
         # Write initial change records
@@ -31,63 +138,555 @@ def save_data(
                 'initial_change',
                 ch.date.strftime("%d.%m.%Y"),
                 f"{ch.amount:.2f}",
-                '', ''  # Empty category and place for initial changes
+                '', '', ''  # Empty category, place and ID for initial changes
             ])
 
-        # Write expense records
-        for exp in expenses.values():
-            writer.writerow([
-                'expense',
-                exp.date.strftime("%d.%m.%Y"),
-                f"{exp.amount:.2f}",
-                exp.category,
-                exp.place
-            ])
+        # Write expense records straight from the store's columns
+        date_strings: dict[int, str] = {}  # Memoized day ordinal -> "dd.mm.yyyy"
+        for eid, day, cents, cat, plc in rows:
+            dstr = date_strings.get(day)
+            if dstr is None:
+                dstr = date_strings[day] = date.fromordinal(day).strftime("%d.%m.%Y")
+            writer.writerow(['expense', dstr, format_cents(cents), cat, plc, eid])
+
+        # Make sure the data is on disk before it replaces the old file
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_file, path)
+
+# === Background Snapshots ===
+def capture_snapshot(
+    initial_changes: list[InitialChange],
+    expenses: ExpenseStore
+) -> tuple[list[InitialChange], ExpenseStore, frozenset | None]:
+    """
+    Copy the data for a background save and start a fresh journal.
+
+    Must run on the thread that owns the data. The current journal is moved
+    aside (appended to an existing rotated journal if a previous snapshot
+    never completed), so changes journaled while the snapshot is written
+    are kept even though the snapshot does not contain them.
+
+    Args:
+        initial_changes: List of InitialChange objects.
+        expenses: Store of all expenses.
+
+    Returns:
+        An independent (initial changes, expenses, loaded partitions) copy
+        for write_snapshot; loaded partitions is None unless the
+        partitioned backend is selected.
+    """
+    if os.path.exists(JOURNAL_FILE):
+        if os.path.exists(ROTATED_JOURNAL_FILE):
+            with open(JOURNAL_FILE, 'rb') as src, \
+                    open(ROTATED_JOURNAL_FILE, 'ab') as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(JOURNAL_FILE)
+        else:
+            os.replace(JOURNAL_FILE, ROTATED_JOURNAL_FILE)
+
+    partitions = _partitioned_backend()
+    months = partitions.loaded_months() if partitions else None
+
+    # Copy the rollups along, so the worker never has to rebuild them
+    copy = expenses.snapshot()
+    rollups = expenses.index("rollups")
+    if rollups is not None:
+        copy.attach("rollups", rollups.copy())
+
+    # InitialChange objects are never mutated in place, a shallow copy is enough
+    return list(initial_changes), copy, months
+
+def write_snapshot(
+    snapshot: tuple[list[InitialChange], ExpenseStore, frozenset | None]
+) -> None:
+    """
+    Write a snapshot from capture_snapshot to the data file (safe to run
+    on a worker thread) and drop the journal records it contains.
+
+    Args:
+        snapshot: Copy to persist, from capture_snapshot.
+    """
+    initial_changes, expenses, months = snapshot
+    partitions = _partitioned_backend()
+    if partitions:
+        partitions.save_data(initial_changes, expenses, months)
+    else:
+        _write_data_file(initial_changes, expenses)
+
+    # The rotated journal is now part of the snapshot; the live journal
+    # holds only newer changes and stays
+    if os.path.exists(ROTATED_JOURNAL_FILE):
+        os.remove(ROTATED_JOURNAL_FILE)
+
+# === Journal Compaction Check ===
+def journal_needs_compaction() -> bool:
+    """
+    Check whether the journal has grown large enough to fold into a snapshot.
+
+    Small journals are simply left in place and replayed on the next start,
+    which keeps closing the app O(1) for typical sessions.
+
+    Returns:
+        True if save_data should be called to write a fresh snapshot.
+    """
+    # The SQLite backend commits every change in place; there is no journal
+    if not uses_journal():
+        return False
+    paths = [p for p in (ROTATED_JOURNAL_FILE, JOURNAL_FILE) if os.path.exists(p)]
+
+    # Partitioned saves only rewrite the periods in memory, so any journal
+    # is worth folding in
+    if _partitioned_backend():
+        return bool(paths)
+    size = sum(os.path.getsize(path) for path in paths)
+    return size >= JOURNAL_COMPACT_BYTES
+
+# === Append-Only Journal ===
+def _append_journal(*rows: list) -> None:
+    """
+    Append change records to the journal file in a single write.
+
+    Args:
+        rows: Journal records as [op, key, date, amount, category, place].
+    """
+    with open(JOURNAL_FILE, 'a', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerows(rows)
+
+def record_add(eid: int, exp: Expense) -> None:
+    """Journal a newly added expense."""
+    backend = _sqlite_backend()
+    if backend:
+        return backend.record_add(eid, exp)
+    _append_journal([
+        'add', eid,
+        exp.date.strftime("%d.%m.%Y"),
+        f"{exp.amount:.2f}",
+        exp.category,
+        exp.place
+    ])
+
+def record_adds(items: Iterable[tuple[int, Expense]]) -> None:
+    """
+    Journal many new expenses as one batch (e.g. an import).
+
+    Args:
+        items: (expense ID, Expense) pairs; consumed lazily, so a generator
+            is written out without being materialized.
+    """
+    backend = _sqlite_backend()
+    if backend:
+        return backend.record_adds(items)
+    _append_journal(*(
+        [
+            'add', eid,
+            exp.date.strftime("%d.%m.%Y"),
+            f"{exp.amount:.2f}",
+            exp.category,
+            exp.place
+        ]
+        for eid, exp in items
+    ))
+
+def record_edit(eid: int, exp: Expense) -> None:
+    """Journal the new state of an edited expense."""
+    backend = _sqlite_backend()
+    if backend:
+        return backend.record_edit(eid, exp)
+    _append_journal([
+        'edit', eid,
+        exp.date.strftime("%d.%m.%Y"),
+        f"{exp.amount:.2f}",
+        exp.category,
+        exp.place
+    ])
+
+def record_delete(eid: int) -> None:
+    """Journal the removal of an expense."""
+    backend = _sqlite_backend()
+    if backend:
+        return backend.record_delete(eid)
+    _append_journal(['delete', eid, '', '', '', ''])
+
+def record_deletes(eids: list[int]) -> None:
+    """Journal the removal of several expenses as one batch."""
+    backend = _sqlite_backend()
+    if backend:
+        return backend.record_deletes(eids)
+    _append_journal(*(['delete', eid, '', '', '', ''] for eid in eids))
+
+def record_initial_change(index: int, change: InitialChange) -> None:
+    """
+    Journal an initial amount change.
+
+    The position in the history is stored with the record so replaying the
+    same journal twice never duplicates entries.
+    """
+    backend = _sqlite_backend()
+    if backend:
+        return backend.record_initial_change(index, change)
+    _append_journal([
+        'initial_change', index,
+        change.date.strftime("%d.%m.%Y"),
+        f"{change.amount:.2f}",
+        '', ''
+    ])
+
+def record_initial_truncate(length: int) -> None:
+    """Journal that only the first `length` initial changes remain (undo)."""
+    backend = _sqlite_backend()
+    if backend:
+        return backend.record_initial_truncate(length)
+    _append_journal(['initial_truncate', length, '', '', '', ''])
+
+# === Date Parsing ===
+class DateParser:
+    """
+    Parse "dd.mm.yyyy" strings into dates, memoizing every result.
+
+    Ledgers repeat the same few hundred days over and over, so most calls
+    are a single dict lookup. New strings take a direct slicing fast path
+    and only fall back to strptime for unusual spellings (e.g. "5.9.2025").
+    """
+
+    def __init__(self):
+        self._cache: dict[str, date] = {}
+
+    def __call__(self, dstr: str) -> date:
+        """
+        Args:
+            dstr: Date string in "dd.mm.yyyy" format.
+
+        Returns:
+            The parsed date.
+
+        Raises:
+            ValueError: If the string is not a valid date.
+        """
+        dt = self._cache.get(dstr)
+        if dt is None:
+            if (len(dstr) == 10 and dstr[2] == '.' and dstr[5] == '.'
+                    and dstr[:2].isdigit() and dstr[3:5].isdigit()
+                    and dstr[6:].isdigit()):
+                dt = date(int(dstr[6:]), int(dstr[3:5]), int(dstr[:2]))
+            else:
+                dt = datetime.strptime(dstr, "%d.%m.%Y").date()
+            self._cache[dstr] = dt
+        return dt
+
+def replay_journal(
+    initial_changes: list[InitialChange],
+    expenses: ExpenseStore
+) -> None:
+    """
+    Apply journal records on top of the loaded snapshot, in order: first
+    the journal rotated by an unfinished background save, then the live one.
+
+    Every operation is idempotent, so replaying a journal that was already
+    folded into the snapshot leaves the data unchanged.
+
+    Args:
+        initial_changes: Initial changes loaded from the snapshot (updated in place).
+        expenses: Expenses loaded from the snapshot (updated in place).
+    """
+    parse_date = DateParser()
+
+    for path in (ROTATED_JOURNAL_FILE, JOURNAL_FILE):
+        if os.path.exists(path):
+            _drop_torn_record(path)
+            _replay_file(path, initial_changes, expenses, parse_date)
+
+def _drop_torn_record(path: str) -> None:
+    """
+    Cut off a last record left half-written by a crash.
+
+    Otherwise the next record would be appended to the same line and be
+    lost with it on the following replay.
+    """
+    with open(path, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        while pos > 0:
+            start = max(0, pos - 4096)
+            f.seek(start)
+            block = f.read(pos - start)
+            if pos == end and block.endswith(b'\n'):
+                return  # Complete
+            newline = block.rfind(b'\n')
+            if newline >= 0:
+                f.truncate(start + newline + 1)
+                return
+            pos = start
+        f.truncate(0)  # Not a single complete record
+
+def _replay_file(
+    path: str,
+    initial_changes: list[InitialChange],
+    expenses: ExpenseStore,
+    parse_date: DateParser
+) -> None:
+    """Apply the records of one journal file (see replay_journal)."""
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            # Skip blank or truncated records (e.g. from a crash mid-write)
+            if len(row) < 2:
+                continue
+
+            op = row[0].strip()
+            try:
+                key = int(row[1])
+            except ValueError:
+                continue
+
+            if op == 'delete':
+                expenses.delete(key)
+                continue
+            if op == 'initial_truncate':
+                del initial_changes[key:]
+                continue
+
+            if len(row) < 6:
+                continue
+
+            try:
+                dt = parse_date(row[2].strip())
+                amt = float(row[3].strip())
+                to_cents(amt)  # Rejects inf, nan and absurd amounts
+            except ValueError:
+                continue
+
+            if op in ('add', 'edit'):
+                # Updating an existing key keeps its original position
+                expenses.put(key, Expense(dt, amt, row[4].strip(), row[5].strip()))
+
+            elif op == 'initial_change':
+                if key < len(initial_changes):
+                    initial_changes[key] = InitialChange(dt, amt)
+                else:
+                    initial_changes.append(InitialChange(dt, amt))
+
+# === Load Data ===
+def load_data() -> tuple[list[InitialChange], float, ExpenseStore]:
+    """
+    Load initial changes and expenses with the configured backend.
+
+    Returns:
+        A tuple containing:
+        - List of InitialChange objects
+        - Last initial amount (float)
+        - ExpenseStore with all expenses, keyed by stable expense ID
+    """
+    backend    = _sqlite_backend()
+    partitions = _partitioned_backend()
+    if backend:
+        initial_changes, last_initial, expenses = backend.load_data()
+    elif partitions:
+        initial_changes, last_initial, expenses = partitions.load_data()
+    else:
+        initial_changes, last_initial, expenses = load_csv(DATA_FILE)
+
+    attach_indexes(initial_changes, expenses)
+    return initial_changes, last_initial, expenses
+
+def attach_indexes(initial_changes: list[InitialChange], expenses: ExpenseStore) -> None:
+    """
+    Attach every secondary index the ledger uses that is not attached yet.
+
+    Called after loading, and for the empty store of a Ledger that has
+    not loaded anything yet.
+    """
+    if expenses.index("rollups") is None:
+        expenses.attach("rollups", RollupIndex.from_rows(expenses.rows()))
+
+    # Date index (built on first query); the partitioned backend seeds its own
+    if expenses.index("dates") is None:
+        expenses.attach("dates", DateIndex(expenses))
+    expenses.index("dates").set_initial_changes(initial_changes)
+
+    # Place autocomplete, counted from the rollups' place buckets
+    if expenses.index("places") is None:
+        place_totals = expenses.index("rollups").place_totals()
+        expenses.attach("places", PlaceIndex.from_counts(
+            ((place, count) for place, (_, count) in place_totals.items()),
+            PLACE_SUGGESTIONS
+        ))
+
+    # Duplicate detection (built on first query)
+    if expenses.index("duplicates") is None:
+        expenses.attach("duplicates", DuplicateIndex(expenses, DUPLICATE_DAYS, DUPLICATE_CENTS))
+
+    # Search bar (built on first search)
+    if expenses.index("search") is None:
+        expenses.attach("search", SearchIndex(expenses))
+
+    # Table sort orders (each built on the first sort by its column)
+    if expenses.index("sorts") is None:
+        expenses.attach("sorts", SortIndex(expenses))
+
+# === Lazy Loading (partitioned backend) ===
+def has_unloaded() -> bool:
+    """True if some stored expenses have not been loaded into memory yet."""
+    partitions = _partitioned_backend()
+    return partitions.has_unloaded() if partitions else False
+
+def unloaded_total_cents() -> int:
+    """Sum of the expenses that are stored but not loaded, in integer cents."""
+    partitions = _partitioned_backend()
+    return partitions.unloaded_total_cents() if partitions else 0
+
+def load_older(expenses: ExpenseStore) -> list[int]:
+    """
+    Load the most recent period that is not in memory yet.
+
+    Args:
+        expenses: Store to add the loaded expenses to.
+
+    Returns:
+        IDs of the newly loaded expenses, in stored order (empty if
+        everything is loaded or the backend keeps all data in memory).
+    """
+    partitions = _partitioned_backend()
+    return partitions.load_older(expenses) if partitions else []
+
+def ensure_loaded(expenses: ExpenseStore, day: date) -> list[int]:
+    """
+    Load the period containing a date, so expenses on that date can be
+    added or moved there.
+
+    Returns:
+        IDs of the newly loaded expenses (empty if already in memory).
+    """
+    partitions = _partitioned_backend()
+    return partitions.ensure_loaded(expenses, day) if partitions else []
+
+def load_all(expenses: ExpenseStore) -> list[int]:
+    """
+    Load every period that is not in memory yet.
+
+    Returns:
+        IDs of the newly loaded expenses.
+    """
+    partitions = _partitioned_backend()
+    return partitions.load_all(expenses) if partitions else []
 
 # === Load Data from CSV ===
-def load_data() -> tuple[list[InitialChange], float, list[Expense]]:
+def load_csv(
+    path: str = DATA_FILE
+) -> tuple[list[InitialChange], float, ExpenseStore]:
     """
-    Load data from CSV file.
+    Load data from the CSV snapshot and replay the journal on top of it.
+
+    Args:
+        path: Path of the CSV snapshot to read.
 
     Returns:
         A tuple containing:
         - List of InitialChange objects
         - Last initial amount (float)
-        - List of Expense objects
+        - ExpenseStore with all expenses, keyed by stable expense ID
     """
     initial_changes: list[InitialChange] = []
-    expenses: list[Expense] = []
-    last_initial = 0.0
+    expenses = ExpenseStore()
 
-    # Return empty data if file doesn't exist
-    if not os.path.exists(DATA_FILE):
-        return initial_changes, last_initial, expenses
+    # Memory-map the binary snapshot when it matches the CSV file
+    loaded = None
+    if BINARY_SNAPSHOT and path == DATA_FILE:
+        loaded = binary_snapshot.read(SNAPSHOT_FILE, DATA_FILE)
 
-    with open(DATA_FILE, 'r', newline='', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+    # Otherwise parse a large CSV file on all cores, if enabled
+    if (loaded is None and PARALLEL_LOAD and os.path.exists(path)
+            and os.path.getsize(path) >= PARALLEL_LOAD_MIN_BYTES):
+        import parallel_load
+        loaded = parallel_load.read(path, PARALLEL_LOAD_WORKERS)
 
-        for row in reader:
-            rtype = row.get('record_type', '').strip()
-            dstr  = row.get('date', '').strip()
-            astr  = row.get('amount', '').strip()
+    if loaded is not None:
+        initial_changes, expenses = loaded
+    else:
+        read_csv(path, initial_changes, expenses)
 
-            # Skip rows with missing essential fields
-            if not (rtype and dstr and astr):
-                continue
+    # The journal and the rollup index belong to the main data file only;
+    # the rollups are attached first so replaying the journal updates them
+    if path == DATA_FILE:
+        rollups = RollupIndex.load(ROLLUP_FILE, DATA_FILE)
+        if rollups is None:
+            rollups = RollupIndex.from_rows(expenses.rows())
+        expenses.attach("rollups", rollups)
+        replay_journal(initial_changes, expenses)
 
-            try:
-                dt = datetime.strptime(dstr, "%d.%m.%Y").date()
-                amt = float(astr)
-            except ValueError:
-                continue  # Skip rows with invalid date or amount format
+    # The most recent initial change defines the current initial amount
+    last_initial = initial_changes[-1].amount if initial_changes else 0.0
 
-            if rtype == 'initial_change':
-                initial_changes.append(InitialChange(dt, amt))
-                last_initial = amt  # Update last initial amount
+    return initial_changes, last_initial, expenses
 
-            elif rtype == 'expense':
-                cat = row.get('category', '').strip()
-                plc = row.get('place', '').strip()
-                expenses.append(Expense(dt, amt, cat, plc))
+def read_csv(
+    path: str,
+    initial_changes: list[InitialChange],
+    expenses: ExpenseStore
+) -> None:
+    """
+    Read the records of a CSV data file (without any journal).
 
-    return initial_changes, last_initial, expenses
+    Args:
+        path: Path of the CSV file; a missing file reads as empty.
+        initial_changes: List the initial change records are appended to.
+        expenses: Store the expense records are added to.
+    """
+    if os.path.exists(path):
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+
+            # Resolve column positions once from the header row
+            header = [name.strip() for name in next(reader, [])]
+            cols = {name: i for i, name in enumerate(header)}
+            if not all(k in cols for k in ('record_type', 'date', 'amount')):
+                return
+
+            i_type, i_date, i_amt = cols['record_type'], cols['date'], cols['amount']
+            i_cat = cols.get('category')
+            i_plc = cols.get('place')
+            i_id  = cols.get('id')
+            width = len(header)
+
+            parse_date = DateParser()
+            days: dict[str, int] = {}  # Memoized date string -> day ordinal
+
+            for row in reader:
+                # Pad short rows so positional access never fails
+                if len(row) < width:
+                    row += [''] * (width - len(row))
+
+                rtype = row[i_type].strip()
+                dstr  = row[i_date].strip()
+                astr  = row[i_amt].strip()
+
+                # Skip rows with missing essential fields
+                if not (rtype and dstr and astr):
+                    continue
+
+                try:
+                    day = days.get(dstr)
+                    if day is None:
+                        day = days[dstr] = parse_date(dstr).toordinal()
+                    amt = float(astr)
+                    cents = to_cents(amt)  # Also rejects inf, nan and absurd amounts
+                except ValueError:
+                    continue  # Skip rows with invalid date or amount format
+
+                if rtype == 'expense':
+                    # Category and place strings are interned by the store
+                    cat = row[i_cat].strip() if i_cat is not None else ''
+                    plc = row[i_plc].strip() if i_plc is not None else ''
+
+                    # Files written before IDs existed get sequential ones
+                    try:
+                        eid = int(row[i_id]) if i_id is not None else expenses.next_id
+                    except ValueError:
+                        eid = expenses.next_id
+
+                    expenses.put_row(eid, day, cents, cat, plc)
+
+                elif rtype == 'initial_change':
+                    initial_changes.append(
+                        InitialChange(date.fromordinal(day), amt)
+                    )
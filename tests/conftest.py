@@ -0,0 +1,93 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import storage
+import partitioned_storage
+import sqlite_storage
+import reports
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point every storage backend at an empty temporary directory."""
+    files = {
+        "DATA_FILE":            tmp_path / "expenses.csv",
+        "JOURNAL_FILE":         tmp_path / "expenses.journal",
+        "ROTATED_JOURNAL_FILE": tmp_path / "expenses.journal.old",
+        "SNAPSHOT_FILE":        tmp_path / "expenses.snap",
+        "ROLLUP_FILE":          tmp_path / "expenses.rollup",
+        "SQLITE_FILE":          tmp_path / "expenses.db",
+        "PARTITION_DIR":        tmp_path / "expenses",
+        "MANIFEST_FILE":        tmp_path / "expenses" / "manifest.json",
+    }
+    for module in (storage, partitioned_storage, sqlite_storage, reports):
+        for name, path in files.items():
+            if hasattr(module, name):
+                monkeypatch.setattr(module, name, str(path))
+    return tmp_path
+
+
+@pytest.fixture
+def partitioned(data_dir, monkeypatch):
+    """Select the month-partitioned backend, starting from an empty manifest."""
+    monkeypatch.setattr(storage, "STORAGE_BACKEND", "partitioned")
+    monkeypatch.setattr(partitioned_storage, "_manifest", None)
+    monkeypatch.setattr(partitioned_storage, "_loaded", set())
+    partitioned_storage.migrate_from_csv(storage.DATA_FILE)
+    return data_dir
+
+
+@pytest.fixture
+def sqlite(data_dir, monkeypatch):
+    """Select the SQLite backend; the database is created on first use."""
+    monkeypatch.setattr(storage, "STORAGE_BACKEND", "sqlite")
+    sqlite_storage.close()
+    yield data_dir
+    sqlite_storage.close()
+
+
+@pytest.fixture
+def churn():
+    """
+    Return a function applying random adds, edits, deletes, undos, redos
+    and initial amount changes to a ledger, for checking indexes against
+    a brute-force recomputation.
+    """
+    from datetime import date, timedelta
+
+    categories = ("Food", "Transport", "Rent")
+    places = ("Lidl", "LIDL Berlin", "lidl-berlin", "Shell", "Aldi Süd", "Bakery Mayer")
+    start = date(2024, 1, 1)
+
+    def random_day(rnd):
+        if rnd.random() < 0.05:  # Now and then far outside the usual dates
+            return start + timedelta(days=rnd.randrange(-4000, 4000))
+        return start + timedelta(days=rnd.randrange(90))
+
+    def random_values(rnd):
+        return (random_day(rnd), rnd.choice(("1.00", "1.01", "9.99", "10.50", "250")),
+                rnd.choice(categories), rnd.choice(places))
+
+    def apply(ledger, rnd, steps):
+        for _ in range(steps):
+            eids = list(ledger.expenses)
+            action = rnd.random()
+            if action < 0.35 or not eids:
+                ledger.add_expense(*random_values(rnd))
+            elif action < 0.45:
+                ledger.add_expenses(random_values(rnd) for _ in range(rnd.randrange(1, 5)))
+            elif action < 0.6:
+                ledger.edit_expense(rnd.choice(eids), *random_values(rnd))
+            elif action < 0.7:
+                ledger.delete_expenses(rnd.sample(eids, min(len(eids), rnd.randrange(1, 4))))
+            elif action < 0.8:
+                ledger.undo()
+            elif action < 0.9:
+                ledger.redo()
+            else:
+                ledger.set_initial_amount(rnd.randrange(0, 5000), random_day(rnd))
+
+    return apply
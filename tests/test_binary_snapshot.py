@@ -0,0 +1,75 @@
+from datetime import date
+import os
+import binary_snapshot
+import storage
+from expense_store import ExpenseStore
+from ledger import Ledger
+from models import InitialChange
+
+CHANGES = [InitialChange(date(2024, 1, 1), 1500.0)]
+
+
+def write_snapshot(tmp_path):
+    """A two-row snapshot next to the CSV file it claims to mirror."""
+    source = tmp_path / "expenses.csv"
+    source.write_text("csv stand-in\n")
+    expenses = ExpenseStore()
+    expenses.add_row(3, date(2024, 1, 2).toordinal(), 1250, "Food", "Lidl")
+    expenses.add_row(7, date(2024, 1, 5).toordinal(), -400, "Refund", "Café Ünal")
+    path = str(tmp_path / "expenses.snap")
+    binary_snapshot.write(path, CHANGES, expenses, str(source))
+    return path, str(source), expenses
+
+
+def test_snapshot_round_trip(tmp_path):
+    path, source, expenses = write_snapshot(tmp_path)
+
+    changes, loaded = binary_snapshot.read(path, source)
+    assert changes == CHANGES
+    assert list(loaded.rows()) == list(expenses.rows())
+    assert loaded.next_id == 8
+    assert loaded.total_cents() == 850
+
+
+def test_corrupt_payload_fails_the_crc(tmp_path):
+    path, source, _ = write_snapshot(tmp_path)
+    with open(path, 'r+b') as f:
+        f.seek(binary_snapshot.HEADER.size)  # Day of the initial change
+        first = f.read(1)
+        f.seek(binary_snapshot.HEADER.size)
+        f.write(bytes([first[0] ^ 0x01]))  # Still a valid day, one off
+
+    assert binary_snapshot.read(path, source) is None
+
+
+def test_truncated_or_empty_snapshot_is_rejected(tmp_path):
+    path, source, _ = write_snapshot(tmp_path)
+    size = os.path.getsize(path)
+    with open(path, 'r+b') as f:
+        f.truncate(size - 3)
+    assert binary_snapshot.read(path, source) is None
+
+    open(path, 'wb').close()
+    assert binary_snapshot.read(path, source) is None
+
+
+def test_changed_csv_file_makes_the_snapshot_stale(tmp_path):
+    path, source, _ = write_snapshot(tmp_path)
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    assert binary_snapshot.read(path, source) is None
+
+
+def test_ledger_falls_back_to_a_hand_edited_csv(data_dir):
+    ledger = Ledger()
+    ledger.add_expense(date(2024, 1, 2), "12.50", "Food", "Lidl")
+    ledger.save()
+    assert os.path.exists(storage.SNAPSHOT_FILE)
+
+    with open(storage.DATA_FILE, 'a', encoding='utf-8') as f:
+        f.write("expense,03.01.2024,7.00,Food,Bakery\n")
+
+    ledger = Ledger()
+    ledger.load()
+    assert sorted(exp.place for exp in ledger.expenses.values()) == ["Bakery", "Lidl"]
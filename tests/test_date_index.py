@@ -0,0 +1,81 @@
+from datetime import date
+from date_index import DateIndex
+from ledger import Ledger
+from models import MAX_CENTS
+
+
+def test_ranges_are_inclusive_and_empty_ranges_are_zero(data_dir):
+    ledger = Ledger()
+    dates = ledger.dates
+    assert dates.total_between(date(2024, 1, 1), date(2024, 12, 31)) == 0
+    assert dates.balance_on(date(2024, 1, 1)) == 0
+
+    ledger.add_expense(date(2024, 3, 1), "1.00", "Food", "Lidl")
+    ledger.add_expense(date(2024, 3, 2), "2.00", "Food", "Lidl")
+    ledger.add_expense(date(2024, 3, 3), "4.00", "Food", "Lidl")
+
+    assert dates.total_between(date(2024, 3, 1), date(2024, 3, 3)) == 700
+    assert dates.total_between(date(2024, 3, 2), date(2024, 3, 2)) == 200
+    assert dates.count_between(date(2024, 3, 4), date(2025, 1, 1)) == 0
+    assert dates.total_between(date(2024, 3, 3), date(2024, 3, 1)) == 0  # Reversed
+    assert dates.count_between(date(2024, 3, 3), date(2024, 3, 1)) == 0
+
+
+def test_window_grows_for_far_dates_after_the_first_query(data_dir):
+    ledger = Ledger()
+    ledger.add_expense(date(2024, 6, 1), "10.00", "Food", "Lidl")
+    assert ledger.dates.total_until(date(2024, 6, 1)) == 1000  # Builds the trees
+
+    ledger.add_expense(date(1900, 1, 1), "1.00", "Food", "Lidl")
+    ledger.add_expense(date(2100, 12, 31), "2.00", "Food", "Lidl")
+
+    assert ledger.dates.total_between(date(1900, 1, 1), date(1900, 1, 1)) == 100
+    assert ledger.dates.total_until(date(2100, 12, 30)) == 1100
+    assert ledger.dates.count_between(date.min, date.max) == 3
+    assert ledger.dates.balance_on(date(2101, 1, 1)) == -1300
+
+
+def test_edits_and_deletes_move_day_totals(data_dir):
+    ledger = Ledger()
+    eid = ledger.add_expense(date(2024, 3, 1), "5.00", "Food", "Lidl")
+    ledger.dates.count_between(date(2024, 1, 1), date(2024, 12, 31))
+
+    ledger.edit_expense(eid, date(2024, 4, 1), "6.00", "Food", "Lidl")
+    assert ledger.dates.total_between(date(2024, 3, 1), date(2024, 3, 31)) == 0
+    assert ledger.dates.total_between(date(2024, 4, 1), date(2024, 4, 1)) == 600
+
+    ledger.delete_expenses([eid])
+    assert ledger.dates.count_between(date(2024, 1, 1), date(2024, 12, 31)) == 0
+
+
+def test_large_amounts_are_summed_exactly(data_dir):
+    ledger = Ledger()
+    for day in (1, 2, 3):
+        ledger.add_expense(date(2024, 1, day), MAX_CENTS / 100, "Rent", "Landlord")
+    ledger.add_expense(date(2024, 1, 3), "0.01", "Food", "Kiosk")
+
+    assert ledger.dates.total_between(date(2024, 1, 1), date(2024, 1, 3)) == 3 * MAX_CENTS + 1
+    assert ledger.dates.balance_on(date(2024, 1, 2)) == -2 * MAX_CENTS
+
+
+def test_initial_amount_in_effect_on_a_date(data_dir):
+    ledger = Ledger()
+    ledger.set_initial_amount(100, date(2024, 1, 10))
+    ledger.set_initial_amount(200, date(2024, 1, 20))
+    ledger.set_initial_amount(300, date(2024, 1, 20))  # Same day: the later wins
+    ledger.set_initial_amount(50, date(2024, 1, 15))   # Recorded late, dated earlier
+
+    dates = ledger.dates
+    assert dates.initial_on(date(2024, 1, 9)) == 0
+    assert dates.initial_on(date(2024, 1, 10)) == 10000
+    assert dates.initial_on(date(2024, 1, 15)) == 5000
+    assert dates.initial_on(date(2024, 1, 20)) == 30000
+
+    # A fresh index over the same history agrees
+    fresh = DateIndex(ledger.expenses)
+    fresh.set_initial_changes(ledger.initial_changes)
+    assert [fresh.initial_on(date(2024, 1, d)) for d in (9, 10, 15, 20)] == [0, 10000, 5000, 30000]
+
+    ledger.undo()
+    ledger.undo()
+    assert dates.initial_on(date(2024, 1, 20)) == 20000
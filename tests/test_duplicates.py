@@ -0,0 +1,113 @@
+from datetime import date
+from duplicates import DuplicateIndex, normalize_place
+from expense_store import ExpenseStore
+from ledger import Ledger
+from models import Expense
+
+DAY = date(2024, 3, 10).toordinal()
+
+
+def test_windows_are_inclusive():
+    index = DuplicateIndex(None, days=1, cents=50)
+    index.on_add(1, DAY, 1000, "Food", "Lidl")
+
+    assert index.matches(DAY + 1, 1050, "Food", "Lidl") == [1]
+    assert index.matches(DAY - 1, 950, "Food", "Lidl") == [1]
+    assert index.matches(DAY + 2, 1000, "Food", "Lidl") == []
+    assert index.matches(DAY, 1051, "Food", "Lidl") == []
+    assert index.matches(DAY, 949, "Food", "Lidl") == []
+
+
+def test_amount_buckets_and_refunds():
+    # Bucket edges: 1019 and 1020 fall in different buckets of width 21
+    index = DuplicateIndex(None, cents=20)
+    index.on_add(1, DAY, 1019, "Food", "Lidl")
+    index.on_add(2, DAY, 1020, "Food", "Lidl")
+    index.on_add(3, DAY, -500, "Refund", "Lidl")
+    index.on_add(4, DAY, -520, "Refund", "Lidl")
+
+    assert index.matches(DAY, 1039, "Food", "Lidl") == [1, 2]
+    assert index.matches(DAY, 999, "Food", "Lidl") == [1]
+    assert index.groups() == [[1, 2], [3, 4]]
+    assert index.flagged == {2, 4}
+
+
+def test_groups_are_transitive_and_sorted():
+    index = DuplicateIndex(None, days=1)
+    for eid, offset in ((5, 2), (3, 0), (9, 1)):  # 3~9 and 9~5, but not 3~5
+        index.on_add(eid, DAY + offset, 999, "Food", "Lidl")
+    index.on_add(4, DAY, 999, "Food", "Aldi")
+    index.on_add(6, DAY, 999, "Rent", "Lidl")
+
+    assert index.matches(DAY, 999, "Food", "Lidl") == [3, 9]
+    assert index.groups() == [[3, 5, 9]]
+
+
+def test_places_are_normalized_and_category_is_optional():
+    index = DuplicateIndex()
+    index.on_add(1, DAY, 999, "Food", "LIDL  Berlin.")
+    index.on_add(2, DAY, 999, "Household", "lidl-berlin")
+    index.on_add(3, DAY, 999, "Food", "Lidl Berlin 2")
+
+    assert normalize_place("  Café_Ünal!! ") == "café ünal"
+    assert index.matches(DAY, 999, "Food", "Lidl Berlin") == [1]
+    assert index.matches(DAY, 999, None, "lidl berlin") == [1, 2]
+    assert index.groups() == []
+
+
+def test_query_windows_are_capped_to_the_index():
+    index = DuplicateIndex(None, days=1, cents=10)
+    index.on_add(1, DAY, 1000, "Food", "Lidl")
+
+    assert index.matches(DAY + 1, 1000, "Food", "Lidl", days=0) == []
+    assert index.matches(DAY, 1005, "Food", "Lidl", window=0) == []
+    assert index.matches(DAY, 1020, "Food", "Lidl", window=100) == []
+
+
+def test_empty_store_and_changes_before_the_first_query(data_dir):
+    ledger = Ledger()
+    assert ledger.duplicate_groups() == []
+    assert ledger.flagged_duplicates() == set()
+
+    store = ExpenseStore()
+    index = DuplicateIndex(store, days=1)
+    store.attach("duplicates", index)
+    store.add_row(1, DAY, 999, "Food", "Lidl")  # Not indexed yet: built later
+    store.add_row(2, DAY + 1, 999, "Food", "Lidl")
+    store.put_row(2, DAY + 5, 999, "Food", "Lidl")  # Edited away
+
+    assert index.groups() == []
+    store.put_row(2, DAY, 999, "Food", "lidl")  # Edited back, after the build
+    assert index.groups() == [[1, 2]]
+    assert index.flagged == {2}
+
+
+def test_ledger_finds_exact_repeats(data_dir):
+    ledger = Ledger()
+    first = ledger.add_expense(date(2024, 3, 1), "9.99", "Food", "LIDL Berlin")
+    ledger.add_expense(date(2024, 3, 1), "9.99", "Transport", "LIDL Berlin")
+    second = ledger.add_expense(date(2024, 3, 1), "9.99", "Food", "lidl-berlin.")
+
+    exp = Expense(date(2024, 3, 1), 9.99, "Food", "Lidl Berlin")
+    assert ledger.likely_duplicates(exp) == [first, second]
+    assert ledger.duplicate_groups() == [[first, second]]
+
+
+def test_loading_flags_duplicates(data_dir):
+    ledger = Ledger()
+    ledger.load()
+    first = ledger.add_expense(date(2024, 3, 1), "9.99", "Food", "Lidl")
+    second = ledger.add_expense(date(2024, 3, 1), "9.99", "Food", "LIDL")
+    ledger.save()
+
+    ledger = Ledger()
+    ledger.load()
+    flagged = ledger.flagged_duplicates()
+    assert flagged == {second}
+
+    # The same set follows later changes
+    third = ledger.add_expense(date(2024, 3, 1), "9.99", "Food", "lidl")
+    assert flagged == {second, third}
+    ledger.delete_expenses([second, third])
+    assert flagged == set()
+    assert first in ledger.expenses
@@ -0,0 +1,38 @@
+from history import History, Change, Rows
+
+
+def rows(count):
+    return Rows((eid, 738000, 100, "Food", "Lidl") for eid in range(count))
+
+
+def test_oldest_changes_are_forgotten_over_budget():
+    one = Change("add", after=rows(1)).nbytes
+    history = History(budget=3 * one)
+    changes = [Change("add", after=rows(1)) for _ in range(5)]
+    for change in changes:
+        history.record(change)
+
+    assert history.nbytes == 3 * one
+    assert [history.undo() for _ in range(4)] == changes[:1:-1] + [None]
+
+
+def test_change_larger_than_budget_is_not_kept():
+    history = History(budget=10_000)
+    small = Change("delete", before=rows(1))
+    history.record(small)
+    history.record(Change("add", after=rows(1000)))
+
+    assert not history.can_undo
+    assert history.nbytes == 0
+
+
+def test_new_change_clears_redo_stack_and_its_memory():
+    history = History(budget=1 << 20)
+    first, second = Change("add", after=rows(10)), Change("add", after=rows(20))
+    history.record(first)
+    history.record(second)
+    history.undo()
+
+    history.record(Change("initial"))
+    assert not history.can_redo
+    assert history.nbytes == first.nbytes + Change("initial").nbytes
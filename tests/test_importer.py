@@ -0,0 +1,96 @@
+from datetime import date
+import pytest
+import importer
+from ledger import Ledger
+
+
+def write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_signed_statement_skips_incoming_payments(data_dir):
+    path = write(data_dir / "statement.csv",
+        "Booking date;Payee;Amount (EUR)\n"
+        "03.03.2024;LIDL Berlin;-12,50\n"
+        "04.03.2024;Employer GmbH;2500,00\n"
+        "05.03.2024;Shell;-40,00\n"
+    )
+    ledger = Ledger()
+    ledger.load()
+
+    assert importer.uses_signed_amounts(path)
+    stats = importer.import_file(ledger, path)
+
+    assert (stats.imported, stats.credits, stats.errors) == (2, 1, 0)
+    assert sorted(exp.amount for exp in ledger.expenses.values()) == [12.5, 40.0]
+
+
+def test_debit_credit_columns_count_as_signed(data_dir):
+    path = write(data_dir / "statement.csv",
+        "Date,Description,Debit,Credit\n"
+        "2024-03-03,Rent,800.00,\n"
+        "2024-03-04,Salary,,2500.00\n"
+    )
+    ledger = Ledger()
+    ledger.load()
+
+    stats = importer.import_file(ledger, path)
+
+    assert (stats.imported, stats.credits) == (1, 1)
+    assert [exp.place for exp in ledger.expenses.values()] == ["Rent"]
+
+
+def test_own_data_file_imports_every_expense(data_dir):
+    path = write(data_dir / "export.csv",
+        "record_type,date,amount,category,place\n"
+        "initial_change,01.03.2024,1000.00,,\n"
+        "expense,03.03.2024,12.50,Food,Lidl\n"
+        "expense,04.03.2024,99.20,Transport,Shell\n"
+    )
+    ledger = Ledger()
+    ledger.load()
+
+    assert not importer.uses_signed_amounts(path)
+    stats = importer.import_file(ledger, path)
+
+    assert (stats.imported, stats.credits, stats.errors) == (2, 0, 0)
+    assert sorted((exp.date, exp.amount, exp.category) for exp in ledger.expenses.values()) == [
+        (date(2024, 3, 3), 12.5, "Food"),
+        (date(2024, 3, 4), 99.2, "Transport"),
+    ]
+
+    # Importing the same file again adds nothing
+    stats = importer.import_file(ledger, path)
+    assert (stats.imported, stats.duplicates) == (0, 2)
+
+
+def test_positive_expense_list_imports_every_row(data_dir):
+    path = write(data_dir / "list.csv",
+        "date,amount,place\n"
+        "2024-03-03,12.50,Bakery\n"
+        "2024-03-04,3.10,Kiosk\n"
+    )
+    ledger = Ledger()
+    ledger.load()
+
+    stats = importer.import_file(ledger, path)
+
+    assert (stats.imported, stats.credits) == (2, 0)
+
+
+def test_unparsable_file_imports_nothing(data_dir):
+    path = write(data_dir / "statement.csv",
+        "date,amount,place\n"
+        + "".join(f"2024-03-0{day},-1.00,Shop {day}\n" for day in range(1, 6))
+        + "2024-03-06,-1.00,\"" + "x" * 200_000 + "\"\n"  # Over the csv field limit
+    )
+    ledger = Ledger()
+    ledger.load()
+
+    with pytest.raises(ValueError, match="Line"):
+        importer.import_file(ledger, path, skip_credits=True)
+
+    assert len(ledger.expenses) == 0
+    assert ledger.balance_cents() == 0
+    assert not ledger.history.can_undo
@@ -0,0 +1,132 @@
+from datetime import date
+import pytest
+from models import Expense, InitialChange
+from ledger import Ledger
+from search_index import parse_query
+
+
+def test_ledger_is_usable_before_load(data_dir):
+    ledger = Ledger()
+
+    ledger.set_initial_amount(100, date(2024, 3, 1))
+    eid = ledger.add_expense(date(2024, 3, 2), "12.50", "Food", "Lidl")
+
+    assert ledger.likely_duplicates(Expense(date(2024, 3, 2), 12.5, "Food", "Lidl")) == [eid]
+    assert ledger.balance_cents() == 8750
+    assert ledger.dates.balance_on(date(2024, 3, 2)) == 8750
+    assert ledger.suggest_places("li") == ["Lidl"]
+    assert ledger.search(parse_query("lidl")) == [eid]
+    assert list(ledger.sorted_view("amount")) == [eid]
+
+
+def test_duplicate_groups_include_months_on_disk(partitioned):
+    ledger = Ledger()
+    ledger.load()
+    first = ledger.add_expense(date(2020, 1, 5), "9.99", "Food", "Lidl")
+    second = ledger.add_expense(date(2020, 1, 5), "9.99", "Food", "Lidl")
+    ledger.add_expense(date.today(), "1.00", "Food", "Kiosk")
+    ledger.save()
+
+    ledger = Ledger()
+    ledger.load()
+    assert ledger.has_unloaded()
+
+    assert ledger.duplicate_groups() == [[first, second]]
+
+
+def test_batch_is_rolled_back_on_any_error(data_dir):
+    ledger = Ledger()
+    events = []
+    ledger.subscribe(lambda event, eids: events.append(event))
+
+    def items():
+        for day in range(1, 6):
+            yield date(2024, 3, day), "1.00", "Food", "Lidl"
+        raise OSError("disk gone")
+
+    with pytest.raises(OSError):
+        ledger.add_expenses(items())
+    with pytest.raises(ValueError, match="Item 2"):
+        ledger.add_expenses([(date(2024, 3, 1), "1", "Food", "Lidl"),
+                             (date(2024, 3, 1), "x", "Food", "Lidl")])
+
+    assert len(ledger.expenses) == 0
+    assert ledger.balance_cents() == 0
+    assert ledger.dates.count_between(date(2024, 3, 1), date(2024, 3, 31)) == 0
+    assert not ledger.history.can_undo
+    assert events == []
+
+
+@pytest.mark.parametrize(
+    "amount", ["inf", "-inf", "nan", "1e400", "1e300", float("inf"), float("nan")]
+)
+def test_non_finite_amounts_are_rejected(amount):
+    with pytest.raises(ValueError, match="Enter a valid amount."):
+        Ledger.parse_amount(amount)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_undo_delete_restores_original_positions(data_dir, compact):
+    ledger = Ledger()
+    eids = [ledger.add_expense(date(2024, 3, day), "5.00", "Food", "Lidl")
+            for day in range(1, 6)]
+
+    ledger.delete_expenses([eids[3], eids[1]])
+    if compact:
+        ledger.expenses.compact()  # Dead slots gone: inserted by ID instead
+    assert ledger.undo() == "delete"
+
+    assert list(ledger.expenses) == eids
+    assert ledger.search(parse_query("lidl")) == eids
+    assert ledger.balance_cents() == -2500
+
+    assert ledger.redo() == "delete"
+    assert list(ledger.expenses) == [eids[0], eids[2], eids[4]]
+    assert ledger.undo() == "delete"
+    assert list(ledger.expenses) == eids
+
+    # Replaying the journal puts them back in the same place
+    reloaded = Ledger()
+    reloaded.load()
+    assert list(reloaded.expenses) == eids
+
+
+def test_redo_add_restores_original_position(data_dir):
+    ledger = Ledger()
+    first = ledger.add_expense(date(2024, 3, 1), "1.00", "Food", "Lidl")
+    second = ledger.add_expense(date(2024, 3, 2), "2.00", "Food", "Aldi")
+
+    ledger.undo()
+    ledger.undo()
+    assert len(ledger.expenses) == 0
+    ledger.redo()
+    ledger.redo()
+
+    assert list(ledger.expenses) == [first, second]
+    assert ledger.expenses[second] == Expense(date(2024, 3, 2), 2.0, "Food", "Aldi")
+
+
+def test_undo_initial_amount_restores_previous_record(data_dir):
+    ledger = Ledger()
+    ledger.set_initial_amount(100, date(2024, 1, 1))
+    ledger.set_initial_amount(250, date(2024, 6, 1))
+
+    assert ledger.undo() == "initial"
+    assert ledger.initial_changes == [InitialChange(date(2024, 1, 1), 100.0)]
+    assert ledger.initial_amount == 100.0
+    assert ledger.dates.initial_on(date(2024, 7, 1)) == 10000
+
+    assert ledger.undo() == "initial"
+    assert ledger.initial_changes == []
+    assert ledger.initial_amount == 0.0
+
+    assert ledger.redo() == "initial"
+    assert ledger.redo() == "initial"
+    assert ledger.initial_changes == [InitialChange(date(2024, 1, 1), 100.0),
+                                      InitialChange(date(2024, 6, 1), 250.0)]
+    ledger.undo()
+
+    reloaded = Ledger()
+    reloaded.load()
+    assert reloaded.initial_changes == [InitialChange(date(2024, 1, 1), 100.0)]
+    assert reloaded.initial_amount == 100.0
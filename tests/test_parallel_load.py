@@ -0,0 +1,81 @@
+import csv
+import itertools
+import parallel_load
+import storage
+from expense_store import ExpenseStore
+
+HEADER = "record_type,date,amount,category,place,id\n"
+
+
+def parse(path, bounds):
+    """Parse the ranges between `bounds` like the workers do, then merge them."""
+    with open(path, 'rb') as f:
+        header = f.readline().decode('utf-8')
+    cols = {name.strip(): i for i, name in enumerate(next(csv.reader([header])))}
+    parts = [
+        parallel_load._parse_range(path, start, end, cols, len(cols))
+        for start, end in zip(bounds, bounds[1:])
+    ]
+    if any(part is None for part in parts):
+        return None
+    return parallel_load._merge(parts)
+
+
+def serial(path):
+    expenses = ExpenseStore()
+    storage.read_csv(path, [], expenses)
+    return sorted(expenses.rows())
+
+
+def line_starts(path):
+    """Offsets of the data lines (after the header) and the file size."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return [i + 1 for i, byte in enumerate(data) if byte == ord("\n")][:-1], len(data)
+
+
+def test_matches_serial_loader_for_every_split(tmp_path):
+    path = str(tmp_path / "expenses.csv")
+    rows = [(i, 738000 + i, 100 + i, "Food", place) for i, place in enumerate(
+        ["Lidl", "Shell, Berlin", 'Kiosk "Ecke"', "Bakery", "Aldi", "Rewe", "Edeka"]
+    )]
+    storage.write_csv(path, [], rows)
+    starts, size = line_starts(path)
+
+    for k in range(len(starts)):
+        for cut in itertools.combinations(starts[1:], k):
+            merged = parse(path, [starts[0], *cut, size])
+            assert merged is not None
+            assert sorted(merged[1].rows()) == serial(path)
+
+
+def test_quoted_line_breaks_fall_back_to_serial(tmp_path):
+    # Stray quotes in unquoted fields keep the quote count of each range
+    # even, even where a boundary cuts through a multi-line field
+    path = tmp_path / "expenses.csv"
+    path.write_bytes((
+        HEADER
+        + 'expense,01.01.2024,1.00,Food,5" screen,0\n'
+        + 'expense,02.01.2024,2.00,Food,"Two\nlines",1\n'
+        + 'expense,03.01.2024,3.00,Food,7" screen,2\n'
+        + 'expense,04.01.2024,4.00,Food,"More\nlines",3\n'
+        + 'expense,05.01.2024,5.00,Food,Lidl,4\n'
+    ).encode('utf-8'))
+    path = str(path)
+    starts, size = line_starts(path)
+
+    for k in range(len(starts)):
+        for cut in itertools.combinations(starts[1:], k):
+            merged = parse(path, [starts[0], *cut, size])
+            assert merged is None
+
+
+def test_read_uses_worker_processes(tmp_path, monkeypatch):
+    path = str(tmp_path / "expenses.csv")
+    rows = [(i, 738000 + i % 400, i, "Food", f"Shop {i % 7}") for i in range(2000)]
+    storage.write_csv(path, [], rows)
+    monkeypatch.setattr(parallel_load, "CHUNK_TARGET", 4096)
+
+    initial_changes, expenses = parallel_load.read(path, workers=2)
+
+    assert sorted(expenses.rows()) == serial(path)
@@ -0,0 +1,112 @@
+import json
+import os
+from datetime import date
+import partitioned_storage
+from ledger import Ledger
+from models import month_key
+
+
+def month_entries(rows):
+    """Manifest entries of the months, summed from the rows."""
+    entries = {}
+    for eid, day, cents, category, place in rows:
+        entry = entries.setdefault(month_key(day), {
+            "count": 0, "total_cents": 0, "categories": {}, "places": {}, "days": {}
+        })
+        entry["count"] += 1
+        entry["total_cents"] += cents
+        for table, key in (("categories", category), ("places", place),
+                           ("days", date.fromordinal(day).isoformat())):
+            bucket = entry[table].setdefault(key, [0, 0])
+            bucket[0] += cents
+            bucket[1] += 1
+    return entries
+
+
+def manifest():
+    with open(partitioned_storage.MANIFEST_FILE, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def reload():
+    ledger = Ledger()
+    ledger.load()
+    return ledger
+
+
+def test_startup_reads_only_the_newest_month(partitioned):
+    ledger = reload()
+    ledger.set_initial_amount(100_000, date(2023, 1, 1))
+    ledger.add_expense(date(2023, 11, 5), "45000.00", "Rent", "Landlord")
+    ledger.add_expense(date(2023, 11, 6), "0.01", "Food", "Kiosk")
+    ledger.add_expense(date(2024, 1, 31), "12.34", "Food", "Lidl")
+    newest = ledger.add_expense(date(2024, 2, 1), "-5.00", "Refund", "Lidl")
+    ledger.save()
+
+    ledger = reload()
+    assert list(ledger.expenses) == [newest]
+    assert ledger.has_unloaded()
+
+    # The manifest stands in for the months on disk
+    assert ledger.total_cents() == 4500000 + 1 + 1234 - 500
+    assert ledger.balance_cents() == 10_000_000 - ledger.total_cents()
+    assert ledger.rollups.month_totals() == {
+        "2023-11": (4500001, 2), "2024-01": (1234, 1), "2024-02": (-500, 1)
+    }
+    assert ledger.dates.count_between(date(2023, 11, 6), date(2024, 1, 31)) == 2
+    assert ledger.suggest_places("l") == ["Lidl", "Landlord"]  # Lidl used twice
+
+    assert len(ledger.load_older()) == 1  # 2024-01
+    assert len(ledger.load_all()) == 2
+    assert not ledger.has_unloaded()
+
+
+def test_moving_an_expense_out_of_a_month_drops_its_partition(partitioned):
+    ledger = reload()
+    moved = ledger.add_expense(date(2024, 1, 10), "3.00", "Food", "Lidl")
+    ledger.add_expense(date(2024, 3, 10), "4.00", "Food", "Aldi")
+    ledger.save()
+
+    ledger = reload()  # Only March is loaded
+    ledger.load_older()
+    ledger.edit_expense(moved, date(2024, 2, 29), "3.00", "Food", "Lidl")
+    ledger.save()
+
+    assert manifest()["partitions"] == month_entries(ledger.expenses.rows())
+    assert not os.path.exists(partitioned_storage._partition_path("2024-01"))
+    assert sorted(reload().load_all()) == [moved]
+
+
+def test_ids_of_unloaded_months_are_never_reused(partitioned):
+    ledger = reload()
+    ledger.add_expense(date(2024, 3, 1), "1.00", "Food", "Lidl")
+    old = ledger.add_expense(date(2020, 1, 1), "1.00", "Food", "Lidl")  # Highest ID
+    ledger.save()
+
+    ledger = reload()
+    assert old not in ledger.expenses
+    assert ledger.add_expense(date(2024, 3, 2), "1.00", "Food", "Lidl") > old
+
+
+def test_unsaved_changes_are_replayed_over_every_month(partitioned):
+    ledger = reload()
+    kept = ledger.add_expense(date(2023, 5, 1), "7.00", "Food", "Lidl")
+    gone = ledger.add_expense(date(2024, 5, 1), "8.00", "Food", "Lidl")
+    ledger.save()
+    ledger.delete_expenses([gone])
+    added = ledger.add_expense(date(2022, 5, 1), "9.00", "Food", "Lidl")  # New month
+
+    ledger = reload()  # Crash: the journal forces a full load
+    assert not ledger.has_unloaded()
+    assert sorted(ledger.expenses) == [kept, added]
+
+    ledger.save()
+    assert manifest()["partitions"] == month_entries(ledger.expenses.rows())
+
+
+def test_empty_ledger(partitioned):
+    ledger = reload()
+    assert len(ledger.expenses) == 0
+    assert not ledger.has_unloaded()
+    assert ledger.load_older() == []
+    assert manifest()["partitions"] == {}
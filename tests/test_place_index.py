@@ -0,0 +1,48 @@
+from place_index import PlaceIndex
+
+
+def fresh(index):
+    """The same counts, ranked from scratch without any cached prefix."""
+    return PlaceIndex.from_counts(index._counts.items(), index.k)
+
+
+def warmed(k=3):
+    index = PlaceIndex.from_counts(
+        [("Lidl", 5), ("LIDL Berlin", 3), ("Lidl Express", 3), ("Aldi", 4), ("Bakery", 1)], k
+    )
+    for prefix in ("", "l", "li", "lidl", "lidl ", "a"):
+        index.complete(prefix)
+    return index
+
+
+def test_cached_prefixes_are_patched_when_a_place_is_used():
+    index = warmed()
+    for _ in range(4):
+        index.add("lidl express", 1)  # New place, sorts among the cached ones
+    index.add("Bakery", 4)
+
+    assert index.complete("li") == ["Lidl", "lidl express", "LIDL Berlin"]
+    assert index.complete("") == ["Bakery", "Lidl", "Aldi"]
+    assert "li" in index._top and "" in index._top  # Patched, not dropped
+    for prefix in ("", "l", "li", "lidl", "lidl ", "a", "b"):
+        assert index.complete(prefix) == fresh(index).complete(prefix)
+
+
+def test_cached_prefixes_follow_removals():
+    index = warmed()
+    index.add("Lidl", -4)       # Falls behind the others
+    index.add("LIDL Berlin", -3)  # Gone entirely
+
+    assert index.count("LIDL Berlin") == 0
+    assert index.complete("lidl") == ["Lidl Express", "Lidl"]
+    assert index.complete("") == ["Aldi", "Lidl Express", "Bakery"]
+    for prefix in ("", "l", "li", "lidl", "lidl ", "a"):
+        assert index.complete(prefix) == fresh(index).complete(prefix)
+
+
+def test_ties_rank_alphabetically_and_k_limits():
+    index = PlaceIndex.from_counts([("b", 2), ("B", 2), ("a", 2), ("c", 1)], k=2)
+
+    assert index.complete() == ["a", "B"]
+    assert index.complete(k=10) == ["a", "B", "b", "c"]
+    assert index.complete("x") == []
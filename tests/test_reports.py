@@ -0,0 +1,16 @@
+from datetime import date
+import reports
+from ledger import Ledger
+
+
+def test_load_columns_reads_every_partition(partitioned):
+    ledger = Ledger()
+    ledger.load()
+    for month in (1, 2, 3):
+        ledger.add_expense(date(2024, month, 10), month, "Food", "Lidl")
+    ledger.save()
+
+    cols = reports.load_columns()
+
+    assert sorted(cols.cents) == [100, 200, 300]
+    assert sorted(cols.days) == [date(2024, m, 10).toordinal() for m in (1, 2, 3)]
@@ -0,0 +1,71 @@
+from datetime import date
+import json
+import os
+import storage
+from ledger import Ledger
+from rollups import RollupIndex
+
+
+def build():
+    day = date(2024, 5, 3).toordinal()
+    return RollupIndex.from_rows([
+        (0, day, 1200, "Food", "Lidl"),
+        (1, day, 300, "Food", "Bakery"),
+        (2, date(2024, 6, 1).toordinal(), 90000, "Rent", "Landlord"),
+    ])
+
+
+def test_saved_index_loads_while_data_file_is_unchanged(tmp_path):
+    source = tmp_path / "expenses.csv"
+    source.write_text("data\n")
+    path = str(tmp_path / "expenses.rollup")
+    index = build()
+    index.save(path, str(source))
+
+    loaded = RollupIndex.load(path, str(source))
+    assert loaded.categories == index.categories
+    assert loaded.places == index.places
+    assert loaded.month_totals() == {"2024-05": (1500, 2), "2024-06": (90000, 1)}
+
+
+def test_stale_or_foreign_index_is_rejected(tmp_path):
+    source = tmp_path / "expenses.csv"
+    source.write_text("data\n")
+    path = str(tmp_path / "expenses.rollup")
+    build().save(path, str(source))
+
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert RollupIndex.load(path, str(source)) is None
+
+    build().save(path, str(source))
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    data["version"] += 1
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    assert RollupIndex.load(path, str(source)) is None
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("{not json")
+    assert RollupIndex.load(path, str(source)) is None
+    assert RollupIndex.load(str(tmp_path / "missing"), str(source)) is None
+
+
+def test_ledger_rollups_follow_journal_and_hand_edits(data_dir):
+    ledger = Ledger()
+    ledger.add_expense(date(2024, 5, 3), "12.00", "Food", "Lidl")
+    ledger.save()
+    ledger.add_expense(date(2024, 5, 4), "3.00", "Food", "Bakery")  # Journal only
+
+    ledger = Ledger()
+    ledger.load()
+    assert ledger.rollups.category_totals("2024-05") == {"Food": (1500, 2)}
+
+    ledger.save()
+    with open(storage.DATA_FILE, 'a', encoding='utf-8') as f:
+        f.write("expense,01.06.2024,900.00,Rent,Landlord\n")
+
+    ledger = Ledger()
+    ledger.load()
+    assert ledger.rollups.month_totals() == {"2024-05": (1500, 2), "2024-06": (90000, 1)}
@@ -0,0 +1,114 @@
+from collections import Counter
+from datetime import date
+import pytest
+from ledger import Ledger
+from search_index import parse_query
+
+
+def search(ledger, text):
+    return ledger.search(parse_query(text))
+
+
+def test_empty_and_unmatched_queries(data_dir):
+    ledger = Ledger()
+    assert search(ledger, "") is None and search(ledger, "   ") is None
+    assert search(ledger, "lidl") == []  # Nothing stored yet
+
+    ledger.add_expense(date(2024, 3, 1), "5.00", "Food", "Lidl")
+    assert search(ledger, "aldi") == []
+    assert search(ledger, "cat:rent") == []
+    assert search(ledger, "date:2023") == []
+    assert search(ledger, "lidl >5") == []
+
+
+def test_every_word_must_prefix_a_word_of_the_same_place(data_dir):
+    ledger = Ledger()
+    berlin = ledger.add_expense(date(2024, 3, 1), "1.00", "Food", "LIDL Berlin.")
+    ledger.add_expense(date(2024, 3, 1), "1.00", "Food", "Lidl")
+    ledger.add_expense(date(2024, 3, 1), "1.00", "Food", "Berlin Bakery")
+    mcd = ledger.add_expense(date(2024, 3, 1), "1.00", "Food", "Mc-Donalds")
+
+    assert search(ledger, "lid ber") == [berlin]
+    assert search(ledger, "idl") == []  # Prefixes only
+    assert search(ledger, "mc-don") == search(ledger, "donalds mc") == [mcd]
+
+
+def test_ties_keep_stored_order(data_dir):
+    ledger = Ledger()
+    eids = [ledger.add_expense(date(2024, 3, 1), "9.99", "Food", "Lidl") for _ in range(4)]
+
+    assert search(ledger, "=9.99 date:2024-03-01") == eids
+    ledger.delete_expenses([eids[0], eids[2]])
+    ledger.undo()
+    assert search(ledger, "lidl") == eids
+
+
+def test_amount_bounds_are_exact(data_dir):
+    ledger = Ledger()
+    refund = ledger.add_expense(date(2024, 3, 1), "-2.50", "Food", "Lidl")
+    zero = ledger.add_expense(date(2024, 3, 1), "0", "Food", "Lidl")
+    ten = ledger.add_expense(date(2024, 3, 1), "10.00", "Food", "Lidl")
+    cent = ledger.add_expense(date(2024, 3, 1), "10.01", "Food", "Lidl")
+
+    assert search(ledger, ">10") == [cent]
+    assert search(ledger, ">=10") == [ten, cent]
+    assert search(ledger, "<=0") == [refund, zero]
+    assert search(ledger, "<0,01") == [refund, zero]
+    assert search(ledger, "0..10") == [zero, ten]
+    assert search(ledger, ">5 <10") == []
+
+
+def test_date_filters_narrow_each_other(data_dir):
+    ledger = Ledger()
+    leap = ledger.add_expense(date(2024, 2, 29), "1.00", "Food", "Lidl")
+    march = ledger.add_expense(date(2024, 3, 1), "1.00", "Food", "Lidl")
+    ledger.add_expense(date(2023, 3, 1), "1.00", "Food", "Lidl")
+
+    assert search(ledger, "02.2024") == [leap]
+    assert search(ledger, "year:2024 month:2024-03") == [march]
+    assert search(ledger, "date:2024-02 date:2024-03") == []
+    assert search(ledger, "29.02.2024 cat:FOOD") == [leap]
+
+
+def test_changes_after_the_first_search(data_dir):
+    ledger = Ledger()
+    eid = ledger.add_expense(date(2024, 3, 1), "5.00", "Food", "Lidl Berlin")
+    other = ledger.add_expense(date(2024, 3, 2), "5.00", "Transport", "BVG")
+    assert search(ledger, "berlin") == [eid]  # Builds the index
+
+    ledger.edit_expense(eid, date(2024, 4, 1), "7.00", "Rent", "Landlord")
+    assert search(ledger, "berlin") == []  # The word left the vocabulary
+    assert search(ledger, "cat:rent =7") == [eid]
+    assert search(ledger, "month:2024-03") == [other]
+
+    ledger.delete_expenses([other])
+    assert search(ledger, "bvg") == []
+    assert ledger.search_facets({eid}) == Counter({"Rent": 1})
+
+
+def test_query_syntax():
+    query = parse_query("Lidl cat:Food 03.2024 >50 <=100")
+    assert query.words == ["lidl"]
+    assert query.category == "food"
+    assert (query.first_day, query.last_day) == (
+        date(2024, 3, 1).toordinal(), date(2024, 3, 31).toordinal()
+    )
+    assert (query.min_cents, query.max_cents) == (5001, 10000)
+
+    # A bare 2024-03 is a place word, not a date
+    assert parse_query("2024-03").words == ["2024", "03"]
+
+    with pytest.raises(ValueError):
+        parse_query("date:2024-13")
+
+
+def test_open_amount_ranges_include_large_amounts(data_dir):
+    ledger = Ledger()
+    small = ledger.add_expense(date(2024, 3, 1), "12.50", "Rent", "Landlord")
+    large = ledger.add_expense(date(2024, 3, 1), "45000", "Rent", "Landlord")
+    huge = ledger.add_expense(date(2024, 3, 1), "9999999999.99", "Rent", "Landlord")
+
+    assert ledger.search(parse_query(">50")) == [large, huge]
+    assert ledger.search(parse_query(">=40000 landlord")) == [large, huge]
+    assert ledger.search(parse_query("<50000")) == [small, large]
+    assert ledger.search(parse_query("date:2024")) == [small, large, huge]
@@ -0,0 +1,66 @@
+from datetime import date
+import pytest
+from ledger import Ledger
+from models import MAX_CENTS
+
+
+def test_ties_keep_the_order_expenses_were_added(data_dir):
+    ledger = Ledger()
+    a = ledger.add_expense(date(2024, 3, 2), "5.00", "food", "Lidl")
+    b = ledger.add_expense(date(2024, 3, 1), "5.00", "Food", "LIDL")
+    c = ledger.add_expense(date(2024, 3, 2), "5.00", "FOOD", "lidl")
+
+    assert list(ledger.sorted_view("amount")) == [a, b, c]
+    assert list(ledger.sorted_view("amount", descending=True)) == [c, b, a]
+    assert list(ledger.sorted_view("date")) == [b, a, c]
+    # Names compare case-insensitively, then by date
+    assert list(ledger.sorted_view("category")) == [b, a, c]
+    assert list(ledger.sorted_view("place", descending=True)) == [c, a, b]
+
+
+def test_negative_and_largest_amounts(data_dir):
+    ledger = Ledger()
+    big = ledger.add_expense(date(2024, 3, 1), MAX_CENTS / 100, "Rent", "Landlord")
+    refund = ledger.add_expense(date(2024, 3, 1), "-0.01", "Food", "Lidl")
+    small = ledger.add_expense(date(2024, 3, 1), "0.01", "Food", "Lidl")
+    most_negative = ledger.add_expense(date(2024, 3, 1), -MAX_CENTS / 100, "Refund", "Landlord")
+
+    assert list(ledger.sorted_view("amount")) == [most_negative, refund, small, big]
+
+
+def test_views_follow_changes(data_dir):
+    ledger = Ledger()
+    first = ledger.add_expense(date(2024, 3, 1), "3.00", "Food", "Lidl")
+    second = ledger.add_expense(date(2024, 3, 2), "1.00", "Food", "Lidl")
+    view = ledger.sorted_view("amount", descending=True)
+    assert list(view) == [first, second]
+
+    third = ledger.add_expense(date(2024, 3, 3), "2.00", "Food", "Lidl")
+    assert list(view) == [first, third, second]
+    ledger.edit_expense(second, date(2024, 3, 2), "9.00", "Food", "Lidl")
+    assert list(view) == [second, first, third]
+    ledger.delete_expenses([first])
+    assert (len(view), view[0], view[-1]) == (2, second, third)
+    ledger.undo()
+    assert list(view) == [second, first, third]
+
+
+def test_empty_views_and_subsets(data_dir):
+    ledger = Ledger()
+    view = ledger.sorted_view("date", descending=True)
+    assert len(view) == 0 and list(view) == []
+    with pytest.raises(IndexError):
+        view[0]
+    assert ledger.sort_ids([], "place") == []
+
+    eids = [ledger.add_expense(date(2024, 3, day), "1.00", "Food", "Lidl") for day in (3, 1, 2)]
+    assert ledger.sort_ids({eids[0], eids[1]}, "date", descending=True) == [eids[0], eids[1]]
+    assert [view[i] for i in (-3, 1, 2)] == [eids[0], eids[2], eids[1]]
+    with pytest.raises(IndexError):
+        view[3]
+
+
+def test_unknown_column(data_dir):
+    ledger = Ledger()
+    with pytest.raises(ValueError):
+        ledger.sorted_view("colour")
@@ -0,0 +1,68 @@
+import pytest
+from sortedlist import SortedList
+
+
+def test_empty_list():
+    sl = SortedList()
+    assert len(sl) == 0 and list(sl) == [] and list(reversed(sl)) == []
+    assert 5 not in sl
+    assert sl.bisect_left(5) == sl.bisect_right(5) == 0
+    assert list(sl.irange()) == [] and sl.count_range() == 0
+    assert list(sl.islice(-1, 3)) == []
+    assert not sl.discard(5)
+    with pytest.raises(ValueError):
+        sl.remove(5)
+    with pytest.raises(IndexError):
+        sl[0]
+
+
+def test_ties_spanning_several_sublists():
+    sl = SortedList([1, 9] + [5] * 7, load=2)  # The fives fill four sublists
+    sl.add(5)
+
+    assert (sl.bisect_left(5), sl.bisect_right(5)) == (1, 9)
+    assert sl.count_range(5, 6) == 8
+    assert list(sl.irange(5, 9)) == [5] * 8
+    assert sl.count_range(6, 9) == 0
+
+    for _ in range(8):
+        sl.remove(5)
+    assert list(sl) == [1, 9] and 5 not in sl
+    assert sl.bisect_left(5) == sl.bisect_right(5) == 1
+
+
+def test_positions_across_sublists():
+    values = list(range(0, 40, 2))
+    sl = SortedList(reversed(values), load=3)
+    sl.add(7)
+    sl.discard(0)
+    values = sorted(values[1:] + [7])
+
+    assert [sl[i] for i in range(-len(values), len(values))] == values + values
+    assert list(sl.islice(2, 9)) == values[2:9]
+    assert list(sl.islice(15)) == values[15:]
+    assert list(sl.islice(5, 2)) == []
+    assert list(reversed(sl)) == values[::-1]
+    with pytest.raises(IndexError):
+        sl[-len(values) - 1]
+
+
+def test_open_and_empty_ranges():
+    sl = SortedList([-3, 0, 4, 4, 10])
+
+    assert list(sl.irange(None, 4)) == [-3, 0]  # The upper bound is exclusive
+    assert list(sl.irange(4)) == [4, 4, 10]
+    assert list(sl.irange(11)) == [] and list(sl.irange(None, -3)) == []
+    assert sl.count_range(10, 0) == 0  # Reversed
+    assert sl.count_range(None, None) == 5
+
+
+def test_emptied_list_can_be_reused():
+    sl = SortedList([3, 1, 2], load=1)
+    for value in (2, 1, 3):
+        assert sl.discard(value)
+    assert len(sl) == 0 and list(sl) == []
+
+    sl.add(7)
+    sl.add(-1)
+    assert list(sl) == [-1, 7] and sl[-1] == 7 and 7 in sl
@@ -0,0 +1,74 @@
+from datetime import date
+import os
+import storage
+import sqlite_storage
+from ledger import Ledger
+from models import InitialChange
+
+
+def reload():
+    sqlite_storage.close()
+    ledger = Ledger()
+    ledger.load()
+    return ledger
+
+
+def test_csv_data_and_journal_are_migrated_once(data_dir, monkeypatch):
+    ledger = Ledger()
+    ledger.set_initial_amount(500, date(2024, 1, 1))
+    saved = ledger.add_expense(date(2024, 1, 2), "10.00", "Food", "Lidl")
+    ledger.save()
+    journaled = ledger.add_expense(date(2024, 1, 3), "2.50", "Transport", "Bus")
+    assert os.path.exists(storage.SNAPSHOT_FILE)
+
+    monkeypatch.setattr(storage, "STORAGE_BACKEND", "sqlite")
+    ledger = reload()
+
+    assert list(ledger.expenses) == [saved, journaled]
+    assert ledger.initial_changes == [InitialChange(date(2024, 1, 1), 500.0)]
+    assert ledger.balance_cents() == 48750
+
+    # The journal is kept aside, never to be replayed again; caches are gone
+    assert not os.path.exists(storage.JOURNAL_FILE)
+    assert os.path.exists(storage.JOURNAL_FILE + ".migrated")
+    assert not os.path.exists(storage.SNAPSHOT_FILE)
+    assert os.path.exists(storage.DATA_FILE)
+
+    sqlite_storage.close()
+    os.remove(storage.DATA_FILE)  # No longer read
+    assert len(reload().expenses) == 2
+
+
+def test_every_change_is_stored_immediately(sqlite):
+    ledger = Ledger()
+    ledger.load()
+    first = ledger.add_expense(date(2024, 2, 1), "4.00", "Food", "Aldi")
+    second, third = ledger.add_expenses([
+        (date(2024, 2, 2), "6.00", "Food", "Lidl"),
+        (date(2024, 2, 3), "8.00", "Rent", "Landlord"),
+    ])
+    ledger.edit_expense(second, date(2024, 2, 2), "7.00", "Food", "Lidl")
+    ledger.delete_expenses([first])
+    ledger.set_initial_amount(100, date(2024, 1, 1))
+    ledger.set_initial_amount(200, date(2024, 2, 1))
+    ledger.undo()
+
+    ledger = reload()
+    assert list(ledger.expenses) == [second, third]
+    assert ledger.expenses[second].amount == 7.0
+    assert ledger.initial_changes == [InitialChange(date(2024, 1, 1), 100.0)]
+    assert not os.path.exists(storage.JOURNAL_FILE)
+
+
+def test_query_expenses_filters_with_the_indexes(sqlite):
+    ledger = Ledger()
+    ledger.load()
+    jan = ledger.add_expense(date(2024, 1, 31), "1.00", "Food", "Lidl")
+    feb = ledger.add_expense(date(2024, 2, 1), "2.00", "Food", "Aldi")
+    ledger.add_expense(date(2024, 2, 29), "3.00", "Rent", "Landlord")
+
+    assert list(sqlite_storage.query_expenses(end=date(2024, 1, 31))) == [jan]
+    assert list(sqlite_storage.query_expenses(
+        start=date(2024, 2, 1), category="Food")) == [feb]
+    assert list(sqlite_storage.query_expenses(place="Nowhere")) == []
+    assert len(sqlite_storage.query_expenses()) == 3
@@ -0,0 +1,85 @@
+import random
+import storage
+from ledger import Ledger
+
+
+def state(ledger):
+    """Everything a reload must reproduce."""
+    return (
+        sorted(ledger.expenses.rows()), ledger.initial_changes,
+        ledger.initial_amount, ledger.balance_cents(),
+    )
+
+
+def reloaded():
+    """A new ledger loaded from disk, like the app after a crash."""
+    ledger = Ledger()
+    ledger.load()
+    return ledger
+
+
+def test_crash_replays_journal(data_dir, churn):
+    rnd = random.Random(1)
+    ledger = reloaded()
+    for step in range(30):
+        churn(ledger, rnd, rnd.randrange(1, 20))
+
+        # Sometimes save, or crash in the middle of a background save
+        action = rnd.random()
+        if action < 0.2:
+            ledger.save()
+        elif action < 0.4:
+            snapshot = ledger.capture_snapshot()
+            if rnd.random() < 0.5:
+                storage.write_snapshot(snapshot)
+
+        # Crash: the ledger is dropped without saving or closing
+        expected = state(ledger)
+        ledger = reloaded()
+        assert state(ledger) == expected
+
+
+def test_replaying_twice_changes_nothing(data_dir, churn):
+    rnd = random.Random(2)
+    ledger = reloaded()
+    churn(ledger, rnd, 50)
+    ledger.save()
+    churn(ledger, rnd, 50)
+
+    ledger = reloaded()
+    expected = state(ledger)
+    storage.replay_journal(ledger.initial_changes, ledger.expenses)
+    assert state(ledger) == expected
+
+
+def test_torn_record_is_dropped(data_dir, churn):
+    rnd = random.Random(3)
+    ledger = reloaded()
+    churn(ledger, rnd, 20)
+    expected = state(ledger)
+
+    # Crash in the middle of a journal write
+    with open(storage.JOURNAL_FILE, 'a', encoding='utf-8') as f:
+        f.write('add,999,03.0')
+    ledger = reloaded()
+    assert state(ledger) == expected
+
+    # Records written after the torn one are replayed too
+    churn(ledger, rnd, 20)
+    expected = state(ledger)
+    assert state(reloaded()) == expected
+
+
+def test_rows_with_invalid_amounts_are_skipped(data_dir):
+    storage.write_csv(storage.DATA_FILE, [], [(0, 738000, 1250, "Food", "Lidl")])
+    with open(storage.DATA_FILE, 'a', encoding='utf-8') as f:
+        f.write("expense,01.03.2024,inf,Food,Shell,1\n"
+                "expense,01.03.2024,nan,Food,Shell,2\n"
+                "initial_change,01.03.2024,1e400,,,\n")
+    with open(storage.JOURNAL_FILE, 'w', encoding='utf-8') as f:
+        f.write("add,3,2024-03-01,inf,Food,Aldi\n")
+
+    ledger = reloaded()
+
+    assert sorted(ledger.expenses.rows()) == [(0, 738000, 1250, "Food", "Lidl")]
+    assert ledger.initial_changes == []